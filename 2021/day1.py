@@ -21,8 +21,14 @@ def part_two(depths: list[int]) -> int:
     return num_increases
 
 
+def parse_input(problem_input: list[str]) -> tuple[list[int]]:
+    return (list(map(int, problem_input)),)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    print("Part One: ", part_one(problem_input))
-    print("Part Two: ", part_two(problem_input))
+    (depths,) = parse_input(problem_input)
+
+    print("Part One: ", part_one(depths))
+    print("Part Two: ", part_two(depths))
@@ -1,60 +1,49 @@
-import copy
-
+import numpy as np
+from aoc.grid import Grid2D, count_neighbors
 from utils import get_and_cache_input
 
 
-def ripple(energy_levels: list[list[int]], row: int, col: int) -> None:
-    for r in range(max(0, row - 1), min(row + 2, len(energy_levels))):
-        for c in range(max(0, col - 1), min(col + 2, len(energy_levels[r]))):
-            if energy_levels[r][c] == -1:
-                continue
-
-            energy_levels[r][c] += 1
-            if energy_levels[r][c] > 9:
-                energy_levels[r][c] = -1
-                ripple(energy_levels, r, c)
-
-
-def step(energy_levels: list[list[int]]) -> int:
-    num_flashes = 0
-    for row in range(len(energy_levels)):
-        for col in range(len(energy_levels[row])):
-            if energy_levels[row][col] == -1:
-                continue
+def step(energy_levels: Grid2D) -> int:
+    energy_levels.cells += 1
 
-            energy_levels[row][col] += 1
-            if energy_levels[row][col] > 9:
-                energy_levels[row][col] = -1
-                ripple(energy_levels, row, col)
+    flashed = np.zeros(energy_levels.shape, dtype=bool)
+    while True:
+        flashing = (energy_levels.cells > 9) & ~flashed
+        if not flashing.any():
+            break
 
-    for row in range(len(energy_levels)):
-        for col in range(len(energy_levels[row])):
-            if energy_levels[row][col] == -1 or energy_levels[row][col] > 9:
-                num_flashes += 1
-                energy_levels[row][col] = 0
+        flashed |= flashing
+        energy_levels.cells += count_neighbors(flashing)
 
-    return num_flashes
+    energy_levels.cells[flashed] = 0
+    return int(flashed.sum())
 
 
-def part_one(initial_energy_levels: list[list[int]]) -> int:
-    return sum(step(initial_energy_levels) for _ in range(100))
+def part_one(initial_energy_levels: Grid2D) -> int:
+    energy_levels = initial_energy_levels.copy()
+    return sum(step(energy_levels) for _ in range(100))
 
 
-def part_two(initial_energy_levels: list[list[int]]) -> int:
+def part_two(initial_energy_levels: Grid2D) -> int:
+    energy_levels = initial_energy_levels.copy()
     step_number = 0
-    num_octopuses = len(initial_energy_levels) * len(initial_energy_levels[0])
+    num_octopuses = energy_levels.height * energy_levels.width
 
     while True:
-        num_flashes = step(initial_energy_levels)
+        num_flashes = step(energy_levels)
         step_number += 1
         if num_flashes == num_octopuses:
             return step_number
 
 
+def parse_input(problem_input: list[str]) -> tuple[Grid2D]:
+    return (Grid2D.from_digits(problem_input),)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    initial_energy_levels = [list(map(int, row)) for row in problem_input]
+    (initial_energy_levels,) = parse_input(problem_input)
 
-    print("Part One: ", part_one(copy.deepcopy(initial_energy_levels)))
-    print("Part Two: ", part_two(copy.deepcopy(initial_energy_levels)))
+    print("Part One: ", part_one(initial_energy_levels))
+    print("Part Two: ", part_two(initial_energy_levels))
@@ -116,10 +116,14 @@ def part_two(cave_graph: CaveGraph) -> int:
     return find_paths_visiting_small_caves_twice(cave_graph, "start")
 
 
+def parse_input(problem_input: list[str]) -> tuple[CaveGraph]:
+    return (CaveGraph(problem_input),)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    cave_graph = CaveGraph(problem_input)
+    (cave_graph,) = parse_input(problem_input)
 
     print("Part One: ", part_one(cave_graph))
     print("Part Two: ", part_two(cave_graph))
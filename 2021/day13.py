@@ -74,9 +74,7 @@ def part_two(paper: TransparentPaper, instructions: list[str]) -> str:
     return str(paper)
 
 
-if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
-
+def parse_input(problem_input: list[str]) -> tuple[TransparentPaper, list[str]]:
     dots = []
     instructions = []
 
@@ -90,7 +88,13 @@ if __name__ == "__main__":
             [x, y] = map(int, line.split(","))
             dots.append((x, y))
 
-    paper = TransparentPaper(dots)
+    return (TransparentPaper(dots), instructions)
+
+
+if __name__ == "__main__":
+    problem_input = get_and_cache_input(__file__)
+
+    (paper, instructions) = parse_input(problem_input)
 
     print("Part One: ", part_one(paper, instructions))
     print("Part Two:")
@@ -1,6 +1,7 @@
 from collections import Counter
 from typing import Optional, Tuple
 
+from aoc.memo import memoize
 from utils import get_and_cache_input
 
 
@@ -32,19 +33,14 @@ def part_one(starting_template: str, insertion_rules: dict[str, str]) -> int:
     return element_counts[most_common] - element_counts[least_common]
 
 
-cache: dict[str, Counter[str]] = {}
-
-
+# The insertion rules are the same for the whole solve, so they're left out of the key
+@memoize(key=lambda pair, insertion_rules, steps: (pair, steps))
 def get_expansion_counts(
     pair: str, insertion_rules: dict[str, str], steps: int
 ) -> Optional[Counter[str]]:
     if steps <= 0 or pair not in insertion_rules:
         return None
 
-    cache_key = pair + str(steps)
-    if cache_key in cache:
-        return cache[cache_key]
-
     inserted_element = insertion_rules[pair]
     element_counts = Counter(insertion_rules[pair])
     left_pair_counts = get_expansion_counts(
@@ -59,7 +55,6 @@ def get_expansion_counts(
     if right_pair_counts is not None:
         element_counts += right_pair_counts
 
-    cache[cache_key] = element_counts
     return element_counts
 
 
@@ -84,14 +79,20 @@ def parse_rule(rule: str) -> Tuple[str, str]:
     return (pattern, insertion)
 
 
-if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
-
+def parse_input(problem_input: list[str]) -> tuple[str, dict[str, str]]:
     starting_template = problem_input[0]
     insertion_rules: dict[str, str] = {
         pattern: insertion
         for (pattern, insertion) in map(parse_rule, filter(None, problem_input[1:]))
     }
 
+    return (starting_template, insertion_rules)
+
+
+if __name__ == "__main__":
+    problem_input = get_and_cache_input(__file__)
+
+    (starting_template, insertion_rules) = parse_input(problem_input)
+
     print("Part One: ", part_one(starting_template, insertion_rules))
     print("Part Two: ", part_two(starting_template, insertion_rules))
@@ -1,52 +1,40 @@
-import heapq
-from dataclasses import dataclass, field
-from typing import Tuple
+from typing import Iterator
 
+from aoc.search import find_shortest_path
 from utils import get_and_cache_input
 
 
-@dataclass(order=True)
-class PrioritizedCell:
-    location: Tuple[int, int] = field(compare=False)
-    priority: int
-
-
 def djikstra(grid: list[list[int]]) -> int:
-    open_cells: list[PrioritizedCell] = []
-    cost_so_far: dict[Tuple[int, int], int] = {}
-
-    end = (len(grid) - 1, len(grid[0]) - 1)
-
-    cost_so_far[(0, 0)] = 0
-    heapq.heappush(
-        open_cells, PrioritizedCell(location=(0, 0), priority=cost_so_far[(0, 0)])
-    )
-
-    while len(open_cells) > 0:
-        current_cell = heapq.heappop(open_cells)
+    """
+    A* over cells encoded as `row * width + col`, guided by the Manhattan distance to the
+    bottom right corner, since every step costs at least 1.
+    """
 
-        if current_cell.location == end:
-            break
+    height, width = len(grid), len(grid[0])
+    risk_levels = [risk_level for row in grid for risk_level in row]
+    end = height * width - 1
 
-        (row, col) = current_cell.location
-        neighbors: list[Tuple[int, int]] = []
+    def neighbors(cell: int) -> Iterator[tuple[int, int]]:
+        row, col = divmod(cell, width)
         if row > 0:
-            neighbors.append((row - 1, col))
-        if row < len(grid) - 1:
-            neighbors.append((row + 1, col))
+            yield cell - width, risk_levels[cell - width]
+        if row < height - 1:
+            yield cell + width, risk_levels[cell + width]
         if col > 0:
-            neighbors.append((row, col - 1))
-        if col < len(grid[row]) - 1:
-            neighbors.append((row, col + 1))
-        for neighbor in neighbors:
-            cost = cost_so_far[(row, col)] + grid[neighbor[0]][neighbor[1]]
-            if neighbor not in cost_so_far or cost < cost_so_far[neighbor]:
-                cost_so_far[neighbor] = cost
-                heapq.heappush(
-                    open_cells, PrioritizedCell(location=neighbor, priority=cost)
-                )
+            yield cell - 1, risk_levels[cell - 1]
+        if col < width - 1:
+            yield cell + 1, risk_levels[cell + 1]
 
-    return cost_so_far[end]
+    def distance_to_end(cell: int) -> int:
+        row, col = divmod(cell, width)
+        return height - 1 - row + width - 1 - col
+
+    result = find_shortest_path(
+        [0], neighbors, lambda cell: cell == end, distance_to_end, queue="buckets"
+    )
+    assert result.cost is not None, "No path found"
+
+    return result.cost
 
 
 def part_one(grid: list[list[int]]) -> int:
@@ -70,10 +58,14 @@ def part_two(grid: list[list[int]]) -> int:
     return djikstra(expanded_grid)
 
 
+def parse_input(problem_input: list[str]) -> tuple[list[list[int]]]:
+    return ([list(map(int, line)) for line in problem_input],)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    grid = [list(map(int, line)) for line in problem_input]
+    (grid,) = parse_input(problem_input)
 
     print("Part One: ", part_one(grid))
     print("Part Two: ", part_two(grid))
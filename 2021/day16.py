@@ -163,10 +163,15 @@ def part_two(packet: Packet) -> int:
     return packet.value
 
 
+def parse_input(problem_input: list[str]) -> tuple[Packet]:
+    (packet, _) = parse_packet(convert_hex_to_binary(problem_input[0]))
+    return (packet,)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    (packet, _) = parse_packet(convert_hex_to_binary(problem_input[0]))
+    (packet,) = parse_input(problem_input)
 
     print("Part One: ", part_one(packet))
     print("Part Two: ", part_two(packet))
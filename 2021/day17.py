@@ -116,10 +116,16 @@ def part_two(target_area: tuple[tuple[int, int], tuple[int, int]]) -> int:
     return len(velocities)
 
 
+def parse_input(
+    problem_input: list[str],
+) -> tuple[tuple[tuple[int, int], tuple[int, int]]]:
+    return (parse_target_area(problem_input[0]),)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    target_area = parse_target_area(problem_input[0])
+    (target_area,) = parse_input(problem_input)
 
     print("Part One: ", part_one(target_area))
     print("Part Two: ", part_two(target_area))
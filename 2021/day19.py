@@ -1,310 +1,198 @@
 from __future__ import annotations
 
-from collections import deque
-from dataclasses import dataclass
-from enum import Enum, unique
+import itertools
+from collections import defaultdict, deque
 from typing import Optional
 
-from utils import get_and_cache_input
-
-
-@unique
-class AxisDir(str, Enum):
-    POS_X = "+x"
-    POS_Y = "+y"
-    POS_Z = "+z"
-    NEG_X = "-x"
-    NEG_Y = "-y"
-    NEG_Z = "-z"
-
-    def is_positive(self) -> bool:
-        return self == AxisDir.POS_X or self == AxisDir.POS_Y or self == AxisDir.POS_Z
-
-    def is_negative(self) -> bool:
-        return not self.is_positive()
-
-    def is_x(self) -> bool:
-        return self == AxisDir.POS_X or self == AxisDir.NEG_X
-
-    def is_y(self) -> bool:
-        return self == AxisDir.POS_Y or self == AxisDir.NEG_Y
-
-    def is_z(self) -> bool:
-        return self == AxisDir.POS_Z or self == AxisDir.NEG_Z
-
-
-@dataclass(frozen=True)
-class Orientation:
-    forward: AxisDir
-    up: AxisDir
-
-    def __repr__(self) -> str:
-        return "[" + self.forward + " " + self.up + "]"
-
-
-DEFAULT_ORIENTATION = Orientation(AxisDir.POS_X, AxisDir.POS_Y)
-ALL_ORIENTATIONS = [
-    Orientation(AxisDir.POS_X, AxisDir.POS_Y),
-    Orientation(AxisDir.POS_X, AxisDir.NEG_Y),
-    Orientation(AxisDir.POS_X, AxisDir.POS_Z),
-    Orientation(AxisDir.POS_X, AxisDir.NEG_Z),
-    Orientation(AxisDir.NEG_X, AxisDir.POS_Y),
-    Orientation(AxisDir.NEG_X, AxisDir.NEG_Y),
-    Orientation(AxisDir.NEG_X, AxisDir.POS_Z),
-    Orientation(AxisDir.NEG_X, AxisDir.NEG_Z),
-    Orientation(AxisDir.POS_Y, AxisDir.POS_X),
-    Orientation(AxisDir.POS_Y, AxisDir.NEG_X),
-    Orientation(AxisDir.POS_Y, AxisDir.POS_Z),
-    Orientation(AxisDir.POS_Y, AxisDir.NEG_Z),
-    Orientation(AxisDir.NEG_Y, AxisDir.POS_X),
-    Orientation(AxisDir.NEG_Y, AxisDir.NEG_X),
-    Orientation(AxisDir.NEG_Y, AxisDir.POS_Z),
-    Orientation(AxisDir.NEG_Y, AxisDir.NEG_Z),
-    Orientation(AxisDir.POS_Z, AxisDir.POS_X),
-    Orientation(AxisDir.POS_Z, AxisDir.NEG_X),
-    Orientation(AxisDir.POS_Z, AxisDir.POS_Y),
-    Orientation(AxisDir.POS_Z, AxisDir.NEG_Y),
-    Orientation(AxisDir.NEG_Z, AxisDir.POS_X),
-    Orientation(AxisDir.NEG_Z, AxisDir.NEG_X),
-    Orientation(AxisDir.NEG_Z, AxisDir.POS_Y),
-    Orientation(AxisDir.NEG_Z, AxisDir.NEG_Y),
-]
-
-
-@dataclass(frozen=True)
-class Vector3:
-    x: int
-    y: int
-    z: int
-
-    def __add__(self, other: Vector3) -> Vector3:
-        return Vector3(self.x + other.x, self.y + other.y, self.z + other.z)
-
-    def __sub__(self, other: Vector3) -> Vector3:
-        return Vector3(self.x - other.x, self.y - other.y, self.z - other.z)
-
-    def abs(self) -> Vector3:
-        return Vector3(abs(self.x), abs(self.y), abs(self.z))
-
-    def transform(self, orientation: Orientation) -> Vector3:
-        x = self.x
-        y = self.y
-        z = self.z
-        forward = orientation.forward
-        up = orientation.up
-
-        if forward.is_x():
-            if up.is_y():
-                if forward.is_positive():
-                    if up.is_positive():
-                        return Vector3(x, y, z)
-                    else:
-                        return Vector3(x, -y, -z)
-                else:
-                    if up.is_positive():
-                        return Vector3(-x, y, -z)
-                    else:
-                        return Vector3(-x, -y, z)
-            elif up.is_z():
-                if forward.is_positive():
-                    if up.is_positive():
-                        return Vector3(x, -z, y)
-                    else:
-                        return Vector3(x, z, -y)
-                else:
-                    if up.is_positive():
-                        return Vector3(-x, z, y)
-                    else:
-                        return Vector3(-x, -z, -y)
-        elif forward.is_y():
-            if up.is_x():
-                if forward.is_positive():
-                    if up.is_positive():
-                        return Vector3(y, x, -z)
-                    else:
-                        return Vector3(-y, x, z)
-                else:
-                    if up.is_positive():
-                        return Vector3(y, -x, z)
-                    else:
-                        return Vector3(-y, -x, -z)
-            elif up.is_z():
-                if forward.is_positive():
-                    if up.is_positive():
-                        return Vector3(z, x, y)
-                    else:
-                        return Vector3(-z, x, -y)
-                else:
-                    if up.is_positive():
-                        return Vector3(-z, -x, y)
-                    else:
-                        return Vector3(z, -x, -y)
-        elif forward.is_z():
-            if up.is_x():
-                if forward.is_positive():
-                    if up.is_positive():
-                        return Vector3(y, z, x)
-                    else:
-                        return Vector3(-y, -z, x)
-                else:
-                    if up.is_positive():
-                        return Vector3(y, -z, -x)
-                    else:
-                        return Vector3(-y, z, -x)
-            elif up.is_y():
-                if forward.is_positive():
-                    if up.is_positive():
-                        return Vector3(-z, y, x)
-                    else:
-                        return Vector3(z, -y, x)
-                else:
-                    if up.is_positive():
-                        return Vector3(z, y, -x)
-                    else:
-                        return Vector3(-z, -y, -x)
-
-        raise ValueError("Unrecognized orientation", orientation)
+import numpy as np
+from aoc import telemetry
+from aoc.parsing import extract_int_array, extract_ints, split_sections
+from utils import cache_parsed_input, get_and_cache_input
+
+NUM_OVERLAPS_NEEDED = 12
+# Twelve shared beacons share this many pairs of beacons
+NUM_SHARED_PAIRS_NEEDED = NUM_OVERLAPS_NEEDED * (NUM_OVERLAPS_NEEDED - 1) // 2
+
+# Beacon positions are packed into one int each to compare them as sets, which leaves
+# room for coordinates within +/-2^20 of the first scanner
+COORDINATE_BITS = 21
+COORDINATE_OFFSET = 1 << (COORDINATE_BITS - 1)
+
+# Beacons a scanner sees are at most 2000 apart along each axis
+FINGERPRINT_BITS = 11
+
+
+def generate_rotations() -> np.ndarray:
+    """
+    The 24 rotations a scanner can have, as 3x3 integer matrices: every signed
+    permutation matrix that doesn't also mirror.
+    """
+
+    rotations = []
+    for permutation in itertools.permutations(range(3)):
+        for signs in itertools.product((1, -1), repeat=3):
+            rotation = np.zeros((3, 3), dtype=np.int64)
+            rotation[range(3), permutation] = signs
+            if round(np.linalg.det(rotation)) == 1:
+                rotations.append(rotation)
+
+    return np.array(rotations)
+
+
+ROTATIONS = generate_rotations()
 
 
 class Scanner:
     number: int
-    beacon_positions: set[Vector3]
+    beacon_positions: np.ndarray
+    # Every pair of beacons by its fingerprint, the sorted absolute differences between
+    # their coordinates packed into an int. Rotating or moving a scanner doesn't change it
+    fingerprints: dict[int, list[tuple[int, int]]]
 
-    def __init__(self, number: int) -> None:
+    def __init__(self, number: int, beacon_positions: np.ndarray) -> None:
         self.number = number
-        self.beacon_positions = set()
+        self.beacon_positions = beacon_positions
+        self.fingerprints = defaultdict(list)
+
+        first, second = np.triu_indices(len(beacon_positions), 1)
+        differences = np.sort(
+            np.abs(beacon_positions[second] - beacon_positions[first]), axis=1
+        )
+        packed_differences = (
+            (differences[:, 0] << (2 * FINGERPRINT_BITS))
+            | (differences[:, 1] << FINGERPRINT_BITS)
+            | differences[:, 2]
+        )
+        for fingerprint, i, j in zip(
+            packed_differences.tolist(), first.tolist(), second.tolist()
+        ):
+            self.fingerprints[fingerprint].append((i, j))
+
+    def count_shared_pairs(self, other: Scanner) -> int:
+        return sum(
+            min(len(self.fingerprints[fingerprint]), len(other.fingerprints[fingerprint]))
+            for fingerprint in self.fingerprints.keys() & other.fingerprints.keys()
+        )
 
-    def add_beacon(self, position: Vector3) -> None:
-        self.beacon_positions.add(position)
 
-    def get_world_transformed_beacons(self, orientation: Orientation) -> set[Vector3]:
-        return {beacon.transform(orientation) for beacon in self.beacon_positions}
+def pack_positions(positions: np.ndarray) -> np.ndarray:
+    shifted = positions + COORDINATE_OFFSET
+    return (
+        (shifted[:, 0] << (2 * COORDINATE_BITS))
+        | (shifted[:, 1] << COORDINATE_BITS)
+        | shifted[:, 2]
+    )
 
 
+@cache_parsed_input
 def parse_scanner_report(scanner_report: list[str]) -> list[Scanner]:
-    scanners: list[Scanner] = []
-    for line in scanner_report:
-        if line == "":
+    return [
+        Scanner(
+            extract_ints(section[0], signed=False)[0], extract_int_array(section[1:], 3)
+        )
+        for section in split_sections(scanner_report)
+    ]
+
+
+def align_scanner(
+    placed_beacons: np.ndarray, placed_scanner: Scanner, scanner: Scanner
+) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    """
+    Finds the rotation and position that line `scanner`'s beacons up with at least 12 of
+    `placed_beacons` (the world positions of `placed_scanner`'s beacons), if any.
+    Candidates come from pairs of beacons with the same fingerprint in both scanners,
+    which also have to have the same difference between them once rotated.
+    """
+
+    if placed_scanner.count_shared_pairs(scanner) < NUM_SHARED_PAIRS_NEEDED:
+        return None
+
+    packed_placed_beacons = pack_positions(placed_beacons)
+    beacons = scanner.beacon_positions
+    for fingerprint, placed_pairs in placed_scanner.fingerprints.items():
+        pairs = scanner.fingerprints.get(fingerprint)
+        if pairs is None:
             continue
-        if "scanner" in line:
-            scanners.append(Scanner(int(line.split()[2])))
-            line.split()
-        else:
-            [x, y, z] = line.split(",")
-            scanners[-1].add_beacon(Vector3(int(x), int(y), int(z)))
-
-    return scanners
-
-
-def find_offset_and_orientation(
-    oriented_scanner1_beacons: set[Vector3], scanner2: Scanner, num_overlaps_needed: int
-) -> Optional[tuple[Vector3, Orientation]]:
-    for orientation in ALL_ORIENTATIONS:
-        for beacon1 in oriented_scanner1_beacons:
-            anchor_beacon1 = beacon1
-            scanner2_beacons = scanner2.get_world_transformed_beacons(orientation)
-            for beacon2 in scanner2_beacons:
-                anchor_beacon2 = beacon2
-                offset = anchor_beacon1 - anchor_beacon2
-
-                index = 0
-                overlap = 0
-                for b in scanner2_beacons:
-                    if b + offset in oriented_scanner1_beacons:
-                        overlap += 1
-                    if overlap >= num_overlaps_needed:
-                        return (offset, orientation)
-                    if index - overlap >= len(scanner2_beacons) - num_overlaps_needed:
-                        break
-                    index += 1
+
+        for (placed1, placed2), (beacon1, beacon2) in itertools.product(
+            placed_pairs, pairs
+        ):
+            placed_difference = placed_beacons[placed2] - placed_beacons[placed1]
+            rotated_differences = ROTATIONS @ (beacons[beacon2] - beacons[beacon1])
+            # A rotation that flips the pair's difference maps the beacons the other way
+            for sign, anchor in ((1, beacon1), (-1, beacon2)):
+                matches = np.all(rotated_differences == sign * placed_difference, axis=1)
+                for rotation in ROTATIONS[matches]:
+                    position = placed_beacons[placed1] - rotation @ beacons[anchor]
+                    world_beacons = beacons @ rotation.T + position
+                    num_overlaps = np.count_nonzero(
+                        np.isin(pack_positions(world_beacons), packed_placed_beacons)
+                    )
+                    if num_overlaps >= NUM_OVERLAPS_NEEDED:
+                        return (position, world_beacons)
 
     return None
 
 
 def find_scanner_locations_and_all_beacons(
     scanner_report: list[Scanner],
-) -> tuple[dict[int, tuple[Vector3, Orientation]], set[Vector3]]:
-    scanner_positions: dict[int, tuple[Vector3, Orientation]] = {}
-    known_scanners: dict[int, Scanner] = {}
-    scanner_positions[scanner_report[0].number] = (Vector3(0, 0, 0), DEFAULT_ORIENTATION)
-    known_scanners[scanner_report[0].number] = scanner_report[0]
-
-    unknown_scanners = deque(scanner_report[1:])
-    last_unplaceable_length: dict[int, int] = {}
-    while len(unknown_scanners) > 0:
-        scanner = unknown_scanners.popleft()
-        for known_scanner in known_scanners.values():
-            (known_scanner_offset, known_scanner_orientation) = scanner_positions[
-                known_scanner.number
-            ]
-            offset_orientation = find_offset_and_orientation(
-                known_scanner.get_world_transformed_beacons(known_scanner_orientation),
-                scanner,
-                12,
+) -> tuple[np.ndarray, np.ndarray]:
+    world_beacons: dict[int, np.ndarray] = {}
+    scanner_positions: dict[int, np.ndarray] = {}
+
+    first_scanner = scanner_report[0]
+    world_beacons[first_scanner.number] = first_scanner.beacon_positions
+    scanner_positions[first_scanner.number] = np.zeros(3, dtype=np.int64)
+
+    # Every placed scanner is compared to every unplaced scanner once, as soon as it's
+    # placed, so each pair of scanners is aligned at most once
+    newly_placed = deque([first_scanner])
+    unplaced = {scanner.number: scanner for scanner in scanner_report[1:]}
+    while len(newly_placed) > 0 and len(unplaced) > 0:
+        placed_scanner = newly_placed.popleft()
+        for scanner in list(unplaced.values()):
+            alignment = align_scanner(
+                world_beacons[placed_scanner.number], placed_scanner, scanner
             )
-            if offset_orientation is not None:
-                (offset, orientation) = offset_orientation
-                print(
-                    f"{known_scanner.number}<-{scanner.number}",
-                    known_scanner_offset + offset,
-                    orientation,
-                )
-                scanner_positions[scanner.number] = (
-                    known_scanner_offset + offset,
-                    orientation,
-                )
-                known_scanners[scanner.number] = scanner
-                if scanner.number in last_unplaceable_length:
-                    del last_unplaceable_length[scanner.number]
-                break
-
-        if scanner.number not in known_scanners:
-            unknown_scanners.append(scanner)
-            if scanner.number in last_unplaceable_length and last_unplaceable_length[
-                scanner.number
-            ] == len(unknown_scanners):
-                raise ValueError(
-                    f"Unable to locate scanners: {sorted(s.number for s in unknown_scanners)}"
-                )
-            last_unplaceable_length[scanner.number] = len(unknown_scanners)
-
-    all_beacons: set[Vector3] = set()
-    for (
-        scanner_number,
-        (scanner_position, scanner_orientation),
-    ) in scanner_positions.items():
-        for world_beacon in known_scanners[scanner_number].get_world_transformed_beacons(
-            scanner_orientation
-        ):
-            all_beacons.add(world_beacon + scanner_position)
+            if alignment is None:
+                continue
+
+            scanner_positions[scanner.number], world_beacons[scanner.number] = alignment
+            del unplaced[scanner.number]
+            newly_placed.append(scanner)
+            telemetry.progress(
+                "scanners placed", len(scanner_positions), len(scanner_report)
+            )
+
+    if len(unplaced) > 0:
+        raise ValueError(f"Unable to locate scanners: {sorted(unplaced)}")
 
-    return (scanner_positions, all_beacons)
+    return (
+        np.array(list(scanner_positions.values())),
+        np.unique(np.concatenate(list(world_beacons.values())), axis=0),
+    )
 
 
-def part_one(beacons: set[Vector3]) -> int:
+def part_one(scanner_positions: np.ndarray, beacons: np.ndarray) -> int:
     return len(beacons)
 
 
-def part_two(scanner_positions: dict[int, tuple[Vector3, Orientation]]) -> int:
-    farthest_distance = 0
-    for scanner_num1, (scanner_position1, _) in scanner_positions.items():
-        for scanner_num2, (scanner_position2, _) in scanner_positions.items():
-            if scanner_num1 == scanner_num2:
-                continue
+def part_two(scanner_positions: np.ndarray, beacons: np.ndarray) -> int:
+    distances = np.abs(
+        scanner_positions[:, np.newaxis] - scanner_positions[np.newaxis]
+    ).sum(axis=2)
+    return int(distances.max())
 
-            diff = (scanner_position1 - scanner_position2).abs()
-            distance = diff.x + diff.y + diff.z
-            if farthest_distance < distance:
-                farthest_distance = distance
 
-    return farthest_distance
+def parse_input(problem_input: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    scanner_report = parse_scanner_report(problem_input)
+    return find_scanner_locations_and_all_beacons(scanner_report)
 
 
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    scanner_report = parse_scanner_report(problem_input)
-    (scanner_positions, beacons) = find_scanner_locations_and_all_beacons(scanner_report)
+    scanner_positions, beacons = parse_input(problem_input)
 
-    print("Part One: ", part_one(beacons))
-    print("Part Two: ", part_two(scanner_positions))
+    print("Part One: ", part_one(scanner_positions, beacons))
+    print("Part Two: ", part_two(scanner_positions, beacons))
@@ -1,127 +1,107 @@
-from typing import Optional
+from __future__ import annotations
 
+import numpy as np
+from aoc.grid import Grid2D
 from utils import get_and_cache_input
 
+# Each pixel's 3x3 window, from the most significant bit of its algorithm index down
+WINDOW = [(d_row, d_col) for d_row in (-1, 0, 1) for d_col in (-1, 0, 1)]
 
-class InfiniteImage:
-    lit_pixels: set[tuple[int, int]]
-    is_background_lit: bool
-    row_bounds: tuple[int, int]
-    col_bounds: tuple[int, int]
-
-    def __init__(self, lit_pixels: Optional[set[tuple[int, int]]] = None) -> None:
-        self.lit_pixels = lit_pixels or set()
-        self.is_background_lit = False
-        self.compute_bounds()
-
-    def load_image(self, lit_pixels: set[tuple[int, int]]) -> None:
-        self.lit_pixels = lit_pixels.copy()
-
-    def is_pixel_lit(self, row: int, col: int) -> bool:
-        if (
-            row < self.row_bounds[0]
-            or self.row_bounds[1] < row
-            or col < self.col_bounds[0]
-            or self.col_bounds[1] < col
-        ):
-            return self.is_background_lit
-
-        return (row, col) in self.lit_pixels
-
-    def light_pixel(self, row: int, col: int) -> None:
-        self.lit_pixels.add((row, col))
-
-    def compute_bounds(self) -> None:
-        if len(self.lit_pixels) == 0:
-            self.row_bounds = (0, 0)
-            self.col_bounds = (0, 0)
-        else:
-            self.row_bounds = (
-                min(row for (row, _) in self.lit_pixels),
-                max(row for (row, _) in self.lit_pixels),
-            )
-            self.col_bounds = (
-                min(col for (_, col) in self.lit_pixels),
-                max(col for (_, col) in self.lit_pixels),
-            )
 
-    def paint(self) -> None:
-        (min_row, max_row) = self.row_bounds
-        (min_col, max_col) = self.col_bounds
+class InfiniteImage:
+    """
+    An image as an array of its pixels (1 when lit) around every pixel that isn't the
+    same as the background, with the rest of the infinite image lit or not as a whole.
+    """
 
-        for row in range(min_row, max_row + 1):
-            for col in range(min_col, max_col + 1):
-                if (row, col) in self.lit_pixels:
-                    print("#", end="")
-                else:
-                    print(".", end="")
-            print()
+    pixels: np.ndarray
+    is_background_lit: bool
 
+    def __init__(self, pixels: np.ndarray, is_background_lit: bool = False) -> None:
+        self.pixels = pixels
+        self.is_background_lit = is_background_lit
 
-def enhance_image(
-    image_enhancement_algorithm: str, image: InfiniteImage
-) -> InfiniteImage:
-    enhanced_image = InfiniteImage()
+    def count_lit_pixels(self) -> int:
+        if self.is_background_lit:
+            raise ValueError("Infinitely many pixels are lit")
 
-    (min_row, max_row) = image.row_bounds
-    (min_col, max_col) = image.col_bounds
+        return int(np.count_nonzero(self.pixels))
 
-    for row in range(min_row - 1, max_row + 2):
-        for col in range(min_col - 1, max_col + 2):
-            enhancement_index = ""
-            for r in range(row - 1, row + 2):
-                for c in range(col - 1, col + 2):
-                    if image.is_pixel_lit(r, c):
-                        enhancement_index += "1"
-                    else:
-                        enhancement_index += "0"
+    def cropped(self) -> InfiniteImage:
+        differs = self.pixels != self.is_background_lit
+        rows = np.flatnonzero(differs.any(axis=1))
+        cols = np.flatnonzero(differs.any(axis=0))
+        if len(rows) == 0:
+            return InfiniteImage(self.pixels[:0, :0], self.is_background_lit)
 
-            if image_enhancement_algorithm[int(enhancement_index, 2)] == "#":
-                enhanced_image.light_pixel(row, col)
+        return InfiniteImage(
+            self.pixels[rows[0] : rows[-1] + 1, cols[0] : cols[-1] + 1],
+            self.is_background_lit,
+        )
 
-    if image.is_background_lit and image_enhancement_algorithm[511] == ".":
-        enhanced_image.is_background_lit = False
-    elif not image.is_background_lit and image_enhancement_algorithm[0] == "#":
-        enhanced_image.is_background_lit = True
+    def paint(self) -> None:
+        print(Grid2D(np.where(self.pixels == 1, ord("#"), ord(".")).astype(np.uint8)))
 
-    enhanced_image.compute_bounds()
 
-    return enhanced_image
+def enhance_image(
+    image_enhancement_algorithm: np.ndarray, image: InfiniteImage
+) -> InfiniteImage:
+    """
+    Every pixel's algorithm index at once, as a sum of the image's bits shifted by each
+    offset in the window. The image grows by a pixel on each side, since the background
+    can change the pixels next to it, and the background itself is enhanced from a
+    window of background.
+    """
+
+    background = int(image.is_background_lit)
+    pixels = np.pad(image.pixels, 2, constant_values=background).astype(np.int16)
+    height, width = pixels.shape[0] - 2, pixels.shape[1] - 2
+
+    indices = np.zeros((height, width), dtype=np.int16)
+    for d_row, d_col in WINDOW:
+        indices <<= 1
+        indices |= pixels[1 + d_row : 1 + d_row + height, 1 + d_col : 1 + d_col + width]
+
+    enhanced_image = InfiniteImage(
+        image_enhancement_algorithm[indices],
+        bool(image_enhancement_algorithm[511 if background else 0]),
+    )
+    return enhanced_image.cropped()
+
+
+def count_lit_pixels(
+    image_enhancement_algorithm: np.ndarray, image: InfiniteImage, steps: int
+) -> int:
+    for _ in range(steps):
+        image = enhance_image(image_enhancement_algorithm, image)
 
+    return image.count_lit_pixels()
 
-def part_one(image_enhancement_algorithm: str, input_image: list[str]) -> int:
-    lit_pixels: set[tuple[int, int]] = set()
-    for row in range(len(input_image)):
-        for col in range(len(input_image[row])):
-            if input_image[row][col] == "#":
-                lit_pixels.add((row, col))
 
-    image = InfiniteImage(lit_pixels)
-    image = enhance_image(image_enhancement_algorithm, image)
-    image = enhance_image(image_enhancement_algorithm, image)
+def part_one(image_enhancement_algorithm: np.ndarray, image: InfiniteImage) -> int:
+    return count_lit_pixels(image_enhancement_algorithm, image, 2)
 
-    return len(image.lit_pixels)
 
+def part_two(image_enhancement_algorithm: np.ndarray, image: InfiniteImage) -> int:
+    return count_lit_pixels(image_enhancement_algorithm, image, 50)
 
-def part_two(image_enhancement_algorithm: str, input_image: list[str]) -> int:
-    lit_pixels: set[tuple[int, int]] = set()
-    for row in range(len(input_image)):
-        for col in range(len(input_image[row])):
-            if input_image[row][col] == "#":
-                lit_pixels.add((row, col))
 
-    image = InfiniteImage(lit_pixels)
-    for _ in range(50):
-        image = enhance_image(image_enhancement_algorithm, image)
+def parse_input(problem_input: list[str]) -> tuple[np.ndarray, InfiniteImage]:
+    image_enhancement_algorithm = (
+        np.frombuffer(problem_input[0].encode("ascii"), dtype=np.uint8) == ord("#")
+    ).astype(np.uint8)
+    input_image = Grid2D.from_lines(list(filter(None, problem_input[1:])))
 
-    return len(image.lit_pixels)
+    return (
+        image_enhancement_algorithm,
+        InfiniteImage((input_image.cells == ord("#")).astype(np.uint8)),
+    )
 
 
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    image_enhancement_algorithm = problem_input[0]
-    input_image = list(filter(None, problem_input[1:]))
+    (image_enhancement_algorithm, image) = parse_input(problem_input)
 
-    print("Part One: ", part_one(image_enhancement_algorithm, input_image))
-    print("Part Two: ", part_two(image_enhancement_algorithm, input_image))
+    print("Part One: ", part_one(image_enhancement_algorithm, image))
+    print("Part Two: ", part_two(image_enhancement_algorithm, image))
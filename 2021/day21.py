@@ -1,6 +1,6 @@
-
 from typing import Counter
 
+from aoc.memo import memoize
 from utils import get_and_cache_input
 
 POSSIBLE_ROLLS: list[int] = []
@@ -40,6 +40,16 @@ def part_one(starting_positions: list[int]) -> int:
     return min(scores) * num_rolls
 
 
+def pack_game(positions: list[int], scores: list[int], turn: int = 0) -> int:
+    # Positions are at most 10 and scores below 21 until the game is won
+    key = turn
+    for position, score in zip(positions, scores):
+        key = (key << 9) | (position << 5) | score
+
+    return key
+
+
+@memoize(key=pack_game)
 def find_winner_counts(
     positions: list[int], scores: list[int], turn: int = 0
 ) -> Counter[int]:
@@ -55,37 +65,24 @@ def find_winner_counts(
         if s[turn] >= 21:
             c += Counter([turn])
         else:
-            c += find_winner_counts_cached(p, s, next_turn)
+            c += find_winner_counts(p, s, next_turn)
 
     return c
 
 
-cache: dict[str, Counter[int]] = {}
-cache_stats: list[int] = [0, 0]
-
-
-def find_winner_counts_cached(
-    positions: list[int], scores: list[int], turn: int = 0
-) -> Counter[int]:
-    cache_key = "".join(map(str, positions)) + "".join(map(str, scores)) + str(turn)
-    if cache_key not in cache:
-        cache_stats[1] += 1
-        cache[cache_key] = find_winner_counts(positions, scores, turn)
-    else:
-        cache_stats[0] += 1
-
-    return cache[cache_key]
-
-
 def part_two(starting_positions: list[int]) -> int:
-    winner_counts = find_winner_counts_cached(starting_positions, [0, 0])
+    winner_counts = find_winner_counts(starting_positions, [0, 0])
     return max(winner_counts.values())
 
 
+def parse_input(problem_input: list[str]) -> tuple[list[int]]:
+    return (parse_starting_positions(problem_input),)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    starting_positions = parse_starting_positions(problem_input)
+    (starting_positions,) = parse_input(problem_input)
 
     print("Part One: ", part_one(starting_positions))
     print("Part Two: ", part_two(starting_positions))
@@ -1,170 +1,155 @@
 from __future__ import annotations
 
-import functools
-from typing import Iterable
-
-from utils import get_and_cache_input
-
-
-class Cuboid:
-    x_bounds: tuple[int, int]
-    y_bounds: tuple[int, int]
-    z_bounds: tuple[int, int]
-
-    def __init__(
-        self,
-        x_bounds: tuple[int, int],
-        y_bounds: tuple[int, int],
-        z_bounds: tuple[int, int],
-    ) -> None:
-        self.x_bounds = x_bounds
-        self.y_bounds = y_bounds
-        self.z_bounds = z_bounds
-
-    def compute_volume(self) -> int:
-        (x_low, x_high) = self.x_bounds
-        (y_low, y_high) = self.y_bounds
-        (z_low, z_high) = self.z_bounds
-
-        return (x_high + 1 - x_low) * (y_high + 1 - y_low) * (z_high + 1 - z_low)
-
-    def subtract(self, other: Cuboid) -> list[Cuboid]:
-        (x_low, x_high) = self.x_bounds
-        (y_low, y_high) = self.y_bounds
-        (z_low, z_high) = self.z_bounds
-
-        (x_low_other, x_high_other) = other.x_bounds
-        (y_low_other, y_high_other) = other.y_bounds
-        (z_low_other, z_high_other) = other.z_bounds
-
-        if (
-            x_high < x_low_other
-            or x_high_other < x_low
-            or y_high < y_low_other
-            or y_high_other < y_low
-            or z_high < z_low_other
-            or z_high_other < z_low
-        ):
-            return [self]
-
-        split_cuboids: list[Cuboid] = []
-        if x_low <= x_low_other - 1:
-            split_cuboids.append(
-                Cuboid((x_low, x_low_other - 1), (y_low, y_high), (z_low, z_high))
-            )
-        if x_high_other + 1 <= x_high:
-            split_cuboids.append(
-                Cuboid((x_high_other + 1, x_high), (y_low, y_high), (z_low, z_high))
-            )
-        x_low = max(x_low, x_low_other)
-        x_high = min(x_high, x_high_other)
-        if x_low <= x_high:
-            if y_low <= y_low_other - 1:
-                split_cuboids.append(
-                    Cuboid((x_low, x_high), (y_low, y_low_other - 1), (z_low, z_high))
-                )
-            if y_high_other + 1 <= y_high:
-                split_cuboids.append(
-                    Cuboid((x_low, x_high), (y_high_other + 1, y_high), (z_low, z_high))
-                )
-            y_low = max(y_low, y_low_other)
-            y_high = min(y_high, y_high_other)
-            if y_low <= y_high:
-                if z_low <= z_low_other - 1:
-                    split_cuboids.append(
-                        Cuboid((x_low, x_high), (y_low, y_high), (z_low, z_low_other - 1))
-                    )
-                if z_high_other + 1 <= z_high:
-                    split_cuboids.append(
-                        Cuboid(
-                            (x_low, x_high), (y_low, y_high), (z_high_other + 1, z_high)
-                        )
-                    )
-
-        return split_cuboids
-
-
-Instruction = tuple[bool, Cuboid]
-
-
-def clamp(num: int, low: int, high: int) -> int:
-    return max(low, min(num, high))
-
-
-def parse_instructions(problem_input: Iterable[str]) -> list[Instruction]:
-    instructions = []
-    for instruction in problem_input:
-        [state, bounds] = instruction.split()
-        [x_bounds, y_bounds, z_bounds] = bounds.split(",")
-        [x_low, x_high] = list(map(int, x_bounds[2:].split("..")))
-        [y_low, y_high] = list(map(int, y_bounds[2:].split("..")))
-        [z_low, z_high] = list(map(int, z_bounds[2:].split("..")))
-        instructions.append(
-            (
-                True if state == "on" else False,
-                Cuboid((x_low, x_high), (y_low, y_high), (z_low, z_high)),
-            )
+from typing import Iterable, Iterator
+
+import numpy as np
+from aoc.intervals import Box
+from aoc.parsing import extract_int_records
+from utils import cache_parsed_input, get_and_cache_input
+
+Instruction = tuple[bool, Box]
+
+INITIALIZATION_REGION = Box.from_inclusive((-50, 50), (-50, 50), (-50, 50))
+
+
+def parse_instructions(problem_input: list[str]) -> list[Instruction]:
+    bounds = extract_int_records(problem_input, 6)
+    return [
+        (
+            instruction.startswith("on"),
+            Box.from_inclusive((x_low, x_high), (y_low, y_high), (z_low, z_high)),
+        )
+        for instruction, (x_low, x_high, y_low, y_high, z_low, z_high) in zip(
+            problem_input, bounds
+        )
+    ]
+
+
+class Reactor:
+    """
+    The lit cubes of a reactor as a signed sum of boxes (inclusion-exclusion), where each
+    box adds its count, positive or negative, to every cube in it and lit cubes add up
+    to 1. An instruction cancels out its cuboid's intersection with every box so far,
+    and turning cubes on then adds the cuboid itself, so the lit volume is kept up to
+    date one instruction at a time.
+    """
+
+    # Half-open bounds of each box, one row per box
+    lows: np.ndarray
+    highs: np.ndarray
+    counts: np.ndarray
+    volume: int
+
+    _compacted_size: int
+
+    def __init__(self, dimensions: int = 3) -> None:
+        self.lows = np.zeros((0, dimensions), dtype=np.int64)
+        self.highs = np.zeros((0, dimensions), dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.volume = 0
+        self._compacted_size = 0
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def apply(self, should_enable: bool, cuboid: Box) -> int:
+        """
+        Turns a cuboid on or off, returning the lit volume after that.
+        """
+
+        low = np.array([start for start, _ in cuboid.bounds], dtype=np.int64)
+        high = np.array([stop for _, stop in cuboid.bounds], dtype=np.int64)
+
+        overlap_lows = np.maximum(self.lows, low)
+        overlap_highs = np.minimum(self.highs, high)
+        overlapping = np.all(overlap_lows < overlap_highs, axis=1)
+        new_lows = [overlap_lows[overlapping]]
+        new_highs = [overlap_highs[overlapping]]
+        new_counts = [-self.counts[overlapping]]
+        if should_enable and np.all(low < high):
+            new_lows.append(low[np.newaxis])
+            new_highs.append(high[np.newaxis])
+            new_counts.append(np.ones(1, dtype=np.int64))
+
+        added_lows = np.concatenate(new_lows)
+        added_highs = np.concatenate(new_highs)
+        added_counts = np.concatenate(new_counts)
+        # Summed as Python ints, since large cuboids' volumes get close to overflowing
+        added_volumes = np.prod(added_highs - added_lows, axis=1)
+        self.volume += sum(
+            volume * count
+            for volume, count in zip(added_volumes.tolist(), added_counts.tolist())
+        )
+
+        self.lows = np.concatenate([self.lows, added_lows])
+        self.highs = np.concatenate([self.highs, added_highs])
+        self.counts = np.concatenate([self.counts, added_counts])
+        if len(self) > 2 * self._compacted_size:
+            self._compact()
+
+        return self.volume
+
+    def _compact(self) -> None:
+        """
+        Merges identical boxes, dropping those whose counts cancel out. Instructions
+        often overlap in the same places, so this keeps the number of boxes down.
+        """
+
+        dimensions = self.lows.shape[1]
+        bounds, inverse = np.unique(
+            np.concatenate([self.lows, self.highs], axis=1), axis=0, return_inverse=True
         )
+        counts = np.zeros(len(bounds), dtype=np.int64)
+        np.add.at(counts, inverse.reshape(-1), self.counts)
 
-    return instructions
+        nonzero = counts != 0
+        self.lows = bounds[nonzero, :dimensions]
+        self.highs = bounds[nonzero, dimensions:]
+        self.counts = counts[nonzero]
+        self._compacted_size = len(self)
+
+
+def stream_lit_volumes(instructions: Iterable[Instruction]) -> Iterator[int]:
+    """
+    The lit volume after each instruction.
+    """
+
+    reactor = Reactor()
+    for should_enable, cuboid in instructions:
+        yield reactor.apply(should_enable, cuboid)
+
+
+def count_enabled_cubes(instructions: Iterable[Instruction]) -> int:
+    volume = 0
+    for volume in stream_lit_volumes(instructions):
+        pass
+
+    return volume
 
 
 def part_one(instructions: list[Instruction]) -> int:
-    enabled_cubes: set[tuple[int, int, int]] = set()
+    clipped_instructions: list[Instruction] = []
     for should_enable, cuboid in instructions:
-        (x_low, x_high) = cuboid.x_bounds
-        (y_low, y_high) = cuboid.y_bounds
-        (z_low, z_high) = cuboid.z_bounds
-        if (
-            x_high < -50
-            or 50 < x_low
-            or y_high < -50
-            or 50 < y_low
-            or z_high < -50
-            or 50 < z_low
-        ):
-            continue
-
-        (x_low, x_high) = (clamp(x_low, -50, 50), clamp(x_high, -50, 50))
-        (y_low, y_high) = (clamp(y_low, -50, 50), clamp(y_high, -50, 50))
-        (z_low, z_high) = (clamp(z_low, -50, 50), clamp(z_high, -50, 50))
-
-        for x in range(x_low, x_high + 1):
-            for y in range(y_low, y_high + 1):
-                for z in range(z_low, z_high + 1):
-                    if should_enable:
-                        enabled_cubes.add((x, y, z))
-                    else:
-                        if (x, y, z) in enabled_cubes:
-                            enabled_cubes.remove((x, y, z))
-
-    return len(enabled_cubes)
+        clipped_cuboid = cuboid.intersection(INITIALIZATION_REGION)
+        if clipped_cuboid is not None:
+            clipped_instructions.append((should_enable, clipped_cuboid))
+
+    return count_enabled_cubes(clipped_instructions)
 
 
 def part_two(instructions: list[Instruction]) -> int:
-    enabled_cuboids: list[Cuboid] = []
-    for should_enable, cuboid in instructions:
-        if should_enable:
-            cuboids_to_add = [cuboid]
-            for enabled_cuboid in enabled_cuboids:
-                cuboids_to_add = functools.reduce(
-                    lambda cuboids, c: cuboids + c.subtract(enabled_cuboid),
-                    cuboids_to_add,
-                    [],
-                )
-            enabled_cuboids = enabled_cuboids + cuboids_to_add
-        else:
-            enabled_cuboids = functools.reduce(
-                lambda cuboids, c: cuboids + c.subtract(cuboid), enabled_cuboids, []
-            )
-
-    return sum(map(lambda cuboid: cuboid.compute_volume(), enabled_cuboids))
+    return count_enabled_cubes(instructions)
+
+
+@cache_parsed_input
+def parse_input(problem_input: list[str]) -> tuple[list[Instruction]]:
+    return (parse_instructions([line for line in problem_input if line]),)
 
 
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    instructions = parse_instructions(filter(None, problem_input))
+    (instructions,) = parse_input(problem_input)
 
     print("Part One: ", part_one(instructions))
     print("Part Two: ", part_two(instructions))
@@ -1,229 +1,259 @@
-import copy
-import itertools
-from typing import Iterable, Iterator, Optional, Sequence, TypeVar
+from typing import Iterator, NamedTuple
 
+from aoc.search import find_shortest_path
 from utils import get_and_cache_input
 
-ROOM_INDEX_TO_AMPHIPOD = {0: "A", 1: "B", 2: "C", 3: "D"}
-AMPHIPOD_TO_ROOM_INDEX = {v: k for k, v in ROOM_INDEX_TO_AMPHIPOD.items()}
-AMPHIPOD_STEP_COSTS = {"A": 1, "B": 10, "C": 100, "D": 1000}
-
-
-T = TypeVar("T")
-
-
-def chunks(iterable: Iterable[T], chunk_size: int) -> Iterator[list[T]]:
-    it = iter(iterable)
-    while True:
-        chunk = list(itertools.islice(it, chunk_size))
-        if len(chunk) == 0:
-            return
-        yield chunk
-
-
-def build_burrow_str(
-    rooms: Sequence[list[Optional[str]]], hallway_slots: Sequence[Optional[str]]
-) -> str:
-    s = ""
-    for room in rooms:
-        s += "".join(map(lambda slot: slot or ".", room))
-    s += "|"
-    s += "".join(map(lambda slot: slot or ".", hallway_slots))
-
-    return s
-
-
-def parse_burrow_str(
-    burrow_str: str,
-) -> tuple[list[list[Optional[str]]], list[Optional[str]]]:
-    [rooms_str, hallway_str] = burrow_str.split("|")
-
-    return (
-        list(
-            chunks(
-                map(lambda c: None if c == "." else c, rooms_str), int(len(rooms_str) / 4)
-            )
-        ),
-        list(map(lambda c: None if c == "." else c, hallway_str)),
-    )
-
-
-def parse_input(problem_input: list[str]) -> str:
-    rooms: list[list[Optional[str]]] = []
-    for index in range(len(problem_input[2])):
-        if problem_input[2][index].isalpha():
-            rooms.append(list(problem_input[2][index]))
-
-    for row in problem_input[3:]:
-        parsed_row = row.strip().replace("#", "")
-        for index in range(len(parsed_row)):
-            rooms[index].append(parsed_row[index])
-
-    hallway_slots = [None] * (len(problem_input[1].strip("#")) - len(rooms))
-
-    return build_burrow_str(rooms, hallway_slots)
-
-
-def parse_folded_input(problem_input: list[str]) -> str:
-    rooms: list[list[Optional[str]]] = []
-    for index in range(len(problem_input[2])):
-        if problem_input[2][index].isalpha():
-            rooms.append(list(problem_input[2][index]))
-
-    unfolded_input = ["  #D#C#B#A#  ", "  #D#B#A#C#  "] + problem_input[3:]
-    for row in unfolded_input:
-        parsed_row = row.strip().replace("#", "")
-        for index in range(len(parsed_row)):
-            rooms[index].append(parsed_row[index])
-
-    hallway_slots = [None] * (len(problem_input[1].strip("#")) - len(rooms))
-
-    return build_burrow_str(rooms, hallway_slots)
+# Every slot (hallway spot or room spot) holds 0 when it's empty, or an amphipod's type
+# plus one, in 3 bits of the packed burrow
+SLOT_BITS = 3
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+FOLDED_ROWS = ["  #D#C#B#A#", "  #D#B#A#C#"]
+
+
+class RoomSummary(NamedTuple):
+    # Depth of the topmost amphipod (the room's depth when it's empty)
+    top: int
+    only_own_type: bool
+    # The energy the amphipods that have to leave need to get to their rooms' entrances,
+    # and how many of each type have to leave
+    energy: int
+    num_unsettled: list[int]
+
+
+class Burrow:
+    """
+    The layout of a burrow, with tables of the moves amphipods can make in it. A burrow's
+    state is an int packing its hallway spots (those not right outside a room) and then
+    every room's spots from the top down, so states can be searched directly.
+    """
+
+    num_rooms: int
+    room_depth: int
+    # Hallway positions of the spots amphipods can stop in, and of each room's entrance
+    stop_positions: list[int]
+    entrance_positions: list[int]
+    # Where each hallway spot and each room's spots (from the top down) are in a state
+    stop_shifts: list[int]
+    room_shifts: list[list[int]]
+    room_mask: int
+    # For every room and hallway spot: the steps between them, and a mask of the spots
+    # strictly in between, which have to be empty to walk past
+    distances: list[list[int]]
+    between_masks: list[list[int]]
+    goal: int
+
+    # A search only sees a few hundred different contents of each room, so what the
+    # moves and the heuristic need to know about them is worked out once per content
+    _room_summaries: list[dict[int, RoomSummary]]
+
+    def __init__(
+        self, hallway_length: int, entrance_positions: list[int], room_depth: int
+    ) -> None:
+        self.num_rooms = len(entrance_positions)
+        self.room_depth = room_depth
+        self.entrance_positions = entrance_positions
+        self.stop_positions = [
+            position
+            for position in range(hallway_length)
+            if position not in entrance_positions
+        ]
+
+        num_stops = len(self.stop_positions)
+        self.stop_shifts = [SLOT_BITS * stop for stop in range(num_stops)]
+        self.room_shifts = [
+            [
+                SLOT_BITS * (num_stops + room * room_depth + depth)
+                for depth in range(room_depth)
+            ]
+            for room in range(self.num_rooms)
+        ]
+
+        self.room_mask = (1 << (SLOT_BITS * room_depth)) - 1
+
+        self.distances = []
+        self.between_masks = []
+        for entrance_position in entrance_positions:
+            self.distances.append([])
+            self.between_masks.append([])
+            for stop_position in self.stop_positions:
+                low, high = sorted((entrance_position, stop_position))
+                self.distances[-1].append(high - low)
+                self.between_masks[-1].append(
+                    sum(
+                        SLOT_MASK << shift
+                        for shift, position in zip(self.stop_shifts, self.stop_positions)
+                        if low < position < high
+                    )
+                )
 
+        self.goal = self.pack(
+            [0] * num_stops, [[room] * room_depth for room in range(self.num_rooms)]
+        )
+        self._room_summaries = [{} for _ in range(self.num_rooms)]
+
+    def pack(self, hallway: list[int], rooms: list[list[int]]) -> int:
+        """
+        Packs hallway spots (each empty, 0, or an amphipod type plus one) and rooms (the
+        amphipod types in each room from the top down) into a state.
+        """
+
+        state = 0
+        for shift, value in zip(self.stop_shifts, hallway):
+            state |= value << shift
+        for shifts, amphipods in zip(self.room_shifts, rooms):
+            for shift, amphipod in zip(shifts, amphipods):
+                state |= (amphipod + 1) << shift
+
+        return state
+
+    def read_room(self, state: int, room: int) -> RoomSummary:
+        contents = (state >> self.room_shifts[room][0]) & self.room_mask
+        summary = self._room_summaries[room].get(contents)
+        if summary is None:
+            summary = self._summarize_room(state, room)
+            self._room_summaries[room][contents] = summary
+
+        return summary
+
+    def _summarize_room(self, state: int, room: int) -> RoomSummary:
+        top = self.room_depth
+        only_own_type = True
+        energy = 0
+        num_unsettled = [0] * self.num_rooms
+        shifts = self.room_shifts[room]
+        for depth in range(self.room_depth - 1, -1, -1):
+            value = (state >> shifts[depth]) & SLOT_MASK
+            if value == 0:
+                break
 
-lowest_costs: dict[str, Optional[int]] = {}
-lowest_costs[
-    build_burrow_str([["A"] * 2, ["B"] * 2, ["C"] * 2, ["D"] * 2], [None] * 7)
-] = 0
-lowest_costs[
-    build_burrow_str([["A"] * 4, ["B"] * 4, ["C"] * 4, ["D"] * 4], [None] * 7)
-] = 0
+            top = depth
+            amphipod = value - 1
+            if amphipod == room and only_own_type:
+                continue
 
+            # It has to leave the room, and step aside and back if it's its own room
+            only_own_type = False
+            steps = depth + 1
+            if amphipod == room:
+                steps += 2
+            else:
+                steps += abs(
+                    self.entrance_positions[room] - self.entrance_positions[amphipod]
+                )
+            energy += steps * 10**amphipod
+            num_unsettled[amphipod] += 1
 
-def compute_best_energy_cost(burrow_str: str) -> Optional[int]:
-    if burrow_str in lowest_costs:
-        return lowest_costs[burrow_str]
+        return RoomSummary(top, only_own_type, energy, num_unsettled)
 
-    (rooms, hallway) = parse_burrow_str(burrow_str)
+    def neighbors(self, state: int) -> Iterator[tuple[int, int]]:
+        rooms = [self.read_room(state, room) for room in range(self.num_rooms)]
 
-    next_states: list[tuple[str, int]] = []
+        # An amphipod that can walk into its room might as well do so right away
+        for stop, stop_shift in enumerate(self.stop_shifts):
+            value = (state >> stop_shift) & SLOT_MASK
+            if value == 0:
+                continue
+            room = value - 1
+            if not rooms[room].only_own_type or state & self.between_masks[room][stop]:
+                continue
 
-    for hallway_index in range(len(hallway)):
-        amphipod = hallway[hallway_index]
-        if amphipod is None:
-            continue
+            depth = rooms[room].top - 1
+            next_state = state & ~(SLOT_MASK << stop_shift)
+            next_state |= value << self.room_shifts[room][depth]
+            yield (next_state, (self.distances[room][stop] + depth + 1) * 10**room)
+            return
 
-        room_index = AMPHIPOD_TO_ROOM_INDEX[amphipod]
+        for room, summary in enumerate(rooms):
+            if summary.only_own_type:
+                continue
 
-        target_index_within_room: Optional[int] = None
-        for index_within_room in range(len(rooms[room_index])):
-            a = rooms[room_index][index_within_room]
-            if a is None:
-                target_index_within_room = index_within_room
-            elif a != amphipod:
-                target_index_within_room = None
-                break
+            top = summary.top
+            room_shift = self.room_shifts[room][top]
+            value = (state >> room_shift) & SLOT_MASK
+            step_cost = 10 ** (value - 1)
+            without_amphipod = state & ~(SLOT_MASK << room_shift)
+            for stop, stop_shift in enumerate(self.stop_shifts):
+                if state & (self.between_masks[room][stop] | SLOT_MASK << stop_shift):
+                    continue
+
+                yield (
+                    without_amphipod | value << stop_shift,
+                    (top + 1 + self.distances[room][stop]) * step_cost,
+                )
 
-        if target_index_within_room is None:
-            continue
-
-        if room_index + 2 > hallway_index:
-            hallway_start_index = hallway_index + 1
-            hallway_end_index = room_index + 2
-        else:
-            hallway_start_index = room_index + 2
-            hallway_end_index = hallway_index
-        if any(
-            slot is not None for slot in hallway[hallway_start_index:hallway_end_index]
-        ):
-            continue
-
-        next_rooms = copy.deepcopy(rooms)
-        next_rooms[room_index][target_index_within_room] = amphipod
-        next_hallway = hallway.copy()
-        next_hallway[hallway_index] = None
-
-        room_steps = target_index_within_room + 1
-        hallway_steps = (hallway_end_index - hallway_start_index) * 2
-        if 0 < hallway_index and hallway_index < 6:
-            hallway_steps += 1
-
-        next_states.append(
-            (
-                build_burrow_str(next_rooms, next_hallway),
-                AMPHIPOD_STEP_COSTS[amphipod] * (room_steps + hallway_steps),
-            )
+    def lowest_cost_to_organize(self, state: int) -> int:
+        """
+        Admissible and consistent: every amphipod not yet settled at the bottom of its
+        room walks to its room's entrance unhindered, then they fill their room's
+        unsettled spots.
+        """
+
+        energy = 0
+        num_unsettled = [0] * self.num_rooms
+        for stop_shift, stop_position in zip(self.stop_shifts, self.stop_positions):
+            value = (state >> stop_shift) & SLOT_MASK
+            if value != 0:
+                amphipod = value - 1
+                distance = abs(stop_position - self.entrance_positions[amphipod])
+                energy += distance * 10**amphipod
+                num_unsettled[amphipod] += 1
+
+        for room in range(self.num_rooms):
+            summary = self.read_room(state, room)
+            energy += summary.energy
+            for amphipod, count in enumerate(summary.num_unsettled):
+                num_unsettled[amphipod] += count
+
+        return energy + sum(
+            count * (count + 1) // 2 * 10**amphipod
+            for amphipod, count in enumerate(num_unsettled)
         )
 
-    for room_index in range(len(rooms)):
-        room = rooms[room_index]
-        if all(
-            amphipod is None or amphipod == ROOM_INDEX_TO_AMPHIPOD[room_index]
-            for amphipod in room
-        ):
-            continue
-
-        for index_within_room in range(len(rooms[room_index])):
-            amphipod = rooms[room_index][index_within_room]
-            if amphipod is None:
-                continue
 
-            (left_index, right_index) = (room_index + 1, room_index + 2)
-            hallway_indices = set()
-            while (left_index >= 0 and hallway[left_index] is None) or (
-                right_index < len(hallway) and hallway[right_index] is None
-            ):
-                if left_index >= 0 and hallway[left_index] is None:
-                    hallway_indices.add(left_index)
-                    left_index -= 1
-                if right_index < len(hallway) and hallway[right_index] is None:
-                    hallway_indices.add(right_index)
-                    right_index += 1
-
-            for hallway_index in hallway_indices:
-                next_rooms = copy.deepcopy(rooms)
-                next_rooms[room_index][index_within_room] = None
-                next_hallway = hallway.copy()
-                next_hallway[hallway_index] = amphipod
-
-                room_steps = index_within_room + 1
-                if room_index + 2 <= hallway_index:
-                    hallway_steps = (hallway_index - (room_index + 2)) * 2
-                else:
-                    hallway_steps = (room_index + 1 - hallway_index) * 2
-
-                if 0 < hallway_index and hallway_index < 6:
-                    hallway_steps += 1
-
-                next_states.append(
-                    (
-                        build_burrow_str(next_rooms, next_hallway),
-                        AMPHIPOD_STEP_COSTS[amphipod] * (room_steps + hallway_steps),
-                    )
-                )
+def parse_burrow(problem_input: list[str]) -> tuple[Burrow, int]:
+    """
+    A burrow's layout and starting state, with rooms as deep as there are rows of
+    amphipods in the diagram.
+    """
 
-            break
+    room_rows = [
+        [ord(c) - ord("A") for c in row if c.isalpha()]
+        for row in problem_input[2:]
+        if any(c.isalpha() for c in row)
+    ]
+    entrance_positions = [
+        index - 1 for index, c in enumerate(problem_input[2]) if c.isalpha()
+    ]
+    burrow = Burrow(len(problem_input[1].strip()) - 2, entrance_positions, len(room_rows))
+    rooms = [list(room) for room in zip(*room_rows)]
 
-    lowest_cost: Optional[int] = None
-    for next_state, cost in next_states:
-        cost_to_organize = compute_best_energy_cost(next_state)
-        if cost_to_organize is not None and (
-            lowest_cost is None or cost + cost_to_organize < lowest_cost
-        ):
-            lowest_cost = cost + cost_to_organize
+    return (burrow, burrow.pack([0] * len(burrow.stop_positions), rooms))
 
-    lowest_costs[burrow_str] = lowest_cost
-    return lowest_cost
 
+def parse_folded_input(problem_input: list[str]) -> tuple[Burrow, int]:
+    return parse_burrow(problem_input[:3] + FOLDED_ROWS + problem_input[3:])
 
-def part_one(problem_input: list[str]) -> int:
-    burrow_str = parse_input(problem_input)
 
-    lowest_cost = compute_best_energy_cost(burrow_str)
-    if lowest_cost is None:
+def compute_best_energy_cost(burrow: Burrow, start: int) -> int:
+    result = find_shortest_path(
+        [start],
+        burrow.neighbors,
+        lambda state: state == burrow.goal,
+        burrow.lowest_cost_to_organize,
+    )
+    if result.cost is None:
         raise ValueError("No solution to the given input")
 
-    return lowest_cost
+    return result.cost
 
 
-def part_two(problem_input: list[str]) -> int:
-    burrow_str = parse_folded_input(problem_input)
+def part_one(problem_input: list[str]) -> int:
+    return compute_best_energy_cost(*parse_burrow(problem_input))
 
-    lowest_cost = compute_best_energy_cost(burrow_str)
-    if lowest_cost is None:
-        raise ValueError("No solution to the given input")
 
-    return lowest_cost
+def part_two(problem_input: list[str]) -> int:
+    return compute_best_energy_cost(*parse_folded_input(problem_input))
 
 
 if __name__ == "__main__":
@@ -1,59 +1,320 @@
-from collections import deque
+import operator
+from typing import Callable, Optional, Sequence
 
 from utils import get_and_cache_input
 
+REGISTERS = "wxyz"
+Z = REGISTERS.index("z")
+DIGITS = range(1, 10)
 
-def part_one(digit_candidates: list[set[int]]) -> int:
-    model_number = ""
-    for candidates in digit_candidates:
-        model_number += str(max(candidates))
+# Every block of MONAD is this one with a different divisor of z and offsets added to x
+# and y: it pushes the digit plus the y offset onto z as a stack of base 26 digits, and
+# with a divisor of 26 first pops a value, only pushing if the digit isn't that value
+# plus the x offset
+MONAD_BLOCK = [
+    "inp w",
+    "mul x 0",
+    "add x z",
+    "mod x 26",
+    "div z {}",
+    "add x {}",
+    "eql x w",
+    "eql x 0",
+    "mul y 0",
+    "add y 25",
+    "mul y x",
+    "add y 1",
+    "mul z y",
+    "mul y 0",
+    "add y w",
+    "add y {}",
+    "mul y x",
+    "add z y",
+]
 
-    return int(model_number)
+Instruction = list[str]
+Step = Callable[[list[int]], None]
 
 
-def part_two(digit_candidates: list[set[int]]) -> int:
-    model_number = ""
-    for candidates in digit_candidates:
-        model_number += str(min(candidates))
+def alu_div(a: int, b: int) -> int:
+    if b == 0:
+        raise ValueError("Division by zero")
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
 
-    return int(model_number)
 
+def alu_mod(a: int, b: int) -> int:
+    if a < 0 or b <= 0:
+        raise ValueError(f"Invalid modulo {a} % {b}")
+    return a % b
 
-if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
 
-    a_values = [1, 1, 1, 1, 26, 1, 26, 26, 1, 26, 1, 26, 26, 26]
-    b_values = [10, 15, 14, 15, -8, 10, -16, -4, 11, -3, 12, -7, -15, -7]
-    c_values = [2, 16, 9, 0, 1, 12, 6, 6, 3, 5, 9, 3, 2, 3]
+OPERATIONS: dict[str, Callable[[int, int], int]] = {
+    "add": operator.add,
+    "mul": operator.mul,
+    "div": alu_div,
+    "mod": alu_mod,
+    "eql": lambda a, b: int(a == b),
+}
 
-    digit_candidates: list[set[int]] = []
-    for _ in range(14):
-        digit_candidates.append(set([1, 2, 3, 4, 5, 6, 7, 8, 9]))
 
-    c_stack: deque[int] = deque()
-    for index in range(14):
-        b = b_values[index]
-        if b >= 0:
-            c_stack.append(index)
-        else:
-            prev_c_index = c_stack.pop()
-            prev_c = c_values[prev_c_index]
-            diff = prev_c + b
-            if diff > 0:
-                for n in range(10 - diff, 10):
-                    if n in digit_candidates[prev_c_index]:
-                        digit_candidates[prev_c_index].remove(n)
+def compile_instruction(instruction: Instruction) -> Step:
+    """
+    An instruction as a closure updating a list of register values, with its operation
+    and operands looked up once.
+    """
+
+    [name, target_register, operand] = instruction
+    operation = OPERATIONS[name]
+    target = REGISTERS.index(target_register)
+
+    if operand in REGISTERS:
+        source = REGISTERS.index(operand)
+
+        def step(registers: list[int]) -> None:
+            registers[target] = operation(registers[target], registers[source])
+
+    else:
+        value = int(operand)
+
+        def step(registers: list[int]) -> None:
+            registers[target] = operation(registers[target], value)
+
+    return step
+
+
+class Block:
+    """
+    The instructions from an `inp` up to the next one, compiled to closures.
+    """
+
+    instructions: list[Instruction]
+    input_register: int
+    steps: list[Step]
+
+    def __init__(self, instructions: list[Instruction]) -> None:
+        if instructions[0][0] != "inp":
+            raise ValueError("Blocks have to start with an inp instruction")
+
+        self.instructions = instructions
+        self.input_register = REGISTERS.index(instructions[0][1])
+        self.steps = [
+            compile_instruction(instruction) for instruction in instructions[1:]
+        ]
+
+    def run(self, registers: list[int], digit: int) -> None:
+        registers[self.input_register] = digit
+        for step in self.steps:
+            step(registers)
+
+    def get_live_registers(self, live_after: set[int]) -> set[int]:
+        """
+        The registers whose values at the start of the block can still matter, given
+        those that matter after it.
+        """
+
+        live = set(live_after)
+        for [name, target_register, *operands] in reversed(self.instructions):
+            target = REGISTERS.index(target_register)
+            if name == "inp" or (name == "mul" and operands == ["0"]):
+                live.discard(target)
+            elif target in live and operands[0] in REGISTERS:
+                live.add(REGISTERS.index(operands[0]))
+
+        return live
+
+    def get_monad_parameters(self) -> Optional[tuple[int, int, int]]:
+        """
+        The z divisor and the x and y offsets of a block, if it's a MONAD block.
+        """
+
+        if len(self.instructions) != len(MONAD_BLOCK):
+            return None
+
+        parameters: list[int] = []
+        for instruction, expected in zip(self.instructions, MONAD_BLOCK):
+            line = " ".join(instruction)
+            if expected.endswith("{}"):
+                prefix = expected[:-2]
+                if not line.startswith(prefix):
+                    return None
+                try:
+                    parameters.append(int(line[len(prefix) :]))
+                except ValueError:
+                    return None
+            elif line != expected:
+                return None
+
+        [z_divisor, x_offset, y_offset] = parameters
+        return (z_divisor, x_offset, y_offset)
+
+    def get_z_divisor(self) -> Optional[int]:
+        """
+        The product of the literal divisors of z in the block, if every other write to z
+        is MONAD's `mul z y` or `add z y`. None for blocks that can shrink z otherwise.
+        """
+
+        z_divisor = 1
+        for [name, target_register, *operands] in self.instructions:
+            if target_register != "z":
+                continue
+            if name == "div" and operands[0] not in REGISTERS:
+                z_divisor *= max(1, abs(int(operands[0])))
+            elif name not in ("mul", "add") or operands != ["y"]:
+                return None
+
+        return z_divisor
+
+
+def parse_program(problem_input: list[str]) -> list[Block]:
+    blocks: list[list[Instruction]] = []
+    for line in problem_input:
+        if line == "":
+            continue
+        instruction = line.split()
+        if instruction[0] == "inp":
+            blocks.append([])
+        elif len(blocks) == 0:
+            raise ValueError("The program has to start with an inp instruction")
+        blocks[-1].append(instruction)
+
+    return [Block(instructions) for instructions in blocks]
+
+
+def run_program(blocks: Sequence[Block], digits: Sequence[int]) -> list[int]:
+    registers = [0, 0, 0, 0]
+    for block, digit in zip(blocks, digits):
+        block.run(registers, digit)
+
+    return registers
+
+
+def solve_monad_constraints(
+    parameters: list[tuple[int, int, int]], largest: bool
+) -> Optional[list[int]]:
+    """
+    Pairs every block popping from z with the block that pushed what it pops, whose
+    digits then have to differ by the pushed y offset plus the popping x offset for z to
+    end up empty. Returns None for blocks that don't follow that pattern.
+    """
+
+    digits = [0] * len(parameters)
+    stack: list[tuple[int, int]] = []
+    for index, (z_divisor, x_offset, y_offset) in enumerate(parameters):
+        if z_divisor == 1:
+            # Pushing blocks only always push when no digit can equal the x offset
+            if x_offset <= 9:
+                return None
+            stack.append((index, y_offset))
+        elif z_divisor == 26:
+            if len(stack) == 0:
+                return None
+            pushed_index, pushed_offset = stack.pop()
+            difference = pushed_offset + x_offset
+            if abs(difference) > 8:
+                return None
+
+            if largest:
+                digits[pushed_index] = min(9, 9 - difference)
             else:
-                for n in range(1, -diff + 1):
-                    if n in digit_candidates[prev_c_index]:
-                        digit_candidates[prev_c_index].remove(n)
-
-            digit_candidates[index] = digit_candidates[index].intersection(
-                {
-                    prev_candidate + diff
-                    for prev_candidate in digit_candidates[prev_c_index]
-                }
-            )
-
-    print("Part One: ", part_one(digit_candidates))
-    print("Part Two: ", part_two(digit_candidates))
+                digits[pushed_index] = max(1, 1 - difference)
+            digits[index] = digits[pushed_index] + difference
+        else:
+            return None
+
+    return digits if len(stack) == 0 else None
+
+
+def search_model_number(blocks: list[Block], largest: bool) -> Optional[list[int]]:
+    """
+    Tries digits in order, one block at a time, remembering every state known to lead
+    nowhere: a block and the values of the registers still read after it starts (only z
+    in MONAD). While every remaining write to z has MONAD's form, z only shrinks through
+    `div z`, so states with z too large to be divided back down to 0 are skipped.
+    """
+
+    live_registers: list[list[int]] = [[] for _ in blocks]
+    live = {Z}
+    for index in range(len(blocks) - 1, -1, -1):
+        live = blocks[index].get_live_registers(live)
+        live_registers[index] = sorted(live)
+
+    z_limits: list[Optional[int]] = [1] * (len(blocks) + 1)
+    for index in range(len(blocks) - 1, -1, -1):
+        z_divisor = blocks[index].get_z_divisor()
+        z_limit = z_limits[index + 1]
+        z_limits[index] = (
+            z_limit * z_divisor if z_limit is not None and z_divisor is not None else None
+        )
+
+    digit_order = list(reversed(DIGITS) if largest else DIGITS)
+    dead_ends: set[tuple[int, ...]] = set()
+
+    def search(index: int, registers: list[int]) -> Optional[list[int]]:
+        if index == len(blocks):
+            return [] if registers[Z] == 0 else None
+        z_limit = z_limits[index]
+        if z_limit is not None and registers[Z] >= z_limit:
+            return None
+        state = (index, *(registers[register] for register in live_registers[index]))
+        if state in dead_ends:
+            return None
+
+        for digit in digit_order:
+            next_registers = registers.copy()
+            try:
+                blocks[index].run(next_registers, digit)
+            except ValueError:
+                continue
+            rest = search(index + 1, next_registers)
+            if rest is not None:
+                return [digit] + rest
+
+        dead_ends.add(state)
+        return None
+
+    return search(0, [0, 0, 0, 0])
+
+
+def find_model_number(blocks: list[Block], largest: bool) -> int:
+    """
+    Solves the digit constraints of a MONAD program directly from its block parameters,
+    falling back to a search over the program's states for anything else. Either way,
+    the model number is checked by running the program.
+    """
+
+    digits: Optional[list[int]] = None
+    parameters = [block.get_monad_parameters() for block in blocks]
+    monad_parameters = [p for p in parameters if p is not None]
+    if len(monad_parameters) == len(blocks):
+        digits = solve_monad_constraints(monad_parameters, largest)
+    if digits is None or run_program(blocks, digits)[Z] != 0:
+        digits = search_model_number(blocks, largest)
+
+    if digits is None:
+        raise ValueError("No model number is valid")
+    if run_program(blocks, digits)[Z] != 0:
+        raise ValueError(f"{''.join(map(str, digits))} isn't a valid model number")
+
+    return int("".join(map(str, digits)))
+
+
+def part_one(blocks: list[Block]) -> int:
+    return find_model_number(blocks, True)
+
+
+def part_two(blocks: list[Block]) -> int:
+    return find_model_number(blocks, False)
+
+
+def parse_input(problem_input: list[str]) -> tuple[list[Block]]:
+    return (parse_program(problem_input),)
+
+
+if __name__ == "__main__":
+    problem_input = get_and_cache_input(__file__)
+
+    (blocks,) = parse_input(problem_input)
+
+    print("Part One: ", part_one(blocks))
+    print("Part Two: ", part_two(blocks))
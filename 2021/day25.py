@@ -1,105 +1,53 @@
 from __future__ import annotations
 
-import copy
-from enum import Enum, unique
-
+from aoc.bitboard import BitGrid
 from utils import get_and_cache_input
 
+SeaFloor = tuple[BitGrid, int, int]
 
-@unique
-class Space(str, Enum):
-    EMPTY = "EMPTY"
-    EAST = "EAST"
-    SOUTH = "SOUTH"
-
-    def from_input(space: str) -> Space:
-        if space == ".":
-            return Space.EMPTY
-        elif space == ">":
-            return Space.EAST
-        elif space == "v":
-            return Space.SOUTH
-
-        raise ValueError(f"Unknown space value: {space}")
-
-    def __repr__(self) -> str:
-        if self == Space.EMPTY:
-            return "."
-        if self == Space.EAST:
-            return ">"
-        if self == Space.SOUTH:
-            return "v"
-
-        raise ValueError(f"Unknown space value: {self}")
 
+def parse_sea_floor(problem_input: list[str]) -> SeaFloor:
+    """
+    The grid of the sea floor, with boards of the east-facing and south-facing herds.
+    """
 
-def parse_sea_floor(problem_input: list[str]) -> list[list[Space]]:
-    sea_floor = []
-    for line in problem_input:
-        row = []
-        for space in line:
-            row.append(Space.from_input(space))
-        sea_floor.append(row)
+    grid = BitGrid(len(problem_input[0]), len(problem_input))
+    return (grid, grid.parse(problem_input, ">"), grid.parse(problem_input, "v"))
 
-    return sea_floor
 
+def part_one(sea_floor: SeaFloor) -> int:
+    grid, east, south = sea_floor
 
-def part_one(sea_floor: list[list[Space]]) -> int:
     step = 0
-    width = len(sea_floor[0])
-    height = len(sea_floor)
     while True:
         step += 1
-        locations_to_move: set[tuple[int, int]] = set()
-        for row in range(height):
-            for col in range(width):
-                space = sea_floor[row][col]
-                if space == Space.EMPTY:
-                    continue
-
-                if space == Space.EAST:
-                    if sea_floor[row][(col + 1) % width] == Space.EMPTY:
-                        locations_to_move.add((row, col))
-                elif space == Space.SOUTH:
-                    if (
-                        sea_floor[(row + 1) % height][col] == Space.EMPTY
-                        and sea_floor[(row + 1) % height][(col - 1 + width) % width]
-                        != Space.EAST
-                    ) or (
-                        sea_floor[(row + 1) % height][col] == Space.EAST
-                        and sea_floor[(row + 1) % height][(col + 1) % width]
-                        == Space.EMPTY
-                    ):
-                        locations_to_move.add((row, col))
-
-        if len(locations_to_move) == 0:
-            break
 
-        next_sea_floor = copy.deepcopy(sea_floor)
-        for row, col in locations_to_move:
-            space = sea_floor[row][col]
-            if space == Space.EAST:
-                if space == next_sea_floor[row][col]:
-                    next_sea_floor[row][col] = Space.EMPTY
-                next_sea_floor[row][(col + 1) % width] = Space.EAST
-            elif space == Space.SOUTH:
-                if space == next_sea_floor[row][col]:
-                    next_sea_floor[row][col] = Space.EMPTY
-                next_sea_floor[(row + 1) % height][col] = Space.SOUTH
+        empty = grid.full & ~(east | south)
+        moving_east = east & grid.neighbors(empty, 0, 1, wrap=True)
+        east = (east & ~moving_east) | grid.shift(moving_east, 0, 1, wrap=True)
+
+        empty = grid.full & ~(east | south)
+        moving_south = south & grid.neighbors(empty, 1, 0, wrap=True)
+        south = (south & ~moving_south) | grid.shift(moving_south, 1, 0, wrap=True)
 
-        sea_floor = next_sea_floor
+        if moving_east == 0 and moving_south == 0:
+            break
 
     return step
 
 
-def part_two(problem_input: list[str]) -> int:
+def part_two(sea_floor: SeaFloor) -> int:
     pass
 
 
+def parse_input(problem_input: list[str]) -> tuple[SeaFloor]:
+    return (parse_sea_floor(problem_input),)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    sea_floor = parse_sea_floor(problem_input)
+    (sea_floor,) = parse_input(problem_input)
 
     print("Part One: ", part_one(sea_floor))
-    print("Part Two: ", part_two(problem_input))
+    print("Part Two: ", part_two(sea_floor))
@@ -49,6 +49,9 @@ class BingoBoard:
 
 
 def part_one(numbers_to_call: list[int], boards: list[BingoBoard]) -> int:
+    for board in boards:
+        board.reset()
+
     for number in numbers_to_call:
         for board in boards:
             if board.mark(number):
@@ -58,6 +61,9 @@ def part_one(numbers_to_call: list[int], boards: list[BingoBoard]) -> int:
 
 
 def part_two(numbers_to_call: list[int], boards: list[BingoBoard]) -> int:
+    for board in boards:
+        board.reset()
+
     last_board_to_win = None
     boards_left = boards
     for number in numbers_to_call:
@@ -75,9 +81,7 @@ def part_two(numbers_to_call: list[int], boards: list[BingoBoard]) -> int:
     raise ValueError("No board won!")
 
 
-if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
-
+def parse_input(problem_input: list[str]) -> tuple[list[int], list[BingoBoard]]:
     numbers_to_call = list(map(int, problem_input[0].split(",")))
 
     boards: list[BingoBoard] = []
@@ -91,7 +95,13 @@ if __name__ == "__main__":
             boards.append(BingoBoard(board_input))
             board_input = []
 
+    return (numbers_to_call, boards)
+
+
+if __name__ == "__main__":
+    problem_input = get_and_cache_input(__file__)
+
+    (numbers_to_call, boards) = parse_input(problem_input)
+
     print("Part One: ", part_one(numbers_to_call, boards))
-    for board in boards:
-        board.reset()
     print("Part Two: ", part_two(numbers_to_call, boards))
@@ -85,17 +85,23 @@ class GridPlot:
         return s
 
 
-def part_one(plot: GridPlot) -> int:
-    return plot.get_intersection_count()
+def part_one(
+    lines: list[Tuple[Tuple[int, int], Tuple[int, int]]], max_bounds: Tuple[int, int]
+) -> int:
+    plot_without_diagonals = GridPlot(lines, max_bounds, include_diagonals=False)
+    return plot_without_diagonals.get_intersection_count()
 
 
-def part_two(plot: GridPlot) -> int:
-    return plot.get_intersection_count()
+def part_two(
+    lines: list[Tuple[Tuple[int, int], Tuple[int, int]]], max_bounds: Tuple[int, int]
+) -> int:
+    plot_with_diagonals = GridPlot(lines, max_bounds)
+    return plot_with_diagonals.get_intersection_count()
 
 
-if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
-
+def parse_input(
+    problem_input: list[str],
+) -> tuple[list[Tuple[Tuple[int, int], Tuple[int, int]]], Tuple[int, int]]:
     lines: list[Tuple[Tuple[int, int], Tuple[int, int]]] = []
 
     (max_x, max_y) = (0, 0)
@@ -108,8 +114,13 @@ if __name__ == "__main__":
         max_y = max(max_y, y1, y2)
         lines.append(((x1, y1), (x2, y2)))
 
-    plot_without_diagonals = GridPlot(lines, (max_x, max_y), include_diagonals=False)
-    plot_with_diagonals = GridPlot(lines, (max_x, max_y))
+    return (lines, (max_x, max_y))
+
+
+if __name__ == "__main__":
+    problem_input = get_and_cache_input(__file__)
+
+    (lines, max_bounds) = parse_input(problem_input)
 
-    print("Part One: ", part_one(plot_without_diagonals))
-    print("Part Two: ", part_two(plot_with_diagonals))
+    print("Part One: ", part_one(lines, max_bounds))
+    print("Part Two: ", part_two(lines, max_bounds))
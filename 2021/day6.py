@@ -38,10 +38,14 @@ def part_two(initial_state: list[int]) -> int:
     return sum(list(fish_timers.values()))
 
 
+def parse_input(problem_input: list[str]) -> tuple[list[int]]:
+    return (list(map(int, problem_input[0].split(","))),)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    fish_timers = list(map(int, problem_input[0].split(",")))
+    (fish_timers,) = parse_input(problem_input)
 
     print("Part One: ", part_one(fish_timers))
     print("Part Two: ", part_two(fish_timers))
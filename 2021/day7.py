@@ -45,10 +45,14 @@ def part_two(crab_positions: list[int]) -> int:
     return best_cost
 
 
+def parse_input(problem_input: list[str]) -> tuple[list[int]]:
+    return (list(map(int, problem_input[0].split(","))),)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    crab_positions = list(map(int, problem_input[0].split(",")))
+    (crab_positions,) = parse_input(problem_input)
 
     print("Part One: ", part_one(crab_positions))
     print("Part Two: ", part_two(crab_positions))
@@ -119,10 +119,14 @@ def parse_entry(entry: str) -> Tuple[list[str], list[str]]:
     return (signal_digits.split(), output_digits.split())
 
 
+def parse_input(problem_input: list[str]) -> tuple[list[Tuple[list[str], list[str]]]]:
+    return (list(map(parse_entry, problem_input)),)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    parsed_display_log = list(map(parse_entry, problem_input))
+    (parsed_display_log,) = parse_input(problem_input)
 
     print("Part One: ", part_one(parsed_display_log))
     print("Part Two: ", part_two(parsed_display_log))
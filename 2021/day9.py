@@ -1,73 +1,46 @@
-import copy
 import math
-from typing import Optional, TypedDict
 
+import numpy as np
+from aoc.grid import ORTHOGONAL_DIRECTIONS, Grid2D, shift
 from utils import get_and_cache_input
 
 
-def is_low_point(heightmap: list[list[int]], row: int, col: int) -> bool:
-    height = heightmap[row][col]
-    if row > 0 and heightmap[row - 1][col] <= height:
-        return False
-    elif row < len(heightmap) - 1 and heightmap[row + 1][col] <= height:
-        return False
-    elif col > 0 and heightmap[row][col - 1] <= height:
-        return False
-    elif col < len(heightmap[row]) - 1 and heightmap[row][col + 1] <= height:
-        return False
+def part_one(heightmap: Grid2D) -> int:
+    is_low_point = np.ones(heightmap.shape, dtype=bool)
+    for d_row, d_col in ORTHOGONAL_DIRECTIONS:
+        is_low_point &= heightmap.cells < heightmap.shifted(d_row, d_col, 10)
 
-    return True
+    return int((heightmap.cells[is_low_point].astype(np.int64) + 1).sum())
 
 
-def part_one(heightmap: list[list[int]]) -> int:
-    risk = 0
-    for row in range(len(heightmap)):
-        for col in range(len(heightmap[row])):
-            if is_low_point(heightmap, row, col):
-                risk += heightmap[row][col] + 1
+def part_two(heightmap: Grid2D) -> int:
+    # Every basin cell starts with its own label, then takes the smallest label among its
+    # neighbors until each basin shares a single label
+    in_basin = heightmap.cells < 9
+    no_label = heightmap.height * heightmap.width
+    labels = np.where(in_basin, np.arange(no_label).reshape(heightmap.shape), no_label)
+    while True:
+        next_labels = labels
+        for d_row, d_col in ORTHOGONAL_DIRECTIONS:
+            next_labels = np.minimum(next_labels, shift(labels, d_row, d_col, no_label))
+        next_labels = np.where(in_basin, next_labels, no_label)
+        if np.array_equal(next_labels, labels):
+            break
+        labels = next_labels
 
-    return risk
+    basin_sizes = np.bincount(labels[in_basin])
+    basin_sizes = basin_sizes[basin_sizes > 0]
+    return math.prod(int(size) for size in np.sort(basin_sizes)[-3:])
 
 
-class Location(TypedDict):
-    height: int
-    group: Optional[int]
-
-
-def fill_basin(heightmap: list[list[int]], row: int, col: int) -> int:
-    filled_locations = 0
-
-    heightmap[row][col] = 9
-    filled_locations += 1
-
-    if row > 0 and heightmap[row - 1][col] < 9:
-        filled_locations += fill_basin(heightmap, row - 1, col)
-    if row < len(heightmap) - 1 and heightmap[row + 1][col] < 9:
-        filled_locations += fill_basin(heightmap, row + 1, col)
-    if col > 0 and heightmap[row][col - 1] < 9:
-        filled_locations += fill_basin(heightmap, row, col - 1)
-    if col < len(heightmap[row]) - 1 and heightmap[row][col + 1] < 9:
-        filled_locations += fill_basin(heightmap, row, col + 1)
-
-    return filled_locations
-
-
-def part_two(heightmap: list[list[int]]) -> int:
-    modifiable_heightmap = copy.deepcopy(heightmap)
-
-    basins: list[int] = []
-    for row in range(len(modifiable_heightmap)):
-        for col in range(len(modifiable_heightmap[row])):
-            if modifiable_heightmap[row][col] < 9:
-                basins.append(fill_basin(modifiable_heightmap, row, col))
-
-    return math.prod(sorted(basins, reverse=True)[:3])
+def parse_input(problem_input: list[str]) -> tuple[Grid2D]:
+    return (Grid2D.from_digits(problem_input),)
 
 
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    heightmap = [list(map(int, row)) for row in problem_input]
+    (heightmap,) = parse_input(problem_input)
 
     print("Part One: ", part_one(heightmap))
     print("Part Two: ", part_two(heightmap))
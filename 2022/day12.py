@@ -1,6 +1,6 @@
-from collections import deque
-from typing import Optional
+from typing import Iterator
 
+from aoc.search import find_shortest_path
 from utils import get_and_cache_input
 
 HEIGHTMAP = list("abcdefghijklmnopqrstuvwxyz")
@@ -25,61 +25,48 @@ class Map:
                 else:
                     self.map[row].append(HEIGHTMAP.index(cell))
 
-    def find_shortest_path(self) -> list[tuple[int, int]]:
-        node_to_from_node: dict[tuple[int, int], Optional[tuple[int, int]]] = {}
-        nodes_to_visit: deque[tuple[int, int]] = deque()
-
-        nodes_to_visit.append(self.start)
-        node_to_from_node[self.start] = None
-
-        found_path = False
-        while len(nodes_to_visit) > 0:
-            node = nodes_to_visit.popleft()
-
-            if node == self.end:
-                found_path = True
-                break
-
-            row, col = node
-            current_height = self.map[row][col]
-            if (
-                (row - 1, col) not in node_to_from_node
-                and row > 0
-                and current_height - self.map[row - 1][col] >= -1
-            ):
-                nodes_to_visit.append((row - 1, col))
-                node_to_from_node[(row - 1, col)] = node
-            if (
-                (row + 1, col) not in node_to_from_node
-                and row < len(self.map) - 1
-                and current_height - self.map[row + 1][col] >= -1
-            ):
-                nodes_to_visit.append((row + 1, col))
-                node_to_from_node[(row + 1, col)] = node
-            if (
-                (row, col - 1) not in node_to_from_node
-                and col > 0
-                and current_height - self.map[row][col - 1] >= -1
-            ):
-                nodes_to_visit.append((row, col - 1))
-                node_to_from_node[(row, col - 1)] = node
-            if (row, col + 1) not in node_to_from_node and (
-                col < len(self.map[row]) - 1
-                and current_height - self.map[row][col + 1] >= -1
-            ):
-                nodes_to_visit.append((row, col + 1))
-                node_to_from_node[(row, col + 1)] = node
-
-        if not found_path:
+    def encode(self, position: tuple[int, int]) -> int:
+        return position[0] * len(self.map[0]) + position[1]
+
+    def decode(self, cell: int) -> tuple[int, int]:
+        row, col = divmod(cell, len(self.map[0]))
+        return (row, col)
+
+    def find_shortest_path(
+        self, starts: list[tuple[int, int]] | None = None
+    ) -> list[tuple[int, int]]:
+        """
+        Breadth-first search from the start, or from whichever of `starts` is closest to
+        the end.
+        """
+
+        height, width = len(self.map), len(self.map[0])
+        heights = [cell_height for row in self.map for cell_height in row]
+
+        def neighbors(cell: int) -> Iterator[tuple[int, int]]:
+            row, col = divmod(cell, width)
+            max_height = heights[cell] + 1
+            if row > 0 and heights[cell - width] <= max_height:
+                yield cell - width, 1
+            if row < height - 1 and heights[cell + width] <= max_height:
+                yield cell + width, 1
+            if col > 0 and heights[cell - 1] <= max_height:
+                yield cell - 1, 1
+            if col < width - 1 and heights[cell + 1] <= max_height:
+                yield cell + 1, 1
+
+        end = self.encode(self.end)
+        result = find_shortest_path(
+            map(self.encode, starts if starts is not None else [self.start]),
+            neighbors,
+            lambda cell: cell == end,
+            queue="buckets",
+            track_paths=True,
+        )
+        if result.goal is None:
             raise ValueError("Couldn't find a path")
 
-        path: list[tuple[int, int]] = []
-        path_node: Optional[tuple[int, int]] = self.end
-        while path_node is not None:
-            path.insert(0, path_node)
-            path_node = node_to_from_node[path_node]
-
-        return path
+        return [self.decode(cell) for cell in result.path()]
 
 
 def part_one(problem_input: list[str]) -> int:
@@ -89,25 +76,14 @@ def part_one(problem_input: list[str]) -> int:
 
 def part_two(problem_input: list[str]) -> int:
     map = Map(problem_input)
-    best_distance = len(map.find_shortest_path()) - 1
 
-    possible_starts: set[tuple[int, int]] = set()
+    possible_starts: list[tuple[int, int]] = []
     for row in range(len(map.map)):
-        for col in range(len(map.map)):
-            if map.start != (row, col) and map.map[row][col] == 0:
-                possible_starts.add((row, col))
-
-    for start in possible_starts:
-        map.start = start
-        try:
-            distance = len(map.find_shortest_path()) - 1
-        except ValueError:
-            continue
-
-        if best_distance > distance:
-            best_distance = distance
+        for col in range(len(map.map[row])):
+            if map.map[row][col] == 0:
+                possible_starts.append((row, col))
 
-    return best_distance
+    return len(map.find_shortest_path(possible_starts)) - 1
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
-import re
-
+from aoc import instrument, telemetry
+from aoc.intervals import Box, BoxSet, IntervalSet
+from aoc.parsing import extract_int_records
 from utils import get_and_cache_input
 
 Position = tuple[int, int]
@@ -9,118 +10,89 @@ def manhattan_distance(from_pos: Position, to_pos: Position) -> int:
     return abs(from_pos[0] - to_pos[0]) + abs(from_pos[1] - to_pos[1])
 
 
-def parse_sensor_and_beacon(input: str) -> tuple[Position, Position]:
-    match = re.match(
-        r"Sensor at x=(\-?\d+), y=(\-?\d+): closest beacon is at x=(\-?\d+), y=(\-?\d+)",
-        input,
-    )
-    if match is None:
-        raise ValueError(f"Failed to parse input `{input}`")
-
-    sensor = (int(match.group(1)), int(match.group(2)))
-    beacon = (int(match.group(3)), int(match.group(4)))
-
-    return (sensor, beacon)
+def parse_sensors_and_beacons(
+    problem_input: list[str],
+) -> list[tuple[Position, Position]]:
+    return [
+        ((sensor_x, sensor_y), (beacon_x, beacon_y))
+        for sensor_x, sensor_y, beacon_x, beacon_y in extract_int_records(
+            problem_input, 4
+        )
+    ]
 
 
 def part_one(problem_input: list[str]) -> int:
     target_y = 2_000_000
 
-    cannot_be_beacon: set[Position] = set()
-    for line in problem_input:
-        sensor, beacon = parse_sensor_and_beacon(line)
-        dist = manhattan_distance(sensor, beacon)
-
-        for i in range(sensor[0] - dist, sensor[0] + dist + 1):
-            if (i, target_y) == beacon:
-                if beacon in cannot_be_beacon:
-                    cannot_be_beacon.remove(beacon)
-                continue
-            if manhattan_distance(sensor, (i, target_y)) <= dist:
-                cannot_be_beacon.add((i, target_y))
-
-    return len(cannot_be_beacon)
-
+    covered = IntervalSet()
+    beacons_on_target: set[int] = set()
+    for sensor, beacon in parse_sensors_and_beacons(problem_input):
+        reach = manhattan_distance(sensor, beacon) - abs(sensor[1] - target_y)
+        covered.add((sensor[0] - reach, sensor[0] + reach + 1))
+        if beacon[1] == target_y:
+            beacons_on_target.add(beacon[0])
 
-def can_combine_ranges(range1: tuple[int, int], range2: tuple[int, int]) -> bool:
-    return (
-        (range1[0] - 1 <= range2[0] and range2[0] <= range1[1] + 1)
-        or (range1[0] - 1 <= range2[1] and range2[1] <= range1[1] + 1)
-        or (range2[0] <= range1[0] and range1[1] <= range2[1])
-    )
-
-
-def combine_ranges(range1: tuple[int, int], range2: tuple[int, int]) -> tuple[int, int]:
-    return (
-        min(range1[0], range1[1], range2[0], range2[1]),
-        max(range1[0], range1[1], range2[0], range2[1]),
-    )
+    return covered.size() - sum(1 for x in beacons_on_target if x in covered)
 
 
-class Ranges:
-    ranges: list[tuple[int, int]]
+def rotate(position: Position) -> Position:
+    """
+    Turns the grid 45 degrees, so that every position within some distance of a sensor
+    forms a box rather than a diamond.
+    """
 
-    def __init__(self) -> None:
-        self.ranges = []
+    return (position[0] + position[1], position[0] - position[1])
 
-    def add_range(self, new_range: tuple[int, int]):
-        assert new_range[0] <= new_range[1], new_range
-        did_combine_ranges = False
-        for i, r in enumerate(self.ranges):
-            if can_combine_ranges(r, new_range):
-                old_range = self.ranges.pop(i)
-                self.add_range(combine_ranges(old_range, new_range))
-                did_combine_ranges = True
-                break
 
-        if not did_combine_ranges:
-            self.ranges.append(new_range)
+def find_position_in_square(box: Box, size: int) -> Position | None:
+    """
+    Any position with x and y in [0, size] that's within a box of rotated positions.
+    """
 
-    def find_containing_range(self, num: int) -> tuple[int, int] | None:
-        for r in self.ranges:
-            if r[0] <= num and num <= r[1]:
-                return r
+    (u_start, u_stop), (v_start, v_stop) = box.bounds
 
-        return None
+    # On row y, x ranges from the highest of 0, u_start - y and v_start + y to the lowest
+    # of size, u_stop - 1 - y and v_stop - 1 + y. The range's length is concave in y, so
+    # it's longest next to where the lines bounding it cross.
+    crossings = [0, size, u_start, -v_start, u_stop - 1 - size, size + 1 - v_stop]
+    crossings += [(u_start - v_start) // 2, (u_stop - v_stop) // 2]
+    for crossing in crossings:
+        for y in (crossing, crossing + 1):
+            y = min(max(y, 0), size)
+            x_low = max(0, u_start - y, v_start + y)
+            x_high = min(size, u_stop - 1 - y, v_stop - 1 + y)
+            if x_low <= x_high:
+                return (x_low, y)
 
-    def __repr__(self) -> str:
-        return str(self.ranges)
+    return None
 
 
 def part_two(problem_input: list[str]) -> int:
     coordinate_bounds = 4_000_000
 
-    sensor_ranges_to_skip: dict[int, Ranges] = {}
-
-    for i, line in enumerate(problem_input):
-        sensor, beacon = parse_sensor_and_beacon(line)
-        print(f"[{i + 1}/{len(problem_input)}] Building ranges for {sensor}")
+    # Rotated, the search area is a diamond inside this box
+    uncovered = BoxSet(
+        [
+            Box.from_inclusive(
+                (0, 2 * coordinate_bounds), (-coordinate_bounds, coordinate_bounds)
+            )
+        ]
+    )
+    sensors_and_beacons = parse_sensors_and_beacons(problem_input)
+    for i, (sensor, beacon) in enumerate(sensors_and_beacons):
+        telemetry.progress("sensors", i, len(sensors_and_beacons))
         dist = manhattan_distance(sensor, beacon)
-        for y in range(sensor[1] - dist, sensor[1] + dist + 1):
-            if y < 0 or coordinate_bounds < y:
-                continue
-
-            x_low = sensor[0] - (dist - abs(sensor[1] - y))
-            x_high = sensor[0] + (dist - abs(sensor[1] - y))
-            if x_high < 0 or coordinate_bounds < x_low:
-                continue
-
-            if y not in sensor_ranges_to_skip:
-                sensor_ranges_to_skip[y] = Ranges()
-            new_range = (max(0, x_low), min(x_high, coordinate_bounds))
-            sensor_ranges_to_skip[y].add_range(new_range)
-
-    print("Finding distress beacon...")
-    for y in range(coordinate_bounds + 1):
-        x = 0
-        while x <= coordinate_bounds:
-            if y not in sensor_ranges_to_skip:
-                return x * 4_000_000 + y
-            containing_range = sensor_ranges_to_skip[y].find_containing_range(x)
-            if containing_range is None:
-                return x * 4_000_000 + y
-
-            x = containing_range[1] + 1
+        u, v = rotate(sensor)
+        uncovered.remove(Box.from_inclusive((u - dist, u + dist), (v - dist, v + dist)))
+        instrument.record_max("uncovered boxes", len(uncovered))
+
+    telemetry.progress("sensors", len(sensors_and_beacons), len(sensors_and_beacons))
+
+    with telemetry.phase("finding distress beacon"):
+        for box in uncovered:
+            position = find_position_in_square(box, coordinate_bounds)
+            if position is not None:
+                return position[0] * 4_000_000 + position[1]
 
     raise ValueError("Couldn't find distress beacon")
 
@@ -128,5 +100,5 @@ def part_two(problem_input: list[str]) -> int:
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    # print("Part One: ", part_one(problem_input))
+    print("Part One: ", part_one(problem_input))
     print("Part Two: ", part_two(problem_input))
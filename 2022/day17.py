@@ -1,4 +1,4 @@
-
+from aoc.cycles import simulate
 from utils import get_and_cache_input
 
 ROCK_PATTERNS = [
@@ -10,219 +10,137 @@ ROCK_PATTERNS = [
 ]
 TOWER_WIDTH = 7
 
+# Every row of the tower is a bitmask with bit x set where there's rock at column x
+FULL_ROW = (1 << TOWER_WIDTH) - 1
+LEFT_WALL = 1
+RIGHT_WALL = 1 << (TOWER_WIDTH - 1)
+
+# Settled rock from the floor up, with the next jet and rock
+Tower = tuple[tuple[int, ...], int, int]
 
-Position = tuple[int, int]
 
+def get_rock_rows(rock: list[str]) -> list[int]:
+    """
+    The rows of a rock from the bottom up, as it appears two units from the left wall.
+    """
 
-def get_rock_coordinates(rock: list[str]) -> set[Position]:
-    rock_coordinates: set[Position] = set()
-    for i, row in enumerate(rock):
-        for j, c in enumerate(row):
+    rows = []
+    for row in reversed(rock):
+        mask = 0
+        for x, c in enumerate(row):
             if c == "#":
-                rock_coordinates.add((j, len(rock) - i - 1))
+                mask |= 1 << (x + 2)
+        rows.append(mask)
 
-    return rock_coordinates
+    return rows
 
 
-ROCK_COORDINATES = [get_rock_coordinates(rock_pattern) for rock_pattern in ROCK_PATTERNS]
-ROCK_WIDTHS = [len(rock_pattern[0]) for rock_pattern in ROCK_PATTERNS]
+ROCK_ROWS = [get_rock_rows(rock_pattern) for rock_pattern in ROCK_PATTERNS]
 
 
-def can_rock_move_left(
-    rock_coordinates: set[Position], x: int, y: int, existing_rock: set[Position]
-) -> bool:
-    if x <= 0:
-        return False
+def collides(rock: list[int], y: int, rows: list[int]) -> bool:
+    return any(
+        y + i < len(rows) and rows[y + i] & rock_row for i, rock_row in enumerate(rock)
+    )
 
-    for rx, ry in rock_coordinates:
-        if ((x - 1) + rx, y + ry) in existing_rock:
-            return False
 
-    return True
+def print_tower(rows: list[int]):
+    for row in reversed(rows):
+        print(
+            "|" + "".join("#" if row >> x & 1 else "." for x in range(TOWER_WIDTH)) + "|"
+        )
+    print("+" + "-" * TOWER_WIDTH + "+")
 
 
-def can_rock_move_right(
-    rock_coordinates: set[Position],
-    x: int,
-    y: int,
-    existing_rock: set[Position],
-    rock_width: int,
-) -> bool:
-    if x + rock_width >= TOWER_WIDTH:
-        return False
+def prune_rows(rows: list[int]) -> tuple[list[int], int]:
+    """
+    Keeps only the rock beside or below air that a falling rock can reach from above the
+    tower, dropping the rows under the lowest such air, and returns how many were dropped.
+    What a falling rock can run into is all that's left, so a tower that repeats after
+    pruning keeps repeating.
+    """
 
-    for rx, ry in rock_coordinates:
-        if ((x + 1) + rx, y + ry) in existing_rock:
-            return False
+    kept = [0] * len(rows)
+    reachable_above = FULL_ROW
+    lowest = len(rows)
+    for y in range(len(rows) - 1, -1, -1):
+        # Rock right under reachable air stops a falling rock
+        kept[y] = rows[y] & reachable_above
 
-    return True
+        air = FULL_ROW & ~rows[y]
+        reachable = air & reachable_above
+        if reachable == 0:
+            break
+
+        # Falling rocks get pushed sideways as far as the air goes
+        while True:
+            spread = reachable | (((reachable << 1) | (reachable >> 1)) & air)
+            if spread == reachable:
+                break
+            reachable = spread
 
+        kept[y] |= rows[y] & ((reachable << 1) | (reachable >> 1))
+        reachable_above = reachable
+        lowest = y
 
-def can_rock_move_down(
-    rock_coordinates: set[Position], x: int, y: int, existing_rock: set[Position]
-) -> bool:
-    if y <= 0:
-        return False
+    return (kept[lowest:], lowest)
 
-    for rx, ry in rock_coordinates:
-        if (x + rx, (y - 1) + ry) in existing_rock:
-            return False
 
-    return True
+def drop_rock(tower: Tower, jet_pattern: str) -> tuple[Tower, int]:
+    """
+    Drops the next rock onto the tower and prunes the rock nothing can fall past anymore,
+    returning the pruned tower and how far its floor rose.
+    """
 
+    settled_rows, jet_index, rock_index = tower
+    rows = list(settled_rows)
+    rock = ROCK_ROWS[rock_index]
+    y = len(rows) + 3
 
-def print_tower(existing_rock: set[Position], tower_height: int):
-    for y in range(tower_height + 2, -1, -1):
-        line = "|"
-        for x in range(7):
-            if (x, y) in existing_rock:
-                line += "#"
-            else:
-                line += "."
-        line += "|"
-        print(line)
-    print("---------")
+    while True:
+        if jet_pattern[jet_index] == "<":
+            if not any(row & LEFT_WALL for row in rock):
+                pushed = [row >> 1 for row in rock]
+                if not collides(pushed, y, rows):
+                    rock = pushed
+        elif not any(row & RIGHT_WALL for row in rock):
+            pushed = [row << 1 for row in rock]
+            if not collides(pushed, y, rows):
+                rock = pushed
+        jet_index = (jet_index + 1) % len(jet_pattern)
 
+        if y == 0 or collides(rock, y - 1, rows):
+            break
+        y -= 1
 
-def find_height_path_to_right(
-    x: int, y: int, existing_rock: set[Position]
-) -> list[int] | None:
-    if x == 6:
-        return [y]
-    for dy in range(1, -2, -1):
-        if (x + 1, y + dy) in existing_rock:
-            path = find_height_path_to_right(x + 1, y + dy, existing_rock)
-            if path is not None:
-                path.insert(0, y + dy)
-                return path
+    rows.extend([0] * (y + len(rock) - len(rows)))
+    for i, rock_row in enumerate(rock):
+        rows[y + i] |= rock_row
 
-    return None
+    rows, offset = prune_rows(rows)
+    next_tower = (tuple(rows), jet_index, (rock_index + 1) % len(ROCK_PATTERNS))
 
+    return (next_tower, offset)
 
-def prune_rocks(existing_rock: set[Position]) -> tuple[set[Position], int]:
-    try:
-        max_left = max(y for x, y in existing_rock if x == 0)
-    except ValueError:
-        return (existing_rock, 0)
-    heights = find_height_path_to_right(0, max_left, existing_rock)
-    if heights is None:
-        return (existing_rock, 0)
 
-    heights.insert(0, max_left)
-    offset = min(heights)
-    return ({(x, y - offset) for x, y in existing_rock if y >= heights[x]}, offset)
+def find_tower_height(jet_pattern: str, num_rocks: int) -> int:
+    # Once the pruned tower repeats, so does everything that happens to it
+    empty_tower: Tower = ((), 0, 0)
+    (rows, _, _), tower_height_offset = simulate(
+        empty_tower,
+        lambda tower: drop_rock(tower, jet_pattern),
+        num_rocks,
+    )
+
+    return len(rows) + tower_height_offset
 
 
 def part_one(problem_input: list[str]) -> int:
-    jet_pattern = problem_input[0]
-    jet_index = 0
-
-    tower_height = 0
-    tower_height_offset = 0
-    existing_rock: set[Position] = set()
-    for i in range(2022):
-        if i % 10 == 0:
-            existing_rock, offset = prune_rocks(existing_rock)
-            tower_height_offset += offset
-            tower_height -= offset
-        rock_index = i % len(ROCK_PATTERNS)
-        rock_coordinates = ROCK_COORDINATES[rock_index]
-        x, y = 2, tower_height + 3
-
-        falling = False
-        while True:
-            if falling:
-                if not can_rock_move_down(rock_coordinates, x, y, existing_rock):
-                    break
-                y -= 1
-                falling = False
-            else:
-                jet_direction = jet_pattern[jet_index]
-                if jet_direction == "<" and can_rock_move_left(
-                    rock_coordinates, x, y, existing_rock
-                ):
-                    x -= 1
-                elif jet_direction == ">" and can_rock_move_right(
-                    rock_coordinates, x, y, existing_rock, ROCK_WIDTHS[rock_index]
-                ):
-                    x += 1
-
-                jet_index = (jet_index + 1) % len(jet_pattern)
-                falling = True
-
-        rock_world_coordinates = {(x + rx, y + ry) for rx, ry in rock_coordinates}
-        existing_rock = existing_rock.union(rock_world_coordinates)
-        tower_height = max(tower_height, max(y + 1 for _, y in rock_world_coordinates))
-
-    return tower_height + tower_height_offset
+    return find_tower_height(problem_input[0], 2022)
 
 
 def part_two(problem_input: list[str]) -> int:
-    jet_pattern = problem_input[0]
-    jet_index = 0
-
-    cache: dict[tuple[frozenset[Position], int, int], tuple[int, int]] = {}
-
-    tower_height = 0
-    tower_height_offset = 0
-    existing_rock: set[Position] = set()
-    i = 0
-    while i < 1_000_000_000_000:
-        rock_index = i % len(ROCK_PATTERNS)
-        if (frozenset(existing_rock), jet_index, rock_index) in cache:
-            prev_rock_index, prev_height = cache[
-                (frozenset(existing_rock), jet_index, rock_index)
-            ]
-            multiplier = max(1, int((1_000_000_000_000 - i) / (i - prev_rock_index)))
-            if i + (i - prev_rock_index) * multiplier < 1_000_000_000_000:
-                cache[(frozenset(existing_rock), jet_index, rock_index)] = (
-                    i,
-                    tower_height + tower_height_offset,
-                )
-                i += (i - prev_rock_index) * multiplier
-                tower_height_offset += (
-                    tower_height + tower_height_offset - prev_height
-                ) * multiplier
-                continue
-        if i % 10 == 0:
-            existing_rock, offset = prune_rocks(existing_rock)
-            tower_height_offset += offset
-            tower_height -= offset
-            if offset > 0:
-                cache[(frozenset(existing_rock), jet_index, rock_index)] = (
-                    i,
-                    tower_height + tower_height_offset,
-                )
-        rock_coordinates = ROCK_COORDINATES[rock_index]
-        x, y = 2, tower_height + 3
-
-        falling = False
-        while True:
-            if falling:
-                if not can_rock_move_down(rock_coordinates, x, y, existing_rock):
-                    break
-                y -= 1
-                falling = False
-            else:
-                jet_direction = jet_pattern[jet_index]
-                if jet_direction == "<" and can_rock_move_left(
-                    rock_coordinates, x, y, existing_rock
-                ):
-                    x -= 1
-                elif jet_direction == ">" and can_rock_move_right(
-                    rock_coordinates, x, y, existing_rock, ROCK_WIDTHS[rock_index]
-                ):
-                    x += 1
-
-                jet_index = (jet_index + 1) % len(jet_pattern)
-                falling = True
-
-        rock_world_coordinates = {(x + rx, y + ry) for rx, ry in rock_coordinates}
-        existing_rock = existing_rock.union(rock_world_coordinates)
-        tower_height = max(tower_height, max(y + 1 for _, y in rock_world_coordinates))
-        i += 1
-
-    return tower_height + tower_height_offset
+    return find_tower_height(problem_input[0], 1_000_000_000_000)
 
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 import math
-import re
 from collections import deque
 from typing import Literal, Union
 
-from utils import get_and_cache_input
+from aoc import telemetry
+from aoc.parsing import extract_int_records
+from utils import cache_parsed_input, get_and_cache_input
 
 RobotType = Union[Literal["ore"], Literal["clay"], Literal["obsidian"], Literal["geode"]]
 ROBOT_TYPES: list[RobotType] = ["ore", "clay", "obsidian", "geode"]
@@ -16,19 +17,19 @@ class FactoryBlueprint:
     obsidian_robot_cost: tuple[int, int]
     geode_robot_cost: tuple[int, int]
 
-    def __init__(self, blueprint_str: str) -> None:
-        match = re.match(
-            r"Blueprint (\d+): Each ore robot costs (\d+) ore. Each clay robot costs (\d+) ore. Each obsidian robot costs (\d+) ore and (\d+) clay. Each geode robot costs (\d+) ore and (\d+) obsidian.",
-            blueprint_str,
-        )
-        if match is None:
-            raise ValueError(blueprint_str)
-
-        self.id = int(match.group(1))
-        self.ore_robot_cost = int(match.group(2))
-        self.clay_robot_cost = int(match.group(3))
-        self.obsidian_robot_cost = (int(match.group(4)), int(match.group(5)))
-        self.geode_robot_cost = (int(match.group(6)), int(match.group(7)))
+    def __init__(
+        self,
+        id: int,
+        ore_robot_cost: int,
+        clay_robot_cost: int,
+        obsidian_robot_cost: tuple[int, int],
+        geode_robot_cost: tuple[int, int],
+    ) -> None:
+        self.id = id
+        self.ore_robot_cost = ore_robot_cost
+        self.clay_robot_cost = clay_robot_cost
+        self.obsidian_robot_cost = obsidian_robot_cost
+        self.geode_robot_cost = geode_robot_cost
 
     def get_next_state(
         self,
@@ -180,29 +181,46 @@ class FactoryBlueprint:
         return best_geode_count
 
 
-def part_one(problem_input: list[str]) -> int:
-    blueprints: list[FactoryBlueprint] = []
-    for blueprint_str in problem_input:
-        blueprints.append(FactoryBlueprint(blueprint_str))
-
-    return sum(
-        blueprint.id * blueprint.compute_most_geodes_possible(24)
-        for blueprint in blueprints
+@cache_parsed_input
+def parse_input(problem_input: list[str]) -> tuple[list[FactoryBlueprint]]:
+    # Every blueprint lists its id, then the ore, clay, obsidian (ore and clay) and geode
+    # (ore and obsidian) robot costs
+    return (
+        [
+            FactoryBlueprint(
+                record[0],
+                record[1],
+                record[2],
+                (record[3], record[4]),
+                (record[5], record[6]),
+            )
+            for record in extract_int_records(problem_input, 7)
+        ],
     )
 
 
-def part_two(problem_input: list[str]) -> int:
-    blueprints: list[FactoryBlueprint] = []
-    for blueprint_str in problem_input[:3]:
-        blueprints.append(FactoryBlueprint(blueprint_str))
+def part_one(blueprints: list[FactoryBlueprint]) -> int:
+    quality_level_sum = 0
+    for i, blueprint in enumerate(blueprints):
+        telemetry.progress("blueprints", i, len(blueprints))
+        quality_level_sum += blueprint.id * blueprint.compute_most_geodes_possible(24)
 
-    return math.prod(
-        blueprint.compute_most_geodes_possible(32) for blueprint in blueprints
-    )
+    return quality_level_sum
+
+
+def part_two(blueprints: list[FactoryBlueprint]) -> int:
+    geode_counts = []
+    for i, blueprint in enumerate(blueprints[:3]):
+        telemetry.progress("blueprints", i, min(3, len(blueprints)))
+        geode_counts.append(blueprint.compute_most_geodes_possible(32))
+
+    return math.prod(geode_counts)
 
 
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    print("Part One: ", part_one(problem_input))
-    print("Part Two: ", part_two(problem_input))
+    (blueprints,) = parse_input(problem_input)
+
+    print("Part One: ", part_one(blueprints))
+    print("Part Two: ", part_two(blueprints))
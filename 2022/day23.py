@@ -1,108 +1,74 @@
-
+from aoc.bitboard import BitGrid, popcount
 from utils import get_and_cache_input
 
-Position = tuple[int, int]
-
-
-def get_proposed_location(
-    elf: Position, elves: set[Position], offset=0
-) -> Position | None:
-    elf_to_north = False
-    elf_to_south = False
-    elf_to_west = False
-    elf_to_east = False
-    if (
-        (elf[0] - 1, elf[1] - 1) in elves
-        or (elf[0], elf[1] - 1) in elves
-        or (elf[0] + 1, elf[1] - 1) in elves
-    ):
-        elf_to_north = True
-    if (
-        (elf[0] - 1, elf[1] + 1) in elves
-        or (elf[0], elf[1] + 1) in elves
-        or (elf[0] + 1, elf[1] + 1) in elves
-    ):
-        elf_to_south = True
-    if (
-        (elf[0] - 1, elf[1] - 1) in elves
-        or (elf[0] - 1, elf[1]) in elves
-        or (elf[0] - 1, elf[1] + 1) in elves
-    ):
-        elf_to_west = True
-    if (
-        (elf[0] + 1, elf[1] - 1) in elves
-        or (elf[0] + 1, elf[1]) in elves
-        or (elf[0] + 1, elf[1] + 1) in elves
-    ):
-        elf_to_east = True
-
-    if not elf_to_north and not elf_to_south and not elf_to_west and not elf_to_east:
-        return None
+# Directions elves consider moving in, as (d_row, d_col), each with the neighbors that
+# have to be free for an elf to propose moving that way
+DIRECTIONS = [
+    ((-1, 0), [(-1, -1), (-1, 0), (-1, 1)]),
+    ((1, 0), [(1, -1), (1, 0), (1, 1)]),
+    ((0, -1), [(-1, -1), (0, -1), (1, -1)]),
+    ((0, 1), [(-1, 1), (0, 1), (1, 1)]),
+]
+NEIGHBORS = [(d_row, d_col) for d_row in (-1, 0, 1) for d_col in (-1, 0, 1)]
+NEIGHBORS.remove((0, 0))
+
+Elves = tuple[BitGrid, int]
+
+
+def parse_elves(problem_input: list[str]) -> Elves:
+    grid = BitGrid(len(problem_input[0]), len(problem_input))
+    return (grid, grid.parse(problem_input, "#"))
+
+
+def run_round(elves: Elves, offset=0) -> Elves | None:
+    grid, board = elves
+
+    # Keep a free row and column around the elves, so none of them moves off the grid
+    border = grid.row_mask(0) | grid.row_mask(grid.height - 1)
+    border |= grid.column_mask(0) | grid.column_mask(grid.width - 1)
+    if board & border:
+        grid, board = grid.pad(board, max(8, grid.width // 4))
+
+    # Elves with any neighbor are the ones that might move
+    occupied = {neighbor: grid.neighbors(board, *neighbor) for neighbor in NEIGHBORS}
+    undecided = 0
+    for neighbor_board in occupied.values():
+        undecided |= board & neighbor_board
 
-    direction_order = ["N", "S", "W", "E"]
-    elf_positions = [elf_to_north, elf_to_south, elf_to_west, elf_to_east]
+    targets: list[tuple[tuple[int, int], int]] = []
     for i in range(4):
-        index = (i + offset) % 4
-        if not elf_positions[index]:
-            direction = direction_order[index]
-            if direction == "N":
-                return (elf[0], elf[1] - 1)
-            elif direction == "S":
-                return (elf[0], elf[1] + 1)
-            elif direction == "W":
-                return (elf[0] - 1, elf[1])
-            elif direction == "E":
-                return (elf[0] + 1, elf[1])
-
-    return None
-
-
-def run_round(elves: set[Position], offset=0) -> set[Position] | None:
-    elf_to_next: dict[Position, Position] = {}
-    next_to_elf: dict[Position, Position] = {}
-
-    moved_elves: set[Position] = set()
-
-    for elf in elves:
-        proposed_location = get_proposed_location(elf, elves, offset)
-        if proposed_location is not None:
-            if proposed_location in next_to_elf:
-                elf_to_next[elf] = elf
-
-                elf_to_next[next_to_elf[proposed_location]] = next_to_elf[
-                    proposed_location
-                ]
-                moved_elves.remove(next_to_elf[proposed_location])
-            else:
-                elf_to_next[elf] = proposed_location
-                next_to_elf[proposed_location] = elf
-                moved_elves.add(elf)
-        else:
-            elf_to_next[elf] = elf
-
-    if len(moved_elves) == 0:
+        direction, required_free = DIRECTIONS[(i + offset) % 4]
+        blocked = 0
+        for neighbor in required_free:
+            blocked |= occupied[neighbor]
+        proposing = undecided & ~blocked
+        undecided &= ~proposing
+        targets.append((direction, grid.shift(proposing, *direction)))
+
+    # Only elves coming from opposite directions can propose the same position
+    targets_by_direction = dict(targets)
+    clashes = targets_by_direction[(-1, 0)] & targets_by_direction[(1, 0)]
+    clashes |= targets_by_direction[(0, -1)] & targets_by_direction[(0, 1)]
+
+    next_board = board
+    for (d_row, d_col), target in targets:
+        moved = target & ~clashes
+        next_board = (next_board & ~grid.shift(moved, -d_row, -d_col)) | moved
+
+    if next_board == board:
         return None
 
-    return set(elf_to_next.values())
+    return (grid, next_board)
 
 
-def print_map(elves: set[Position]):
-    for y in range(min(elf[1] for elf in elves), max(elf[1] for elf in elves) + 1):
-        row = ""
-        for x in range(min(elf[0] for elf in elves), max(elf[0] for elf in elves) + 1):
-            if (x, y) in elves:
-                row += "#"
-            else:
-                row += "."
+def print_map(elves: Elves):
+    grid, board = elves
+    for row in grid.format(board):
         print(row)
 
 
 def part_one(problem_input: list[str]) -> int:
-    elves: set[Position] = set()
-    for y, line in enumerate(problem_input):
-        for x, c in enumerate(line):
-            if c == "#":
-                elves.add((x, y))
+    elves = parse_elves(problem_input)
 
     round_index = 0
     is_done = False
@@ -114,17 +80,15 @@ def part_one(problem_input: list[str]) -> int:
         elves = next_elves
         round_index += 1
 
-    width = max(elf[0] for elf in elves) - min(elf[0] for elf in elves) + 1
-    height = max(elf[1] for elf in elves) - min(elf[1] for elf in elves) + 1
-    return width * height - len(elves)
+    grid, board = elves
+    first_row, first_col, last_row, last_col = grid.bounding_box(board)
+    width = last_col - first_col + 1
+    height = last_row - first_row + 1
+    return width * height - popcount(board)
 
 
 def part_two(problem_input: list[str]) -> int:
-    elves: set[Position] = set()
-    for y, line in enumerate(problem_input):
-        for x, c in enumerate(line):
-            if c == "#":
-                elves.add((x, y))
+    elves = parse_elves(problem_input)
 
     round_index = 0
     is_done = False
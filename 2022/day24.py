@@ -1,20 +1,13 @@
 import math
-from collections import deque
+from typing import Iterator
 
+from aoc.bitboard import BitGrid
+from aoc.search import find_shortest_path
 from utils import get_and_cache_input
 
 Position = tuple[int, int]
 
-
-def insert_into_sorted_deque(
-    values: deque[tuple[Position, int]], item_to_insert: tuple[Position, int]
-):
-    for i, item in enumerate(values):
-        if item[1] > item_to_insert[1]:
-            values.insert(i, item_to_insert)
-            return
-
-    values.append(item_to_insert)
+BLIZZARD_DIRECTIONS = {">": (0, 1), "v": (1, 0), "<": (0, -1), "^": (-1, 0)}
 
 
 class BlizzardMap:
@@ -24,7 +17,9 @@ class BlizzardMap:
     height: int
     blizzards: set[tuple[Position, str]]
 
-    wall_cache: dict[int, set[Position]]
+    valley: BitGrid
+    blizzard_boards: dict[str, int]
+    open_cells_cache: dict[int, bytearray]
     time_multiple: int
 
     def __init__(self, map_input: list[str]) -> None:
@@ -44,51 +39,48 @@ class BlizzardMap:
 
                 self.blizzards.add(((row, col), c))
 
-        self.wall_cache = {}
+        self.valley = BitGrid(self.width, self.height)
+        valley_rows = [line[1:-1] for line in map_input[1:-1]]
+        self.blizzard_boards = {
+            direction: self.valley.parse(valley_rows, direction)
+            for direction in BLIZZARD_DIRECTIONS
+        }
+        self.open_cells_cache = {}
         self.time_multiple = math.lcm(self.width, self.height)
 
-    def get_walls(self, time: int) -> set[Position]:
-        time = time % self.time_multiple
-        if time in self.wall_cache:
-            return self.wall_cache[time]
+    def get_blizzards(self, time: int) -> int:
+        """
+        The board of valley positions, without the walls around it, that blizzards are in
+        at `time`.
+        """
 
-        walls = set()
-
-        for blizzard, direction in self.blizzards:
-            if direction == ">":
-                walls.add((blizzard[0], (blizzard[1] + time - 1) % self.width + 1))
-            elif direction == "v":
-                walls.add(((blizzard[0] + time - 1) % self.height + 1, blizzard[1]))
-            elif direction == "<":
-                walls.add((blizzard[0], (blizzard[1] - time - 1) % self.width + 1))
-            elif direction == "^":
-                walls.add(((blizzard[0] - time - 1) % self.height + 1, blizzard[1]))
-            else:
-                raise ValueError("Unrecognized direction `" + direction + "`")
+        blizzards = 0
+        for direction, board in self.blizzard_boards.items():
+            d_row, d_col = BLIZZARD_DIRECTIONS[direction]
+            blizzards |= self.valley.shift(board, d_row * time, d_col * time, wrap=True)
 
-        self.wall_cache[time] = walls
-        return walls
+        return blizzards
 
     def print_map(self, time: int):
         walls: dict[Position, str] = {}
 
         for blizzard, direction in self.blizzards:
             if direction == ">":
-                walls[
-                    (blizzard[0], (blizzard[1] + time - 1) % self.width + 1)
-                ] = direction
+                walls[(blizzard[0], (blizzard[1] + time - 1) % self.width + 1)] = (
+                    direction
+                )
             elif direction == "v":
-                walls[
-                    ((blizzard[0] + time - 1) % self.height + 1, blizzard[1])
-                ] = direction
+                walls[((blizzard[0] + time - 1) % self.height + 1, blizzard[1])] = (
+                    direction
+                )
             elif direction == "<":
-                walls[
-                    (blizzard[0], (blizzard[1] - time - 1) % self.width + 1)
-                ] = direction
+                walls[(blizzard[0], (blizzard[1] - time - 1) % self.width + 1)] = (
+                    direction
+                )
             elif direction == "^":
-                walls[
-                    ((blizzard[0] - time - 1) % self.height + 1, blizzard[1])
-                ] = direction
+                walls[((blizzard[0] - time - 1) % self.height + 1, blizzard[1])] = (
+                    direction
+                )
 
         for row in range(self.height + 2):
             row_str = ""
@@ -110,46 +102,62 @@ class BlizzardMap:
                     row_str += "."
             print(row_str)
 
-    def is_node_walkable(self, position: Position, time: int) -> bool:
-        return (
-            position == self.start
-            or position == self.end
-            or (
-                0 < position[0] < self.height + 1
-                and 0 < position[1] < self.width + 1
-                and position not in self.get_walls(time)
-            )
-        )
+    def encode(self, position: Position) -> int:
+        return position[0] * (self.width + 2) + position[1]
+
+    def get_open_cells(self, time: int) -> bytearray:
+        """
+        Flags for every cell of the map, encoded as `row * (width + 2) + col`, that's free
+        of walls and blizzards at `time`.
+        """
+
+        time = time % self.time_multiple
+        if time in self.open_cells_cache:
+            return self.open_cells_cache[time]
+
+        clear_valley = self.valley.full & ~self.get_blizzards(time)
+        map_grid, clear_map = self.valley.pad(clear_valley, 1)
+        open_cells = map_grid.to_flags(clear_map)
+        open_cells[self.encode(self.start)] = 1
+        open_cells[self.encode(self.end)] = 1
+
+        self.open_cells_cache[time] = open_cells
+        return open_cells
 
     def find_shortest_path(self, start: Position, end: Position, start_time=0) -> int:
-        nodes_to_visit: deque[tuple[Position, int]] = deque()
-        states_considered: set[tuple[Position, int]] = set()
-
-        nodes_to_visit.append((start, start_time))
-
-        while len(nodes_to_visit) > 0:
-            position, time = nodes_to_visit.popleft()
-            if position == end:
-                return time
-
-            next_time = time + 1
-            neighbors: list[Position] = [
-                (position[0], position[1] + 1),
-                (position[0] + 1, position[1]),
-                (position[0], position[1] - 1),
-                (position[0] - 1, position[1]),
-                (position[0], position[1]),
-            ]
-            for neighbor in neighbors:
-                if (
-                    self.is_node_walkable(neighbor, next_time)
-                    and (neighbor, next_time % self.time_multiple)
-                    not in states_considered
-                ):
-                    insert_into_sorted_deque(nodes_to_visit, (neighbor, next_time))
-                    states_considered.add((neighbor, next_time % self.time_multiple))
+        """
+        A* over states encoded as `time_offset * num_cells + cell`, where the time offset
+        from `start_time` wraps around once the blizzards are back where they started.
+        """
+
+        num_cols = self.width + 2
+        num_cells = (self.height + 2) * num_cols
+        end_row, end_col = end
+
+        def neighbors(state: int) -> Iterator[tuple[int, int]]:
+            time_offset, cell = divmod(state, num_cells)
+            next_time_offset = (time_offset + 1) % self.time_multiple
+            open_cells = self.get_open_cells(start_time + next_time_offset)
+            for next_cell in (cell + 1, cell + num_cols, cell - 1, cell - num_cols, cell):
+                if 0 <= next_cell < num_cells and open_cells[next_cell]:
+                    yield next_time_offset * num_cells + next_cell, 1
+
+        def distance_to_end(state: int) -> int:
+            row, col = divmod(state % num_cells, num_cols)
+            return abs(end_row - row) + abs(end_col - col)
+
+        end_cell = self.encode(end)
+        result = find_shortest_path(
+            [self.encode(start)],
+            neighbors,
+            lambda state: state % num_cells == end_cell,
+            distance_to_end,
+            queue="buckets",
+        )
+        if result.cost is None:
+            raise ValueError("Could not find path")
 
-        raise ValueError("Could not find path")
+        return start_time + result.cost
 
 
 def part_one(problem_input: list[str]) -> int:
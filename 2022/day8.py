@@ -1,99 +1,67 @@
+import numpy as np
+import numpy.typing as npt
+from aoc.grid import Grid2D, shift
 from utils import get_and_cache_input
 
+Trees = npt.NDArray[np.int8]
 
-def part_one(problem_input: list[str]) -> int:
-    num_visible_trees = len(problem_input[0]) * 2 + len(problem_input) * 2 - 4
-
-    for i, row in enumerate(problem_input):
-        if i == 0 or i == len(problem_input) - 1:
-            continue
-        for j, col in enumerate(row):
-            if j == 0 or j == len(row) - 1:
-                continue
-            cell = int(problem_input[i][j])
-            visible_from_top = True
-            for k in range(i - 1, -1, -1):
-                if int(problem_input[k][j]) >= cell:
-                    visible_from_top = False
-                    break
-
-            if visible_from_top:
-                num_visible_trees += 1
-                continue
-
-            visible_from_bottom = True
-            for k in range(i + 1, len(problem_input)):
-                if int(problem_input[k][j]) >= cell:
-                    visible_from_bottom = False
-                    break
-
-            if visible_from_bottom:
-                num_visible_trees += 1
-                continue
-
-            visible_from_left = True
-            for k in range(j - 1, -1, -1):
-                if int(problem_input[i][k]) >= cell:
-                    visible_from_left = False
-                    break
-
-            if visible_from_left:
-                num_visible_trees += 1
-                continue
-
-            visible_from_right = True
-            for k in range(j + 1, len(problem_input[i])):
-                if int(problem_input[i][k]) >= cell:
-                    visible_from_right = False
-                    break
-
-            if visible_from_right:
-                num_visible_trees += 1
-                continue
-
-    return num_visible_trees
-
-
-def part_two(problem_input: list[str]) -> int:
-    best_distance = 0
-
-    for i, row in enumerate(problem_input):
-        if i == 0 or i == len(problem_input) - 1:
-            continue
-        for j, col in enumerate(row):
-            if j == 0 or j == len(row) - 1:
-                continue
-            cell = int(problem_input[i][j])
-            range_to_top = 0
-            for k in range(i - 1, -1, -1):
-                range_to_top += 1
-                if int(problem_input[k][j]) >= cell:
-                    break
-            range_to_bottom = 0
-            for k in range(i + 1, len(problem_input)):
-                range_to_bottom += 1
-                if int(problem_input[k][j]) >= cell:
-                    break
-            range_to_left = 0
-            for k in range(j - 1, -1, -1):
-                range_to_left += 1
-                if int(problem_input[i][k]) >= cell:
-                    break
-            range_to_right = 0
-            for k in range(j + 1, len(problem_input[i])):
-                range_to_right += 1
-                if int(problem_input[i][k]) >= cell:
-                    break
-
-            distance = range_to_top * range_to_bottom * range_to_left * range_to_right
-            if best_distance < distance:
-                best_distance = distance
-
-    return best_distance
+
+def get_orientations(trees: Trees) -> list[tuple[Trees, tuple[int, ...]]]:
+    """
+    Views of the trees looking from the left edge along each direction (left to right,
+    right to left, top to bottom and bottom to top), with the axes to flip results back.
+    """
+
+    return [
+        (trees, ()),
+        (trees[:, ::-1], (1,)),
+        (trees.T, ()),
+        (trees[::-1, :].T, (0,)),
+    ]
+
+
+def unorient(values: npt.NDArray, index: int, flip_axes: tuple[int, ...]) -> npt.NDArray:
+    if index >= 2:
+        values = values.T
+    return np.flip(values, flip_axes) if len(flip_axes) > 0 else values
+
+
+def part_one(trees: Grid2D) -> int:
+    visible = np.zeros(trees.shape, dtype=bool)
+    for index, (oriented_trees, flip_axes) in enumerate(get_orientations(trees.cells)):
+        tallest_before = shift(np.maximum.accumulate(oriented_trees, axis=1), 0, -1, -1)
+        visible |= unorient(oriented_trees > tallest_before, index, flip_axes)
+
+    return int(visible.sum())
+
+
+def part_two(trees: Grid2D) -> int:
+    scenic_scores = np.ones(trees.shape, dtype=np.int64)
+    for index, (oriented_trees, flip_axes) in enumerate(get_orientations(trees.cells)):
+        cols = np.broadcast_to(np.arange(oriented_trees.shape[1]), oriented_trees.shape)
+        viewing_distances = np.zeros(oriented_trees.shape, dtype=np.int64)
+        for height in range(10):
+            # Every tree sees back to the closest tree at least as tall as it, or the edge
+            blocking_cols = np.maximum.accumulate(
+                np.where(oriented_trees >= height, cols, 0), axis=1
+            )
+            distances = cols - shift(blocking_cols, 0, -1, 0)
+            viewing_distances[oriented_trees == height] = distances[
+                oriented_trees == height
+            ]
+        scenic_scores *= unorient(viewing_distances, index, flip_axes)
+
+    return int(scenic_scores.max())
+
+
+def parse_input(problem_input: list[str]) -> tuple[Grid2D]:
+    return (Grid2D.from_digits(problem_input),)
 
 
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    print("Part One: ", part_one(problem_input))
-    print("Part Two: ", part_two(problem_input))
+    (trees,) = parse_input(problem_input)
+
+    print("Part One: ", part_one(trees))
+    print("Part Two: ", part_two(trees))
@@ -1,9 +1,9 @@
-from functools import lru_cache
-
+from aoc.memo import memoize
 from utils import get_and_cache_input
 
 
-@lru_cache(maxsize=4096)
+# Each line only reuses its own results, so the cache just has to hold one line's worth
+@memoize(maxsize=1 << 16)
 def compute_possible_ways(remaining_springs: str, groups: str) -> int:
     if len(groups) == 0:
         return 1 if all(c != "#" for c in remaining_springs) else 0
@@ -48,13 +48,19 @@ def part_two(springs_and_groups: list[tuple[str, str]]) -> int:
     )
 
 
-if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
-
+def parse_input(problem_input: list[str]) -> tuple[list[tuple[str, str]]]:
     springs_and_groups: list[tuple[str, str]] = []
     for line in problem_input:
         springs, groups = line.split()
         springs_and_groups.append((springs, groups))
 
+    return (springs_and_groups,)
+
+
+if __name__ == "__main__":
+    problem_input = get_and_cache_input(__file__)
+
+    (springs_and_groups,) = parse_input(problem_input)
+
     print("Part One: ", part_one(springs_and_groups))
     print("Part Two: ", part_two(springs_and_groups))
@@ -87,9 +87,7 @@ def part_two(grids: list[list[str]]) -> int:
     return result
 
 
-if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
-
+def parse_input(problem_input: list[str]) -> tuple[list[list[str]]]:
     grids: list[list[str]] = []
     grid: list[str] = []
     for line in problem_input:
@@ -101,5 +99,13 @@ if __name__ == "__main__":
     if len(grid) > 0:
         grids.append(grid)
 
+    return (grids,)
+
+
+if __name__ == "__main__":
+    problem_input = get_and_cache_input(__file__)
+
+    (grids,) = parse_input(problem_input)
+
     print("Part One: ", part_one(grids))
     print("Part Two: ", part_two(grids))
@@ -1,148 +1,72 @@
+import numpy as np
+import numpy.typing as npt
+from aoc.cycles import simulate
+from aoc.grid import Grid2D
 from utils import get_and_cache_input
 
-Position = tuple[int, int]
+Rocks = npt.NDArray[np.bool_]
 
-
-def slide_rocks_north(
-    num_rows: int, num_cols: int, cube_rocks: set[Position], round_rocks: set[Position]
-) -> set[Position]:
-    moved_round_rocks: set[Position] = set()
-
-    for col in range(num_cols):
-        num_rocks = 0
-        for row in range(num_rows - 1, -1, -1):
-            if (row, col) in cube_rocks:
-                for r in range(num_rocks):
-                    moved_round_rocks.add((row + r + 1, col))
-                num_rocks = 0
-                continue
-            if (row, col) in round_rocks:
-                num_rocks += 1
-
-            if row == 0:
-                for r in range(num_rocks):
-                    moved_round_rocks.add((row + r, col))
-
-    return moved_round_rocks
-
-
-def slide_rocks_east(
-    num_rows: int, num_cols: int, cube_rocks: set[Position], round_rocks: set[Position]
-) -> set[Position]:
-    moved_round_rocks: set[Position] = set()
-
-    for row in range(num_rows):
-        num_rocks = 0
-        for col in range(num_cols):
-            if (row, col) in cube_rocks:
-                for c in range(num_rocks):
-                    moved_round_rocks.add((row, col - c - 1))
-                num_rocks = 0
-                continue
-            if (row, col) in round_rocks:
-                num_rocks += 1
-
-            if col == num_cols - 1:
-                for c in range(num_rocks):
-                    moved_round_rocks.add((row, col - c))
-
-    return moved_round_rocks
-
-
-def slide_rocks_south(
-    num_rows: int, num_cols: int, cube_rocks: set[Position], round_rocks: set[Position]
-) -> set[Position]:
-    moved_round_rocks: set[Position] = set()
-
-    for col in range(num_cols):
-        num_rocks = 0
-        for row in range(num_rows):
-            if (row, col) in cube_rocks:
-                for r in range(num_rocks):
-                    moved_round_rocks.add((row - r - 1, col))
-                num_rocks = 0
-                continue
-            if (row, col) in round_rocks:
-                num_rocks += 1
-
-            if row == num_rows - 1:
-                for r in range(num_rocks):
-                    moved_round_rocks.add((row - r, col))
-
-    return moved_round_rocks
-
-
-def slide_rocks_west(
-    num_rows: int, num_cols: int, cube_rocks: set[Position], round_rocks: set[Position]
-) -> set[Position]:
-    moved_round_rocks: set[Position] = set()
-
-    for row in range(num_rows):
-        num_rocks = 0
-        for col in range(num_cols - 1, -1, -1):
-            if (row, col) in cube_rocks:
-                for c in range(num_rocks):
-                    moved_round_rocks.add((row, col + c + 1))
-                num_rocks = 0
-                continue
-            if (row, col) in round_rocks:
-                num_rocks += 1
-
-            if col == 0:
-                for c in range(num_rocks):
-                    moved_round_rocks.add((row, col + c))
-
-    return moved_round_rocks
-
-
-def compute_load_on_north(distance_to_south_edge: int, round_rocks: set[Position]) -> int:
-    return sum(distance_to_south_edge - row for row, _ in round_rocks)
-
-
-def part_one(problem_input: list[str]) -> int:
-    round_rocks: set[Position] = set()
-    cube_rocks: set[Position] = set()
-    for row, line in enumerate(problem_input):
-        for col, c in enumerate(line):
-            if c == "#":
-                cube_rocks.add((row, col))
-            elif c == "O":
-                round_rocks.add((row, col))
-
-    distance_to_south_edge = len(problem_input)
-    return sum(
-        distance_to_south_edge - row
-        for row, _ in slide_rocks_north(
-            len(problem_input), len(problem_input[0]), cube_rocks, round_rocks
-        )
-    )
+
+def tilt_north(round_rocks: Rocks, cube_rocks: Rocks) -> Rocks:
+    height, width = round_rocks.shape
+    rows = np.arange(height)[:, None]
+
+    # Cube rocks split each column into segments, and the round rocks of a segment all end
+    # up stacked against its top
+    segments = np.cumsum(cube_rocks, axis=0) * width + np.arange(width)
+    rocks_per_segment = np.bincount(segments[round_rocks], minlength=(height + 1) * width)
+    segment_tops = np.maximum.accumulate(np.where(cube_rocks, rows, -1), axis=0) + 1
+
+    return ~cube_rocks & (rows - segment_tops < rocks_per_segment[segments])
+
+
+def spin_cycle(round_rocks: Rocks, rotated_cube_rocks: list[Rocks]) -> Rocks:
+    """
+    Tilts north, west, south and east by tilting north and turning the platform clockwise
+    four times. `rotated_cube_rocks` holds the cube rocks after each turn.
+    """
+
+    for cube_rocks in rotated_cube_rocks:
+        round_rocks = np.rot90(tilt_north(round_rocks, cube_rocks), -1)
+
+    return round_rocks
 
 
-def part_two(problem_input: list[str]) -> int:
-    round_rocks: set[Position] = set()
-    cube_rocks: set[Position] = set()
-    for row, line in enumerate(problem_input):
-        for col, c in enumerate(line):
-            if c == "#":
-                cube_rocks.add((row, col))
-            elif c == "O":
-                round_rocks.add((row, col))
+def compute_load_on_north(round_rocks: Rocks) -> int:
+    distances_to_south_edge = np.arange(round_rocks.shape[0], 0, -1)
+    return int(round_rocks.sum(axis=1) @ distances_to_south_edge)
 
-    num_rows, num_cols = len(problem_input), len(problem_input[0])
 
-    settled_rocks: set[Position] = round_rocks.copy()
-    for _ in range(1_000_000_000):
-        settled_rocks = slide_rocks_north(num_rows, num_cols, cube_rocks, settled_rocks)
-        settled_rocks = slide_rocks_west(num_rows, num_cols, cube_rocks, settled_rocks)
-        settled_rocks = slide_rocks_south(num_rows, num_cols, cube_rocks, settled_rocks)
-        settled_rocks = slide_rocks_east(num_rows, num_cols, cube_rocks, settled_rocks)
+def part_one(platform: Grid2D) -> int:
+    round_rocks = platform.cells == ord("O")
+    cube_rocks = platform.cells == ord("#")
 
-    distance_to_south_edge = len(problem_input)
-    return sum(distance_to_south_edge - row for row, _ in settled_rocks)
+    return compute_load_on_north(tilt_north(round_rocks, cube_rocks))
+
+
+def part_two(platform: Grid2D) -> int:
+    round_rocks = platform.cells == ord("O")
+    cube_rocks = platform.cells == ord("#")
+    rotated_cube_rocks = [np.rot90(cube_rocks, -turns) for turns in range(4)]
+
+    round_rocks, _ = simulate(
+        round_rocks,
+        lambda rocks: (spin_cycle(rocks, rotated_cube_rocks), 0),
+        1_000_000_000,
+        lambda rocks: np.packbits(rocks).tobytes(),
+    )
+
+    return compute_load_on_north(round_rocks)
+
+
+def parse_input(problem_input: list[str]) -> tuple[Grid2D]:
+    return (Grid2D.from_lines(problem_input),)
 
 
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    print("Part One: ", part_one(problem_input))
-    print("Part Two: ", part_two(problem_input))
+    (platform,) = parse_input(problem_input)
+
+    print("Part One: ", part_one(platform))
+    print("Part Two: ", part_two(platform))
@@ -1,30 +1,43 @@
 from collections import OrderedDict, defaultdict
 
-from utils import get_and_cache_input
+from utils import map_input_bytes
 
 
-def hash(string: str) -> int:
+def hash(step: bytes) -> int:
     value = 0
-    for c in string:
-        value += ord(c)
+    for c in step:
+        value += c
         value *= 17
         value %= 256
 
     return value
 
 
-def part_one(problem_input: list[str]) -> int:
-    return sum(hash(step) for step in problem_input[0].split(","))
+def read_input(file_path_str: str) -> memoryview:
+    return map_input_bytes(file_path_str)
 
 
-def part_two(problem_input: list[str]) -> int:
-    lenses: dict[int, OrderedDict[str, int]] = defaultdict(OrderedDict)
-    for step in problem_input[0].split(","):
-        if "=" in step:
-            label, focal_length = step.split("=")
+def part_one(problem_input: memoryview) -> int:
+    result = 0
+    value = 0
+    for c in problem_input:
+        if c == ord(","):
+            result += value
+            value = 0
+        elif c != ord("\n") and c != ord("\r"):
+            value = (value + c) * 17 % 256
+
+    return result + value
+
+
+def part_two(problem_input: memoryview) -> int:
+    lenses: dict[int, OrderedDict[bytes, int]] = defaultdict(OrderedDict)
+    for step in problem_input.tobytes().strip().split(b","):
+        if b"=" in step:
+            label, focal_length = step.split(b"=")
             lenses[hash(label)][label] = int(focal_length)
-        elif "-" in step:
-            label = step.removesuffix("-")
+        elif b"-" in step:
+            label = step.removesuffix(b"-")
             key = hash(label)
             if key in lenses and label in lenses[key]:
                 lenses[key].pop(label)
@@ -39,7 +52,7 @@ def part_two(problem_input: list[str]) -> int:
 
 
 if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
+    problem_input = read_input(__file__)
 
     print("Part One: ", part_one(problem_input))
     print("Part Two: ", part_two(problem_input))
@@ -4,7 +4,11 @@ import re
 from dataclasses import dataclass
 from typing import Optional
 
-from utils import get_and_cache_input
+from aoc.intervals import Box
+from utils import cache_parsed_input, get_and_cache_input
+
+# Bands of ratings are boxes with an axis per category
+CATEGORIES = "xmas"
 
 
 @dataclass(frozen=True)
@@ -18,61 +22,6 @@ class Rating:
         return self.x + self.m + self.a + self.s
 
 
-@dataclass(frozen=True)
-class RatingBand:
-    x: tuple[int, int]
-    m: tuple[int, int]
-    a: tuple[int, int]
-    s: tuple[int, int]
-
-    def get(self, category: str) -> tuple[int, int]:
-        if category == "x":
-            return self.x
-        elif category == "m":
-            return self.m
-        elif category == "a":
-            return self.a
-        elif category == "s":
-            return self.s
-        raise ValueError("Unknown category")
-
-    def is_in_band(self, category: str, value: int) -> bool:
-        return self.get(category)[0] <= value <= self.get(category)[1]
-
-    def split(self, category: str, value: int) -> tuple[RatingBand, RatingBand]:
-        assert self.is_in_band(category, value)
-
-        if category == "x":
-            return (
-                RatingBand((self.x[0], value - 1), self.m, self.a, self.s),
-                RatingBand((value, self.x[1]), self.m, self.a, self.s),
-            )
-        elif category == "m":
-            return (
-                RatingBand(self.x, (self.m[0], value - 1), self.a, self.s),
-                RatingBand(self.x, (value, self.m[1]), self.a, self.s),
-            )
-        elif category == "a":
-            return (
-                RatingBand(self.x, self.m, (self.a[0], value - 1), self.s),
-                RatingBand(self.x, self.m, (value, self.a[1]), self.s),
-            )
-        elif category == "s":
-            return (
-                RatingBand(self.x, self.m, self.a, (self.s[0], value - 1)),
-                RatingBand(self.x, self.m, self.a, (value, self.s[1])),
-            )
-        raise ValueError("Unknown category")
-
-    def count_combinations(self) -> int:
-        return (
-            (self.x[1] - self.x[0] + 1)
-            * (self.m[1] - self.m[0] + 1)
-            * (self.a[1] - self.a[0] + 1)
-            * (self.s[1] - self.s[0] + 1)
-        )
-
-
 @dataclass
 class Workflow:
     steps: list[tuple[str, Optional[str]]]
@@ -119,35 +68,37 @@ def part_one(workflows: dict[str, Workflow], ratings: list[Rating]) -> int:
 
 
 def count_accepted_combinations(
-    workflows: dict[str, Workflow], band: RatingBand, workflow_name: str, index: int
+    workflows: dict[str, Workflow], band: Box, workflow_name: str, index: int
 ) -> int:
     step_result, step_condition = workflows[workflow_name].steps[index]
     if step_condition is None:
         if step_result == "A":
-            return band.count_combinations()
+            return band.volume()
         elif step_result == "R":
             return 0
         else:
             return count_accepted_combinations(workflows, band, step_result, 0)
 
     category_and_value = re.split(r"[<>]", step_condition)
-    category, value = category_and_value[0], int(category_and_value[1])
+    axis, value = CATEGORIES.index(category_and_value[0]), int(category_and_value[1])
+    band_start, band_stop = band.bounds[axis]
 
     if "<" in step_condition:
-        if band.get(category)[1] < value:
+        if band_stop <= value:
             if step_result == "A":
-                return band.count_combinations()
+                return band.volume()
             elif step_result == "R":
                 return 0
             else:
                 return count_accepted_combinations(workflows, band, step_result, 0)
-        elif band.get(category)[0] >= value:
+        elif band_start >= value:
             return count_accepted_combinations(workflows, band, workflow_name, index + 1)
         else:
             combinations = 0
-            band_low, band_high = band.split(category, value)
+            band_low, band_high = band.split(axis, value)
+            assert band_low is not None and band_high is not None
             if step_result == "A":
-                combinations += band_low.count_combinations()
+                combinations += band_low.volume()
             elif step_result != "R":
                 combinations += count_accepted_combinations(
                     workflows, band_low, step_result, 0
@@ -157,23 +108,24 @@ def count_accepted_combinations(
             )
             return combinations
     elif ">" in step_condition:
-        if band.get(category)[0] > value:
+        if band_start > value:
             if step_result == "A":
-                return band.count_combinations()
+                return band.volume()
             elif step_result == "R":
                 return 0
             else:
                 return count_accepted_combinations(workflows, band, step_result, 0)
-        elif band.get(category)[1] <= value:
+        elif band_stop <= value + 1:
             return count_accepted_combinations(workflows, band, workflow_name, index + 1)
         else:
             combinations = 0
-            band_low, band_high = band.split(category, value + 1)
+            band_low, band_high = band.split(axis, value + 1)
+            assert band_low is not None and band_high is not None
             combinations += count_accepted_combinations(
                 workflows, band_low, workflow_name, index + 1
             )
             if step_result == "A":
-                combinations += band_high.count_combinations()
+                combinations += band_high.volume()
             elif step_result != "R":
                 combinations += count_accepted_combinations(
                     workflows, band_high, step_result, 0
@@ -183,15 +135,14 @@ def count_accepted_combinations(
     raise ValueError("Invalid condition")
 
 
-def part_two(workflows: dict[str, Workflow]) -> int:
+def part_two(workflows: dict[str, Workflow], _ratings: list[Rating]) -> int:
     return count_accepted_combinations(
-        workflows, RatingBand((1, 4000), (1, 4000), (1, 4000), (1, 4000)), "in", 0
+        workflows, Box.from_inclusive(*[(1, 4000)] * len(CATEGORIES)), "in", 0
     )
 
 
-if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
-
+@cache_parsed_input
+def parse_input(problem_input: list[str]) -> tuple[dict[str, Workflow], list[Rating]]:
     workflows: dict[str, Workflow] = {}
     ratings: list[Rating] = []
     is_workflows = True
@@ -215,5 +166,13 @@ if __name__ == "__main__":
                 )
             )
 
+    return (workflows, ratings)
+
+
+if __name__ == "__main__":
+    problem_input = get_and_cache_input(__file__)
+
+    workflows, ratings = parse_input(problem_input)
+
     print("Part One: ", part_one(workflows, ratings))
-    print("Part Two: ", part_two(workflows))
+    print("Part Two: ", part_two(workflows, ratings))
@@ -47,10 +47,14 @@ def part_two(games: list[Game]) -> int:
     return sum(game.compute_power() for game in games)
 
 
+def parse_input(problem_input: list[str]) -> tuple[list[Game]]:
+    return ([Game(game_str) for game_str in problem_input],)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    games = [Game(game_str) for game_str in problem_input]
+    (games,) = parse_input(problem_input)
 
     print("Part One: ", part_one(games))
     print("Part Two: ", part_two(games))
@@ -1,7 +1,8 @@
-import math
 from dataclasses import dataclass
 from enum import Enum
 
+from aoc import telemetry
+from aoc.cycles import Occurrences, find_cycle, first_common_occurrence
 from utils import get_and_cache_input
 
 
@@ -120,24 +121,70 @@ def push_button(modules: dict[str, Module]) -> tuple[int, int]:
     return (low_pulses, high_pulses)
 
 
-def push_button_til_high(modules: dict[str, Module], module_name: str) -> int:
-    num_pushes = 0
+def push_button_and_watch(modules: dict[str, Module], module_name: str) -> bool:
+    """
+    Pushes the button, returning whether `module_name` sent a high pulse.
+    """
 
-    while True:
-        num_pushes += 1
-        pulses: Pulses = [("button", "broadcaster", PulseType.LOW)]
-        while len(pulses) > 0:
-            next_pulses: Pulses = []
-            for from_module, to_module, pulse in pulses:
-                if from_module == module_name and pulse == PulseType.HIGH:
-                    return num_pushes
+    sent_high = False
 
-                if to_module in modules:
-                    outputs = modules[to_module].process_inputs(
-                        (from_module, to_module, pulse)
-                    )
-                    next_pulses.extend(outputs)
-            pulses = next_pulses
+    pulses: Pulses = [("button", "broadcaster", PulseType.LOW)]
+    while len(pulses) > 0:
+        next_pulses: Pulses = []
+        for from_module, to_module, pulse in pulses:
+            if from_module == module_name and pulse == PulseType.HIGH:
+                sent_high = True
+
+            if to_module in modules:
+                outputs = modules[to_module].process_inputs(
+                    (from_module, to_module, pulse)
+                )
+                next_pulses.extend(outputs)
+        pulses = next_pulses
+
+    return sent_high
+
+
+def find_upstream_modules(modules: dict[str, Module], module_name: str) -> list[str]:
+    upstream = {module_name}
+    to_visit = [module_name]
+    while len(to_visit) > 0:
+        name = to_visit.pop()
+        for module in modules.values():
+            if name in module.outputs and module.name not in upstream:
+                upstream.add(module.name)
+                to_visit.append(module.name)
+
+    return sorted(upstream)
+
+
+def find_high_pulses(problem_input: list[str], module_name: str) -> Occurrences:
+    """
+    The button pushes during which `module_name` sends a high pulse. They repeat once the
+    modules it depends on are back in a state they've been in.
+    """
+
+    modules = build_modules(problem_input)
+    upstream_modules = [
+        modules[name] for name in find_upstream_modules(modules, module_name)
+    ]
+
+    def get_state(sent_high: bool) -> tuple[tuple[bool, ...], bool]:
+        memory: list[bool] = []
+        for module in upstream_modules:
+            if isinstance(module, FlipFlopModule):
+                memory.append(module.on)
+            elif isinstance(module, ConjunctionModule):
+                memory.extend(pulse.value for pulse in module.memory.values())
+
+        return (tuple(memory), sent_high)
+
+    cycle = find_cycle(
+        get_state(False),
+        lambda _: (get_state(push_button_and_watch(modules, module_name)), 0),
+    )
+
+    return cycle.occurrences(lambda state: state[1])
 
 
 def part_one(problem_input: list[str]) -> int:
@@ -155,18 +202,23 @@ def part_one(problem_input: list[str]) -> int:
 
 
 def part_two(problem_input: list[str]) -> int:
-    modules1 = build_modules(problem_input)
-    modules2 = build_modules(problem_input)
-    modules3 = build_modules(problem_input)
-    modules4 = build_modules(problem_input)
-    p1 = push_button_til_high(modules1, "ss")
-    p2 = push_button_til_high(modules2, "fz")
-    p3 = push_button_til_high(modules3, "mf")
-    p4 = push_button_til_high(modules4, "fh")
-
-    print(p1, p2, p3, p4)
-
-    return math.lcm(p1, p2, p3, p4)
+    # rx is fed by a single conjunction module, which sends it a low pulse once every one
+    # of its inputs sent it a high pulse during the same push
+    modules = build_modules(problem_input)
+    (final_module,) = [module for module in modules.values() if "rx" in module.outputs]
+    input_names = [
+        module.name for module in modules.values() if final_module.name in module.outputs
+    ]
+
+    high_pulses: list[Occurrences] = []
+    for name in input_names:
+        with telemetry.phase(f"watching {name}"):
+            high_pulses.append(find_high_pulses(problem_input, name))
+
+    num_pushes = first_common_occurrence(high_pulses)
+    assert num_pushes is not None, "rx never receives a low pulse"
+
+    return num_pushes
 
 
 if __name__ == "__main__":
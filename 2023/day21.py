@@ -1,5 +1,6 @@
 from typing import Optional
 
+from aoc import telemetry
 from utils import get_and_cache_input
 
 Position = tuple[int, int]
@@ -118,9 +119,6 @@ def part_one(problem_input: list[str]) -> int:
 
 
 def part_two(problem_input: list[str]) -> int:
-    x = int((26501365 - int(len(problem_input) / 2)) / len(problem_input))
-    print(x)
-
     starting_position: Position | None = None
     for row, line in enumerate(problem_input):
         if "S" in line:
@@ -128,12 +126,13 @@ def part_two(problem_input: list[str]) -> int:
             break
     assert starting_position is not None
 
-    best_steps = get_reachable_positions(
-        problem_input,
-        starting_position,
-        max_steps=int(len(problem_input) * 2.5),
-        wrap_edges=True,
-    )
+    with telemetry.phase("exploring the surrounding gardens"):
+        best_steps = get_reachable_positions(
+            problem_input,
+            starting_position,
+            max_steps=int(len(problem_input) * 2.5),
+            wrap_edges=True,
+        )
     locations = set(position for position, steps in best_steps.items() if steps % 2 == 1)
     locations_by_grid: dict[Position, int] = {}
     for r in range(-2, 3):
@@ -175,9 +175,9 @@ def part_two(
     return result
 
 
-if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
-
+def parse_input(
+    problem_input: list[str],
+) -> tuple[list[Brick], dict[int, set[int]], dict[int, set[int]]]:
     bricks: list[Brick] = []
     for index, line in enumerate(problem_input):
         start, end = line.split("~")
@@ -189,8 +189,14 @@ if __name__ == "__main__":
         brick.assert_valid()
         bricks.append(brick)
 
-    settled_bricks, supported_bricks_by_id, supporting_bricks_by_id = settle_bricks(
-        bricks
+    return settle_bricks(bricks)
+
+
+if __name__ == "__main__":
+    problem_input = get_and_cache_input(__file__)
+
+    settled_bricks, supported_bricks_by_id, supporting_bricks_by_id = parse_input(
+        problem_input
     )
 
     print(
@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Literal, NamedTuple
+from typing import TYPE_CHECKING, Literal, NamedTuple
 
-from sympy import Symbol, nonlinsolve, symbols
+from aoc.parsing import extract_int_records
 from utils import get_and_cache_input
 
+if TYPE_CHECKING:
+    from sympy import Symbol
+
 
 class Vector3(NamedTuple):
     x: int
@@ -98,6 +101,9 @@ def part_one(hailstones: list[Hailstone]) -> int:
 
 
 def part_two(hailstones: list[Hailstone]) -> int:
+    # sympy takes longer to import than part one takes to run
+    from sympy import nonlinsolve, symbols
+
     equations = []
     variables = symbols("px, py, pz, vx, vy, vz, t0, t1, t2")
     px, py, pz, vx, vy, vz, t0, t1, t2 = variables
@@ -117,15 +123,19 @@ def part_two(hailstones: list[Hailstone]) -> int:
     return solution["px"] + solution["py"] + solution["pz"]
 
 
+def parse_input(problem_input: list[str]) -> tuple[list[Hailstone]]:
+    hailstones = [
+        Hailstone(Vector3(*record[:3]), Vector3(*record[3:]))
+        for record in extract_int_records(problem_input, 6)
+    ]
+
+    return (hailstones,)
+
+
 if __name__ == "__main__":
     problem_input = get_and_cache_input(__file__)
 
-    hailstones: list[Hailstone] = []
-    for line in problem_input:
-        positions, velocities = line.split("@")
-        position = Vector3(*(int(v) for v in positions.split(",")))
-        velocity = Vector3(*(int(v) for v in velocities.split(",")))
-        hailstones.append(Hailstone(position, velocity))
+    (hailstones,) = parse_input(problem_input)
 
     print("Part One: ", part_one(hailstones))
     print("Part Two: ", part_two(hailstones))
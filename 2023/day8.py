@@ -1,7 +1,7 @@
-import math
 import re
 from dataclasses import dataclass
 
+from aoc.cycles import find_cycle, first_common_occurrence
 from utils import get_and_cache_input
 
 
@@ -27,27 +27,29 @@ def part_one(instructions: str, nodes: dict[str, Node]) -> int:
 
 
 def part_two(instructions: str, nodes: dict[str, Node]) -> int:
-    current_nodes = [name for name in nodes.keys() if name.endswith("A")]
+    # Each ghost follows its own path, which eventually loops, so their paths are all at a
+    # Z node when their loops line up
+    def step(state: tuple[str, int]) -> tuple[tuple[str, int], int]:
+        current, instruction_index = state
+        if instructions[instruction_index] == "L":
+            current = nodes[current].left
+        else:
+            current = nodes[current].right
 
-    distances: dict[str, int] = {}
-    for node in current_nodes:
-        current = node
-        steps = 0
-        while not current.endswith("Z"):
-            direction = instructions[steps % len(instructions)]
-            if direction == "L":
-                current = nodes[current].left
-            elif direction == "R":
-                current = nodes[current].right
-            steps += 1
-        distances[node] = steps
+        return ((current, (instruction_index + 1) % len(instructions)), 0)
 
-    return math.lcm(*distances.values())
+    arrivals = [
+        find_cycle((name, 0), step).occurrences(lambda state: state[0].endswith("Z"))
+        for name in nodes.keys()
+        if name.endswith("A")
+    ]
+    steps = first_common_occurrence(arrivals)
+    assert steps is not None, "The ghosts are never all at a Z node"
 
+    return steps
 
-if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
 
+def parse_input(problem_input: list[str]) -> tuple[str, dict[str, Node]]:
     instructions = problem_input[0]
     nodes: dict[str, Node] = {}
     for line in problem_input[2:]:
@@ -56,5 +58,13 @@ if __name__ == "__main__":
             name = match.group(1)
             nodes[name] = Node(name, match.group(2), match.group(3))
 
+    return (instructions, nodes)
+
+
+if __name__ == "__main__":
+    problem_input = get_and_cache_input(__file__)
+
+    instructions, nodes = parse_input(problem_input)
+
     print("Part One: ", part_one(instructions, nodes))
     print("Part Two: ", part_two(instructions, nodes))
@@ -1,12 +1,15 @@
-import curses
-import re
+from __future__ import annotations
+
 from collections import defaultdict
-from curses import window, wrapper
 from math import prod
-from typing import Callable, NamedTuple
+from typing import TYPE_CHECKING, Callable, NamedTuple
 
+from aoc.parsing import extract_int_records
 from utils import get_and_cache_input
 
+if TYPE_CHECKING:
+    from curses import window
+
 CHARACTER_RAMP = " .:-=+*#%@"
 
 
@@ -31,13 +34,7 @@ class Robot:
 
 
 def parse_robots(problem_input: list[str]) -> list[Robot]:
-    robots: list[Robot] = []
-    for row in problem_input:
-        match = re.match(r"p=(-?\d+),(-?\d+) v=(-?\d+),(-?\d+)", row)
-        if match is not None:
-            x, y, vx, vy = match.groups()
-            robots.append(Robot(int(x), int(y), int(vx), int(vy)))
-    return robots
+    return [Robot(x, y, vx, vy) for x, y, vx, vy in extract_int_records(problem_input, 4)]
 
 
 def render_robots(
@@ -46,6 +43,8 @@ def render_robots(
     def render(screen: window) -> int:
         nonlocal robots, width, height
 
+        import curses
+
         t = 7093
 
         while True:
@@ -119,6 +118,8 @@ def part_one(problem_input: list[str]) -> int:
 
 
 def part_two(problem_input: list[str]) -> int:
+    from curses import wrapper
+
     robots = parse_robots(problem_input)
 
     width = 101
@@ -3,7 +3,7 @@ from collections import defaultdict
 from utils import get_and_cache_input
 
 
-def parse_input(
+def parse_print_rules(
     problem_input: list[str],
 ) -> tuple[list[list[int]], dict[int, set[int]], dict[int, set[int]]]:
     forward_dependencies: dict[int, set[int]] = defaultdict(set)
@@ -71,7 +71,7 @@ def fix_print_order(
 
 
 def part_one(problem_input: list[str]) -> int:
-    print_orders, forward_dependencies, _ = parse_input(problem_input)
+    print_orders, forward_dependencies, _ = parse_print_rules(problem_input)
 
     return sum(
         (
@@ -84,7 +84,9 @@ def part_one(problem_input: list[str]) -> int:
 
 
 def part_two(problem_input: list[str]) -> int:
-    print_orders, forward_dependencies, backward_dependencies = parse_input(problem_input)
+    print_orders, forward_dependencies, backward_dependencies = parse_print_rules(
+        problem_input
+    )
 
     return sum(
         (
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Callable, NamedTuple
 
-from utils import get_and_cache_input
+from utils import map_input_bytes
 
 
 class File(NamedTuple):
@@ -34,14 +34,21 @@ class Space(NamedTuple):
     length: int
 
 
-def parse_files_and_spaces(problem_input: list[str]) -> tuple[list[File], list[Space]]:
+def read_input(file_path_str: str) -> memoryview:
+    return map_input_bytes(file_path_str)
+
+
+def parse_files_and_spaces(problem_input: memoryview) -> tuple[list[File], list[Space]]:
     is_file = True
 
     block_index = 0
     files: list[File] = []
     spaces: list[Space] = []
-    for c in problem_input[0]:
-        value = int(c)
+    for c in problem_input:
+        if not ord("0") <= c <= ord("9"):
+            continue
+
+        value = c - ord("0")
         if is_file:
             files.append(File(len(files), block_index, value))
         else:
@@ -126,16 +133,19 @@ class LinkedFile(LinkedBlocks):
         )
 
 
-def parse_file_list(problem_input: list[str]) -> tuple[LinkedBlocks, LinkedBlocks]:
+def parse_file_list(problem_input: memoryview) -> tuple[LinkedBlocks, LinkedBlocks]:
     is_file = False
 
     num_files = 0
     block_index = 0
     head: LinkedBlocks | None = None
     tail: LinkedBlocks | None = None
-    for c in problem_input[0]:
+    for c in problem_input:
+        if not ord("0") <= c <= ord("9"):
+            continue
+
         is_file = not is_file
-        value = int(c)
+        value = c - ord("0")
         if value == 0:
             continue
 
@@ -195,7 +205,7 @@ def make_request_free_space(
     return request_free_space
 
 
-def part_one(problem_input: list[str]) -> int:
+def part_one(problem_input: memoryview) -> int:
     files, spaces = parse_files_and_spaces(problem_input)
 
     request_free_space = make_request_free_space(spaces)
@@ -206,7 +216,7 @@ def part_one(problem_input: list[str]) -> int:
     return checksum
 
 
-def part_two(problem_input: list[str]) -> int:
+def part_two(problem_input: memoryview) -> int:
     head, tail = parse_file_list(problem_input)
     files: list[LinkedFile] = []
     f: LinkedBlocks | None = tail
@@ -230,7 +240,7 @@ def part_two(problem_input: list[str]) -> int:
 
 
 if __name__ == "__main__":
-    problem_input = get_and_cache_input(__file__)
+    problem_input = read_input(__file__)
 
     print("Part One: ", part_one(problem_input))
     print("Part Two: ", part_two(problem_input))
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from aoc.solutions import REPO_ROOT, Solution
+
+ANSWER_STORE_PATH = REPO_ROOT / ".aoc_cache" / "answers.json"
+AOC_PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+@dataclass
+class StoredAnswer:
+    answer: str
+    input_hash: str
+    solver_hash: str
+    parse_time: float
+    solve_time: float
+    recorded_at: float
+
+
+def answer_key(year: int, day: int, part: str) -> str:
+    return f"{year}/day{day}/{part}"
+
+
+def hash_file(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def find_local_imports(source_path: Path) -> list[Path]:
+    """
+    Finds the files of the year's `utils` module and the `aoc` modules imported by a
+    source file. Third-party and standard library imports are ignored.
+    """
+
+    tree = ast.parse(source_path.read_bytes(), filename=str(source_path))
+    module_names: list[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            module_names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            module_names.append(node.module)
+            module_names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+
+    paths: list[Path] = []
+    for module_name in module_names:
+        if module_name == "utils":
+            path = source_path.with_name("utils.py")
+        elif module_name.startswith("aoc."):
+            submodule_path = module_name.split(".")[1:]
+            path = AOC_PACKAGE_DIR.joinpath(*submodule_path).with_suffix(".py")
+        else:
+            continue
+
+        if path.exists() and path not in paths:
+            paths.append(path)
+
+    return paths
+
+
+def hash_local_sources(source_path: Path) -> str:
+    """
+    Hashes a source file along with the local modules it imports, directly or through
+    other local modules, so changes to shared helpers are noticed too.
+    """
+
+    digest = hashlib.sha256()
+    seen: set[Path] = set()
+    to_visit = [source_path]
+    while len(to_visit) > 0:
+        path = to_visit.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        to_visit.extend(find_local_imports(path))
+
+    for path in sorted(seen):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+
+    return digest.hexdigest()
+
+
+def hash_solver(solution: Solution) -> str:
+    return hash_local_sources(solution.path)
+
+
+class AnswerStore:
+    """
+    Answers of previous runs, keyed by year, day and part. An answer is only returned
+    while both the input file and the solver's source hash to what they did when it was
+    recorded.
+    """
+
+    path: Path
+    answers: dict[str, StoredAnswer]
+    hashes: dict[Path, str]
+
+    def __init__(self, path: Path = ANSWER_STORE_PATH) -> None:
+        self.path = path
+        self.answers = {}
+        self.hashes = {}
+
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as file:
+                for key, entry in json.load(file).items():
+                    self.answers[key] = StoredAnswer(**entry)
+
+    def get_hashes(self, solution: Solution) -> Optional[tuple[str, str]]:
+        if not solution.input_path.exists():
+            return None
+
+        if solution.input_path not in self.hashes:
+            self.hashes[solution.input_path] = hash_file(solution.input_path)
+        if solution.path not in self.hashes:
+            self.hashes[solution.path] = hash_solver(solution)
+
+        return (self.hashes[solution.input_path], self.hashes[solution.path])
+
+    def get(self, solution: Solution, part: str) -> Optional[StoredAnswer]:
+        stored = self.answers.get(answer_key(solution.year, solution.day, part))
+        hashes = self.get_hashes(solution)
+        if stored is None or hashes is None:
+            return None
+        if (stored.input_hash, stored.solver_hash) != hashes:
+            return None
+
+        return stored
+
+    def record(
+        self,
+        solution: Solution,
+        part: str,
+        answer: str,
+        parse_time: float,
+        solve_time: float,
+    ) -> None:
+        hashes = self.get_hashes(solution)
+        if hashes is None:
+            return
+
+        self.answers[answer_key(solution.year, solution.day, part)] = StoredAnswer(
+            answer, hashes[0], hashes[1], parse_time, solve_time, time.time()
+        )
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {key: asdict(stored) for key, stored in sorted(self.answers.items())},
+                file,
+                indent=2,
+            )
+            file.write("\n")
+        temp_path.replace(self.path)
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any, Counter, Iterable, Iterator, Optional
+
+from aoc import memo
+from aoc.runner import (
+    PartResult,
+    RunOptions,
+    format_duration,
+    preload_shared_modules,
+    solve_part,
+)
+from aoc.solutions import PARTS, Solution, find_solutions, load_solution_module
+
+GLOB_CHARACTERS = frozenset("*?[")
+
+
+@dataclass
+class BatchWorker:
+    """
+    A worker process solving one input at a time for as long as it's given inputs, so a
+    day is only imported once per worker instead of once per input.
+    """
+
+    process: BaseProcess
+    connection: Connection
+    input_path: Optional[Path] = None
+    deadline: Optional[float] = None
+
+
+def find_inputs(patterns: Iterable[str]) -> list[Path]:
+    """
+    Every file in the given directories, glob patterns and file paths, sorted and without
+    duplicates.
+    """
+
+    input_paths: set[Path] = set()
+    for pattern in patterns:
+        if GLOB_CHARACTERS.intersection(pattern):
+            matches = [Path(match) for match in glob.glob(pattern, recursive=True)]
+        elif Path(pattern).is_dir():
+            matches = list(Path(pattern).iterdir())
+        else:
+            matches = [Path(pattern)]
+        input_paths.update(match.resolve() for match in matches if match.is_file())
+
+    return sorted(input_paths)
+
+
+def solve_input(solution: Solution, input_path: Path) -> list[PartResult]:
+    results: list[PartResult] = []
+    for part in PARTS:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = solve_part(solution, part, RunOptions(input_path=input_path))
+        except BaseException:
+            result = PartResult(
+                solution.year,
+                solution.day,
+                part,
+                "error",
+                error=traceback.format_exc(limit=-3),
+            )
+        if result.status != "missing":
+            results.append(result)
+
+    # The module stays imported for the next input, which mustn't see this one's caches
+    module = sys.modules.get(solution.module_name)
+    if module is not None:
+        memo.clear_module_caches(module)
+
+    return results
+
+
+def run_batch_worker(solution: Solution, connection: Connection) -> None:
+    # The parsed-input cache keeps one entry per parser, so caching a corpus of inputs
+    # would only write pickles that the next input evicts
+    os.environ["AOC_PARSE_CACHE"] = "0"
+
+    while True:
+        input_path: Optional[Path] = connection.recv()
+        if input_path is None:
+            break
+        connection.send(solve_input(solution, input_path))
+
+    connection.close()
+
+
+def start_worker(solution: Solution) -> BatchWorker:
+    connection, worker_connection = multiprocessing.Pipe()
+    process = multiprocessing.Process(
+        target=run_batch_worker, args=(solution, worker_connection), daemon=True
+    )
+    process.start()
+    worker_connection.close()
+
+    return BatchWorker(process, connection)
+
+
+def stop_worker(worker: BatchWorker, kill: bool = False) -> None:
+    if kill:
+        worker.process.kill()
+    else:
+        try:
+            worker.connection.send(None)
+        except (BrokenPipeError, OSError):
+            worker.process.kill()
+    worker.process.join()
+    worker.connection.close()
+
+
+def failed_results(
+    solution: Solution, status: str, error: Optional[str] = None
+) -> list[PartResult]:
+    return [
+        PartResult(solution.year, solution.day, part, status, error=error)
+        for part in PARTS
+    ]
+
+
+def run_batch(
+    solution: Solution,
+    input_paths: list[Path],
+    workers: int,
+    timeout: Optional[float] = None,
+) -> Iterator[tuple[Path, list[PartResult]]]:
+    """
+    Solves both parts of a day for every input across a pool of long-lived workers,
+    yielding each input's results as soon as they're ready. An input that times out or
+    crashes its worker only costs that worker, which is replaced.
+    """
+
+    preload_shared_modules()
+    if multiprocessing.get_start_method() == "fork":
+        # Forked workers inherit the imported solution instead of each importing it
+        load_solution_module(solution)
+
+    pending = list(reversed(input_paths))
+    pool = [start_worker(solution) for _ in range(min(workers, len(input_paths)))]
+    try:
+        while len(pending) > 0 or any(worker.input_path is not None for worker in pool):
+            for worker in pool:
+                if worker.input_path is None and len(pending) > 0:
+                    worker.input_path = pending.pop()
+                    worker.connection.send(worker.input_path)
+                    if timeout is not None:
+                        worker.deadline = time.monotonic() + timeout
+
+            busy = [worker for worker in pool if worker.input_path is not None]
+            deadlines = [
+                worker.deadline for worker in busy if worker.deadline is not None
+            ]
+            wait_time = (
+                max(0, min(deadlines) - time.monotonic()) if len(deadlines) > 0 else None
+            )
+            ready = wait([worker.connection for worker in busy], wait_time)
+
+            for index, worker in enumerate(pool):
+                input_path = worker.input_path
+                if input_path is None:
+                    continue
+
+                if worker.connection in ready:
+                    try:
+                        results: list[PartResult] = worker.connection.recv()
+                    except EOFError:
+                        results = failed_results(
+                            solution,
+                            "error",
+                            f"Worker exited with code {worker.process.exitcode}",
+                        )
+                        stop_worker(worker, kill=True)
+                        pool[index] = start_worker(solution)
+                    else:
+                        worker.input_path, worker.deadline = None, None
+                elif worker.deadline is not None and time.monotonic() >= worker.deadline:
+                    results = failed_results(solution, "timeout")
+                    stop_worker(worker, kill=True)
+                    pool[index] = start_worker(solution)
+                else:
+                    continue
+
+                yield (input_path, results)
+    finally:
+        for worker in pool:
+            stop_worker(worker, kill=worker.input_path is not None)
+
+
+def format_batch_result(input_path: Path, result: PartResult) -> dict[str, Any]:
+    return {
+        "input": str(input_path),
+        "year": result.year,
+        "day": result.day,
+        "part": result.part,
+        "status": result.status,
+        "answer": result.answer,
+        "parse_time": result.parse_time,
+        "solve_time": result.solve_time,
+        "error": result.error,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Solve a day for many inputs in a pool of processes, streaming the"
+        " answers as JSON lines"
+    )
+    parser.add_argument("year", type=int)
+    parser.add_argument("day", type=int)
+    parser.add_argument(
+        "inputs", nargs="+", help="input files, directories of inputs or glob patterns"
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "-t", "--timeout", type=float, help="per-input timeout in seconds (default: none)"
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="write JSON lines here instead of stdout"
+    )
+    args = parser.parse_args(argv)
+
+    solutions = find_solutions([args.year], [args.day])
+    if len(solutions) == 0:
+        print(f"No solution for {args.year} day {args.day}", file=sys.stderr)
+        return 1
+
+    input_paths = find_inputs(args.inputs)
+    if len(input_paths) == 0:
+        print("No inputs found", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    statuses: Counter[str] = Counter()
+    with contextlib.ExitStack() as stack:
+        output = (
+            stack.enter_context(open(args.output, "w", encoding="utf-8"))
+            if args.output is not None
+            else sys.stdout
+        )
+        for input_path, results in run_batch(
+            solutions[0], input_paths, max(1, args.workers), args.timeout
+        ):
+            for result in results:
+                statuses[result.status] += 1
+                output.write(json.dumps(format_batch_result(input_path, result)) + "\n")
+            output.flush()
+
+    print(
+        f"{len(input_paths)} inputs in {format_duration(time.perf_counter() - start)}: "
+        + ", ".join(f"{count} {status}" for status, count in sorted(statuses.items())),
+        file=sys.stderr,
+    )
+
+    return 0 if set(statuses) <= {"ok"} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
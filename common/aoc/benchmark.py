@@ -0,0 +1,454 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from aoc.generators import GENERATORS, format_scale, write_generated_input
+from aoc.runner import (
+    PartResult,
+    RunOptions,
+    format_duration,
+    format_memory,
+    run_parts,
+    run_solutions,
+)
+from aoc.solutions import PARTS, REPO_ROOT, find_solutions
+
+DEFAULT_HISTORY_PATH = REPO_ROOT / "bench_history.json"
+
+
+@dataclass
+class BenchmarkStats:
+    answer: Optional[str]
+    runs: int
+    min: float
+    median: float
+    p95: float
+    parse_median: float
+    peak_memory: Optional[int]
+
+    @staticmethod
+    def from_result(result: PartResult) -> BenchmarkStats:
+        return BenchmarkStats(
+            result.answer,
+            len(result.solve_times),
+            min(result.solve_times),
+            statistics.median(result.solve_times),
+            percentile(result.solve_times, 95),
+            statistics.median(result.parse_times or [result.parse_time]),
+            result.peak_memory,
+        )
+
+
+@dataclass
+class Regression:
+    key: str
+    # Which median slowed down, "solve" or "parse"
+    measure: str
+    baseline_median: float
+    median: float
+
+    @property
+    def change(self) -> float:
+        return (self.median - self.baseline_median) / self.baseline_median * 100
+
+
+@dataclass
+class SweepPoint:
+    scale: float
+    size: int
+    result: PartResult
+
+
+def percentile(values: list[float], percent: float) -> float:
+    ordered = sorted(values)
+    rank = math.ceil(percent / 100 * len(ordered))
+    return ordered[max(0, rank - 1)]
+
+
+def result_key(result: PartResult) -> str:
+    return f"{result.year}/day{result.day}/{result.part}"
+
+
+def get_git_commit() -> tuple[str, bool]:
+    commit = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    status = subprocess.run(
+        ["git", "status", "--porcelain", "--untracked-files=no"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+    return (commit, len(status) > 0)
+
+
+def load_history(history_path: Path) -> dict[str, Any]:
+    if not history_path.exists():
+        return {}
+
+    with open(history_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_history(history_path: Path, history: dict[str, Any]) -> None:
+    temp_path = history_path.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(history, file, indent=2)
+        file.write("\n")
+    temp_path.replace(history_path)
+
+
+def find_baseline(history: dict[str, Any], commit: str) -> Optional[dict[str, Any]]:
+    # Entries only recording import times (from aoc.importtime) have no results to compare
+    for entry_commit in reversed(list(history)):
+        if entry_commit != commit and len(history[entry_commit]["results"]) > 0:
+            return history[entry_commit]
+
+    return None
+
+
+def find_regressions(
+    stats: dict[str, BenchmarkStats],
+    baseline: dict[str, Any],
+    threshold: float,
+    min_time: float,
+) -> list[Regression]:
+    regressions: list[Regression] = []
+    for key, part_stats in stats.items():
+        baseline_stats = baseline["results"].get(key)
+        if baseline_stats is None:
+            continue
+
+        # Entries recorded before parse times were benchmarked only have solve times
+        for measure, median, baseline_median in (
+            ("solve", part_stats.median, baseline_stats["median"]),
+            ("parse", part_stats.parse_median, baseline_stats.get("parse_median")),
+        ):
+            if baseline_median is None or max(median, baseline_median) < min_time:
+                continue
+
+            if median > baseline_median * (1 + threshold / 100):
+                regressions.append(Regression(key, measure, baseline_median, median))
+
+    return regressions
+
+
+def format_benchmark_table(
+    results: list[PartResult],
+    stats: dict[str, BenchmarkStats],
+    regressions: list[Regression],
+) -> str:
+    regressed: dict[str, list[Regression]] = {}
+    for regression in regressions:
+        regressed.setdefault(regression.key, []).append(regression)
+
+    header = (
+        "Year",
+        "Day",
+        "Part",
+        "Parse",
+        "Min",
+        "Median",
+        "P95",
+        "Peak mem",
+        "Status",
+    )
+    rows: list[tuple[str, ...]] = []
+    for result in results:
+        key = result_key(result)
+        if key not in stats:
+            rows.append(
+                (
+                    str(result.year),
+                    str(result.day),
+                    result.part,
+                    *["-"] * 5,
+                    result.status,
+                )
+            )
+            continue
+
+        part_stats = stats[key]
+        status = result.status
+        if key in regressed:
+            status = ", ".join(
+                f"REGRESSED {regression.measure} +{regression.change:.0f}%"
+                for regression in regressed[key]
+            )
+        rows.append(
+            (
+                str(result.year),
+                str(result.day),
+                result.part,
+                format_duration(part_stats.parse_median),
+                format_duration(part_stats.min),
+                format_duration(part_stats.median),
+                format_duration(part_stats.p95),
+                format_memory(part_stats.peak_memory),
+                status,
+            )
+        )
+
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    left_aligned = {2, 8}
+
+    lines = []
+    for row in [header, *rows]:
+        lines.append(
+            "  ".join(
+                cell.ljust(widths[i]) if i in left_aligned else cell.rjust(widths[i])
+                for i, cell in enumerate(row)
+            ).rstrip()
+        )
+    lines.insert(1, "  ".join("-" * width for width in widths))
+
+    return "\n".join(lines)
+
+
+def fit_power_law(sizes: list[int], times: list[float]) -> Optional[float]:
+    """
+    Fits time = c * size^k by least squares on log-log scales, returning the exponent k.
+    """
+
+    if len(set(sizes)) < 2:
+        return None
+
+    log_sizes = [math.log(size) for size in sizes]
+    log_times = [math.log(max(time, 1e-9)) for time in times]
+    mean_size = statistics.fmean(log_sizes)
+    mean_time = statistics.fmean(log_times)
+    covariance = sum(
+        (log_size - mean_size) * (log_time - mean_time)
+        for log_size, log_time in zip(log_sizes, log_times)
+    )
+    variance = sum((log_size - mean_size) ** 2 for log_size in log_sizes)
+
+    return covariance / variance
+
+
+def run_sweep(
+    years: Optional[list[int]],
+    days: Optional[list[int]],
+    scales: list[float],
+    seed: int,
+    workers: int,
+    options: RunOptions,
+) -> dict[tuple[int, int, str], list[SweepPoint]]:
+    sweeps: dict[tuple[int, int, str], list[SweepPoint]] = {}
+    for (year, day), generator in GENERATORS.items():
+        if (years and year not in years) or (days and day not in days):
+            continue
+
+        solutions = find_solutions([year], [day])
+        if len(solutions) == 0:
+            continue
+
+        for scale in sorted(scales):
+            input_path, size = write_generated_input(generator, scale, seed)
+            scale_options = RunOptions(
+                timeout=options.timeout, repeat=options.repeat, input_path=input_path
+            )
+            parts = [(solutions[0], part) for part in PARTS]
+            for result in run_parts(parts, workers, scale_options):
+                if result.status == "missing":
+                    continue
+                sweeps.setdefault((year, day, result.part), []).append(
+                    SweepPoint(scale, size, result)
+                )
+
+    return sweeps
+
+
+def format_sweep(
+    sweeps: dict[tuple[int, int, str], list[SweepPoint]], max_exponent: float
+) -> tuple[str, int]:
+    """
+    Formats sweep results, one line per part and scale followed by the fitted exponent,
+    and counts the parts scaling worse than `max_exponent`. Timed out points are left out
+    of the fit, so exponents of parts that timed out are underestimates.
+    """
+
+    lines: list[str] = []
+    too_slow = 0
+    for (year, day, part), points in sorted(sweeps.items()):
+        lines.append(f"{year} day {day} part {part}")
+        for point in points:
+            outcome = (
+                format_duration(point.result.solve_time)
+                if point.result.status == "ok"
+                else point.result.status
+            )
+            lines.append(
+                f"  {format_scale(point.scale):>6}  size {point.size:>10,}  {outcome:>10}"
+            )
+
+        solved = [point for point in points if point.result.status == "ok"]
+        exponent = fit_power_law(
+            [point.size for point in solved],
+            [point.result.solve_time for point in solved],
+        )
+        if exponent is None:
+            lines.append("  not enough solved sizes to fit a curve")
+        else:
+            flag = ""
+            if exponent > max_exponent:
+                too_slow += 1
+                flag = f", worse than O(n^{max_exponent:g})"
+            lines.append(f"  ~O(n^{exponent:.2f}){flag}")
+
+    return ("\n".join(lines), too_slow)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark Advent of Code solutions against their cached inputs"
+    )
+    parser.add_argument("-y", "--year", type=int, nargs="+", help="years to benchmark")
+    parser.add_argument("-d", "--day", type=int, nargs="+", help="days to benchmark")
+    parser.add_argument(
+        "-n", "--runs", type=int, default=5, help="timed runs per part (default: 5)"
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="parts to benchmark concurrently (default: 1, to avoid skewing timings)",
+    )
+    parser.add_argument(
+        "-t", "--timeout", type=float, help="per-part timeout in seconds (default: none)"
+    )
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=DEFAULT_HISTORY_PATH,
+        help=f"benchmark history file (default: {DEFAULT_HISTORY_PATH.name})",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10,
+        help="median slowdown in percent flagged as a regression (default: 10)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=1e-3,
+        help="ignore regressions in parts faster than this many seconds (default: 0.001)",
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="don't record results in the history file"
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="time generated inputs of increasing size instead of the real inputs",
+    )
+    parser.add_argument(
+        "--scales",
+        type=float,
+        nargs="+",
+        default=[1, 10, 100],
+        help="generated input sizes relative to a real input (default: 1 10 100)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed for generated inputs (default: 0)"
+    )
+    parser.add_argument(
+        "--max-exponent",
+        type=float,
+        default=1.5,
+        help="flag parts whose time grows faster than size^N when sweeping (default: 1.5)",
+    )
+    args = parser.parse_args(argv)
+
+    # Parsing is timed too, so it has to actually happen rather than load a cached result.
+    # Workers inherit the environment
+    os.environ["AOC_PARSE_CACHE"] = "0"
+
+    if args.sweep:
+        sweeps = run_sweep(
+            args.year,
+            args.day,
+            args.scales,
+            args.seed,
+            max(1, args.workers),
+            RunOptions(timeout=args.timeout, repeat=max(1, args.runs)),
+        )
+        if len(sweeps) == 0:
+            print("No input generators found", file=sys.stderr)
+            return 1
+
+        report, too_slow = format_sweep(sweeps, args.max_exponent)
+        print(report)
+        return 1 if too_slow > 0 else 0
+
+    solutions = [
+        solution
+        for solution in find_solutions(args.year, args.day)
+        if solution.input_path.exists()
+    ]
+    if len(solutions) == 0:
+        print("No solutions with cached inputs found", file=sys.stderr)
+        return 1
+
+    options = RunOptions(
+        timeout=args.timeout, repeat=max(1, args.runs), trace_memory=True
+    )
+    results = run_solutions(solutions, max(1, args.workers), options)
+    stats = {
+        result_key(result): BenchmarkStats.from_result(result)
+        for result in results
+        if result.status == "ok"
+    }
+
+    commit, dirty = get_git_commit()
+    history = load_history(args.history)
+    baseline = find_baseline(history, commit)
+    regressions = (
+        find_regressions(stats, baseline, args.threshold, args.min_time)
+        if baseline is not None
+        else []
+    )
+
+    print(format_benchmark_table(results, stats, regressions))
+    for result in results:
+        if result.error is not None:
+            print(f"\n{result.year} day {result.day} part {result.part} failed:")
+            print(result.error.rstrip())
+    if baseline is not None:
+        print(
+            f"\n{len(regressions)} regression(s) compared to {baseline['commit'][:12]}"
+            f" (threshold {args.threshold:g}%)"
+        )
+
+    if not args.no_save:
+        entry = history.pop(commit, {"commit": commit, "results": {}})
+        entry["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        entry["dirty"] = dirty
+        entry["runs"] = options.repeat
+        entry["results"].update({key: asdict(value) for key, value in stats.items()})
+        history[commit] = entry
+        save_history(args.history, history)
+
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Optional
+
+_FLAGS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def popcount(board: int) -> int:
+    return bin(board).count("1")
+
+
+class BitGrid:
+    """
+    The shape of a grid whose boards are ints, with a bit per cell at `row * width + col`.
+    Moving every cell of a board at once is a shift and a mask, so a simulation step is
+    a handful of big-int operations instead of a lookup per cell.
+    """
+
+    width: int
+    height: int
+    size: int
+    full: int
+
+    _row_starts: int
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.full = (1 << self.size) - 1
+
+        # A bit at the start of every row, so multiplying by a row's bits repeats them
+        self._row_starts = 0
+        for row in range(height):
+            self._row_starts |= 1 << (row * width)
+
+    def parse(self, lines: Iterable[str], cell: str) -> int:
+        """
+        The board of the cells in `lines` that are `cell`.
+        """
+
+        board = 0
+        for row, line in enumerate(lines):
+            bits = "".join("1" if c == cell else "0" for c in reversed(line))
+            board |= int(bits, 2) << (row * self.width)
+
+        return board
+
+    def format(self, board: int, set_cell: str = "#", unset_cell: str = ".") -> list[str]:
+        bits = format(board, f"0{self.size}b")[::-1]
+        return [
+            bits[row * self.width : (row + 1) * self.width]
+            .replace("1", set_cell)
+            .replace("0", unset_cell)
+            for row in range(self.height)
+        ]
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.width + col
+
+    def row_mask(self, start: int, stop: Optional[int] = None) -> int:
+        """
+        Every cell in rows `start` (inclusive) to `stop` (exclusive, just past `start` by
+        default).
+        """
+
+        if stop is None:
+            stop = start + 1
+        start, stop = max(0, start), min(self.height, stop)
+        if start >= stop:
+            return 0
+
+        return ((1 << ((stop - start) * self.width)) - 1) << (start * self.width)
+
+    def column_mask(self, start: int, stop: Optional[int] = None) -> int:
+        """
+        Every cell in columns `start` (inclusive) to `stop` (exclusive, just past `start`
+        by default).
+        """
+
+        if stop is None:
+            stop = start + 1
+        start, stop = max(0, start), min(self.width, stop)
+        if start >= stop:
+            return 0
+
+        return (((1 << (stop - start)) - 1) << start) * self._row_starts
+
+    def shift(self, board: int, d_row: int, d_col: int, wrap: bool = False) -> int:
+        """
+        Moves every set cell by `(d_row, d_col)`, dropping cells moved off the grid, or
+        bringing them back in on the other side with `wrap`.
+        """
+
+        if d_col != 0:
+            if wrap:
+                d_col %= self.width
+                kept = self.column_mask(0, self.width - d_col)
+                board = ((board & kept) << d_col) | (
+                    (board & ~kept) >> (self.width - d_col)
+                )
+            elif d_col > 0:
+                board = (board & self.column_mask(0, self.width - d_col)) << d_col
+            else:
+                board = (board & self.column_mask(-d_col, self.width)) >> -d_col
+
+        if d_row != 0:
+            if wrap:
+                offset = (d_row % self.height) * self.width
+                board = ((board << offset) | (board >> (self.size - offset))) & self.full
+            elif d_row > 0:
+                board = (board << (d_row * self.width)) & self.full
+            else:
+                board >>= -d_row * self.width
+
+        return board
+
+    def neighbors(self, board: int, d_row: int, d_col: int, wrap: bool = False) -> int:
+        """
+        The cells whose neighbor `(d_row, d_col)` away is set.
+        """
+
+        return self.shift(board, -d_row, -d_col, wrap)
+
+    def positions(self, board: int) -> Iterator[tuple[int, int]]:
+        bits = format(board, f"0{self.size}b")[::-1]
+        index = bits.find("1")
+        while index != -1:
+            yield divmod(index, self.width)
+            index = bits.find("1", index + 1)
+
+    def to_flags(self, board: int) -> bytearray:
+        """
+        A byte per cell, 1 where the board is set.
+        """
+
+        return bytearray(format(board, f"0{self.size}b")[::-1].encode().translate(_FLAGS))
+
+    def bounding_box(self, board: int) -> tuple[int, int, int, int]:
+        """
+        The first and last rows and columns with a set cell, inclusive.
+        """
+
+        if board == 0:
+            raise ValueError("Empty board")
+
+        first_row = ((board & -board).bit_length() - 1) // self.width
+        last_row = (board.bit_length() - 1) // self.width
+
+        columns = 0
+        row_bits = (1 << self.width) - 1
+        for row in range(first_row, last_row + 1):
+            columns |= (board >> (row * self.width)) & row_bits
+        first_col = (columns & -columns).bit_length() - 1
+        last_col = columns.bit_length() - 1
+
+        return (first_row, first_col, last_row, last_col)
+
+    def pad(self, board: int, margin: int) -> tuple[BitGrid, int]:
+        """
+        A grid `margin` cells bigger on every side, with the board moved into its middle.
+        """
+
+        padded = BitGrid(self.width + 2 * margin, self.height + 2 * margin)
+        row_bits = (1 << self.width) - 1
+        padded_board = 0
+        for row in range(self.height):
+            padded_board |= ((board >> (row * self.width)) & row_bits) << padded.index(
+                row + margin, margin
+            )
+
+        return (padded, padded_board)
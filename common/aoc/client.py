@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+# The client only needs the standard library, so that running it costs little more than
+# starting the interpreter
+DEFAULT_SOCKET_PATH = Path(tempfile.gettempdir()) / f"aoc-daemon-{os.getuid()}.sock"
+
+
+def get_socket_path() -> Path:
+    return Path(os.environ.get("AOC_DAEMON_SOCKET", DEFAULT_SOCKET_PATH))
+
+
+def send_request(request: dict[str, Any], socket_path: Optional[Path] = None) -> Any:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(socket_path or get_socket_path()))
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as response:
+            return json.loads(response.readline())
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    return f"{seconds * 1e3:.2f} ms"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Solve a day with a running solve daemon (python -m aoc.daemon)"
+    )
+    parser.add_argument("year", type=int, nargs="?")
+    parser.add_argument("day", type=int, nargs="?")
+    parser.add_argument(
+        "-p", "--part", choices=("one", "two"), action="append", help="parts to solve"
+    )
+    parser.add_argument("-i", "--input", type=Path, help="input file to solve instead")
+    parser.add_argument("--socket", type=Path, help="daemon socket path")
+    parser.add_argument("--stop", action="store_true", help="shut the daemon down")
+    args = parser.parse_args(argv)
+
+    request: dict[str, Any]
+    if args.stop:
+        request = {"command": "stop"}
+    elif args.year is not None and args.day is not None:
+        request = {
+            "command": "solve",
+            "year": args.year,
+            "day": args.day,
+            "parts": args.part or ["one", "two"],
+            "input_path": str(args.input.resolve()) if args.input else None,
+        }
+    else:
+        parser.error("a year and day are required to solve")
+
+    try:
+        response = send_request(request, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(
+            "No solve daemon is running, start one with `python -m aoc.daemon`",
+            file=sys.stderr,
+        )
+        return 1
+
+    if "error" in response:
+        print(response["error"].rstrip(), file=sys.stderr)
+        return 1
+    if args.stop:
+        return 0
+
+    ok = True
+    for result in response["results"]:
+        if result["output"]:
+            print(result["output"], end="")
+
+        label = f"Part {result['part'].title()}: "
+        if result["status"] == "ok":
+            timings = (
+                f"(parse {format_seconds(result['parse_time'])},"
+                f" solve {format_seconds(result['solve_time'])})"
+            )
+            if "\n" in result["answer"]:
+                print(label, timings)
+                print(result["answer"])
+            else:
+                print(label, result["answer"], timings)
+        else:
+            ok = False
+            print(label, result["status"])
+            if result["error"]:
+                print(result["error"].rstrip(), file=sys.stderr)
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
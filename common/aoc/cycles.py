@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import itertools
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+from aoc import instrument
+
+S = TypeVar("S")
+
+Step = Callable[[S], "tuple[S, int]"]
+
+
+@dataclass
+class Occurrences:
+    """
+    Steps at which something happens in an eventually periodic sequence: once at each of
+    `before_cycle`, then at each of `in_cycle` plus any multiple of `cycle_length`.
+    """
+
+    before_cycle: list[int]
+    in_cycle: list[int]
+    cycle_start: int
+    cycle_length: int
+
+    def __contains__(self, step: int) -> bool:
+        if step < self.cycle_start:
+            return step in self.before_cycle
+
+        offset = (step - self.cycle_start) % self.cycle_length
+        return self.cycle_start + offset in self.in_cycle
+
+
+@dataclass
+class Cycle(Generic[S]):
+    """
+    The states of a simulation from its initial state, which repeat every `length` steps
+    from step `start` on, with the running totals of the quantities added by every step.
+    Without a `length`, the simulation didn't repeat within the steps it was run for.
+    """
+
+    start: int
+    length: Optional[int]
+    states: list[S] = field(repr=False)
+    totals: list[int] = field(repr=False)
+
+    def index(self, step: int) -> int:
+        if self.length is None or step < self.start:
+            return step
+
+        return self.start + (step - self.start) % self.length
+
+    def state_at(self, step: int) -> S:
+        return self.states[self.index(step)]
+
+    def total_at(self, step: int) -> int:
+        if self.length is None or step < self.start:
+            return self.totals[step]
+
+        num_cycles = (step - self.start) // self.length
+        total_per_cycle = self.totals[self.start + self.length] - self.totals[self.start]
+
+        return self.totals[self.index(step)] + num_cycles * total_per_cycle
+
+    def occurrences(self, predicate: Callable[[S], bool]) -> Occurrences:
+        """
+        The steps after which the state satisfies `predicate`.
+        """
+
+        if self.length is None:
+            raise ValueError("The simulation hasn't been run until it repeats")
+
+        matches = [step for step, state in enumerate(self.states) if predicate(state)]
+
+        return Occurrences(
+            [step for step in matches if step < self.start],
+            [step for step in matches if self.start <= step < self.start + self.length],
+            self.start,
+            self.length,
+        )
+
+
+def find_cycle(
+    initial: S,
+    step: Step[S],
+    fingerprint: Callable[[S], Hashable] = lambda state: state,
+    max_steps: Optional[int] = None,
+) -> Cycle[S]:
+    """
+    Runs `step`, which returns the next state and a quantity to add to a running total
+    (or 0), until a state's fingerprint repeats one seen before, or for `max_steps`.
+
+    Fingerprints must be equal exactly when states evolve the same way. A hash table of
+    every fingerprint seen finds the cycle as soon as it first repeats, so states are kept
+    in memory; they should be compact, e.g. a `bytes` of a NumPy array.
+    """
+
+    states = [initial]
+    totals = [0]
+    seen: dict[Hashable, int] = {fingerprint(initial): 0}
+
+    state = initial
+    while max_steps is None or len(states) <= max_steps:
+        state, amount = step(state)
+        key = fingerprint(state)
+        if key in seen:
+            start = seen[key]
+            totals.append(totals[-1] + amount)
+            instrument.count("cycle prefix", start)
+            instrument.count("cycle length", len(states) - start)
+            return Cycle(start, len(states) - start, states, totals)
+
+        seen[key] = len(states)
+        states.append(state)
+        totals.append(totals[-1] + amount)
+
+    return Cycle(len(states), None, states, totals)
+
+
+def simulate(
+    initial: S,
+    step: Step[S],
+    num_steps: int,
+    fingerprint: Callable[[S], Hashable] = lambda state: state,
+) -> tuple[S, int]:
+    """
+    The state after `num_steps` steps, and the total of the quantities they added,
+    fast-forwarding through whole cycles once the simulation repeats.
+    """
+
+    cycle = find_cycle(initial, step, fingerprint, num_steps)
+    return (cycle.state_at(num_steps), cycle.total_at(num_steps))
+
+
+def solve_congruences(congruences: list[tuple[int, int]]) -> Optional[tuple[int, int]]:
+    """
+    The `(residue, modulus)` of the numbers congruent to every `(residue, modulus)`, which
+    needn't be coprime, or None when no number is.
+    """
+
+    residue, modulus = 0, 1
+    for other_residue, other_modulus in congruences:
+        gcd = math.gcd(modulus, other_modulus)
+        if (other_residue - residue) % gcd != 0:
+            return None
+
+        # Solve residue + modulus * k = other_residue (mod other_modulus) for k
+        reduced_modulus = other_modulus // gcd
+        k = (other_residue - residue) // gcd * pow(modulus // gcd, -1, reduced_modulus)
+        residue += modulus * (k % reduced_modulus)
+        modulus *= reduced_modulus
+        residue %= modulus
+
+    return (residue, modulus)
+
+
+def first_common_occurrence(all_occurrences: list[Occurrences]) -> Optional[int]:
+    """
+    The first step at which every one of `all_occurrences` happens, if any.
+    """
+
+    # Before every sequence is cycling, only steps some sequence hasn't cycled at yet are
+    # candidates
+    all_cycling = max(occurrences.cycle_start for occurrences in all_occurrences)
+    candidates = sorted(
+        {
+            step
+            for occurrences in all_occurrences
+            for step in occurrences.before_cycle
+            if step < all_cycling
+        }
+    )
+    for step in candidates:
+        if all(step in occurrences for occurrences in all_occurrences):
+            return step
+
+    first_step: Optional[int] = None
+    for steps in itertools.product(
+        *(occurrences.in_cycle for occurrences in all_occurrences)
+    ):
+        solution = solve_congruences(
+            [
+                (step, occurrences.cycle_length)
+                for step, occurrences in zip(steps, all_occurrences)
+            ]
+        )
+        if solution is None:
+            continue
+
+        residue, modulus = solution
+        step = residue + max(0, -((residue - all_cycling) // modulus)) * modulus
+        if first_step is None or step < first_step:
+            first_step = step
+
+    return first_step
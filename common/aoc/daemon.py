@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from pathlib import Path
+from typing import Any, Optional
+
+from aoc.client import get_socket_path
+from aoc.runner import PartResult, RunOptions, solve_part
+from aoc.solutions import PARTS, Solution, find_solutions, load_solution_module
+
+
+class SolveDaemon(socketserver.UnixStreamServer):
+    """
+    Solves days in a long-lived interpreter, so heavy imports (sympy, numpy, requests...)
+    are only paid for once. Day modules themselves are executed again for every part,
+    which picks up edits and gives each part fresh module-level state, like the runner's
+    worker processes do.
+    """
+
+    solutions: dict[tuple[int, int], Solution]
+
+    def __init__(self, socket_path: Path) -> None:
+        # A daemon that didn't shut down cleanly leaves its socket behind, but one that's
+        # still running mustn't have its socket taken over
+        if socket_path.is_socket():
+            if is_daemon_listening(socket_path):
+                raise RuntimeError(f"A daemon is already running on {socket_path}")
+            socket_path.unlink(missing_ok=True)
+
+        super().__init__(str(socket_path), SolveRequestHandler)
+        self.solutions = {}
+
+    def find_solution(self, year: int, day: int) -> Optional[Solution]:
+        if (year, day) not in self.solutions:
+            for solution in find_solutions([year], [day]):
+                self.solutions[(year, day)] = solution
+
+        return self.solutions.get((year, day))
+
+    def solve(self, request: dict[str, Any]) -> dict[str, Any]:
+        solution = self.find_solution(request["year"], request["day"])
+        if solution is None:
+            return {"error": f"No solution for {request['year']} day {request['day']}"}
+
+        input_path = request.get("input_path")
+        options = RunOptions(input_path=Path(input_path) if input_path else None)
+
+        results: list[dict[str, Any]] = []
+        for part in request.get("parts", PARTS):
+            if part not in PARTS:
+                return {"error": f"Unknown part {part!r}"}
+
+            sys.modules.pop(solution.module_name, None)
+            output = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(output):
+                    result = solve_part(solution, part, options)
+            except Exception:
+                result = PartResult(
+                    solution.year,
+                    solution.day,
+                    part,
+                    "error",
+                    error=traceback.format_exc(limit=-3),
+                )
+
+            results.append(
+                {
+                    "part": part,
+                    "status": result.status,
+                    "answer": result.answer,
+                    "parse_time": result.parse_time,
+                    "solve_time": result.solve_time,
+                    "error": result.error,
+                    "output": output.getvalue(),
+                }
+            )
+
+        return {"results": results}
+
+
+class SolveRequestHandler(socketserver.StreamRequestHandler):
+    server: SolveDaemon
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        # Another daemon checking whether this one is running connects without a request
+        if len(line) == 0:
+            return
+
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            self.respond({"error": f"Invalid request: {error}"})
+            return
+
+        command = request.get("command")
+        if command == "solve":
+            self.respond(self.server.solve(request))
+        elif command == "stop":
+            self.respond({})
+            # shutdown() waits for serve_forever() to return, which is running this handler
+            threading.Thread(target=self.server.shutdown).start()
+        else:
+            self.respond({"error": f"Unknown command {command!r}"})
+
+    def respond(self, response: dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+def is_daemon_listening(socket_path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+
+    return True
+
+
+def preload_solutions(solutions: list[Solution]) -> None:
+    for solution in solutions:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                load_solution_module(solution)
+        except Exception as error:
+            print(f"Failed to preload {solution}: {error!r}", file=sys.stderr)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Keep an interpreter warm and solve days sent by `python -m aoc.client`"
+    )
+    parser.add_argument("-y", "--year", type=int, nargs="+", help="years to preload")
+    parser.add_argument("-d", "--day", type=int, nargs="+", help="days to preload")
+    parser.add_argument(
+        "--no-preload",
+        action="store_true",
+        help="don't import solutions (and their dependencies) before the first request",
+    )
+    parser.add_argument("--socket", type=Path, help="socket path to listen on")
+    args = parser.parse_args(argv)
+
+    socket_path: Path = args.socket or get_socket_path()
+    try:
+        daemon = SolveDaemon(socket_path)
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    with daemon:
+        if not args.no_preload:
+            preload_solutions(find_solutions(args.year, args.day))
+
+        print(f"Listening on {socket_path}")
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+# requests and dotenv are only needed when an input isn't cached yet, and take longer to
+# import than most solutions take to run, so they're imported on first use
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_BASE_URL = "https://adventofcode.com"
+USER_AGENT = "github.com/DarkAce65/advent-of-code"
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_session_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+
+def get_base_url() -> str:
+    return os.environ.get("AOC_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+
+
+@functools.lru_cache(maxsize=None)
+def get_session_token(env_path: Path) -> str:
+    session_token = os.environ.get("AOC_SESSION")
+    if session_token is None:
+        from dotenv import dotenv_values
+
+        session_token = dotenv_values(env_path).get("AOC_SESSION")
+    if session_token is None:
+        raise ValueError("Missing session token")
+
+    return session_token
+
+
+def get_http_session(pool_size: int = 10) -> requests.Session:
+    global _session
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            _session.headers["User-Agent"] = USER_AGENT
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+
+        return _session
+
+
+def fetch_input(
+    year: int,
+    day: int,
+    session_token: str,
+    session: Optional[requests.Session] = None,
+    base_url: Optional[str] = None,
+    retries: int = 3,
+    backoff: float = 0.5,
+) -> str:
+    import requests
+
+    session = session or get_http_session()
+    url = f"{base_url or get_base_url()}/{year}/day/{day}/input"
+
+    for attempt in range(retries + 1):
+        is_last_attempt = attempt == retries
+        try:
+            res = session.get(url, cookies={"session": session_token}, timeout=30)
+        except (requests.ConnectionError, requests.Timeout):
+            if is_last_attempt:
+                raise
+        else:
+            if res.status_code == 200:
+                return res.text
+            if res.status_code not in RETRY_STATUS_CODES or is_last_attempt:
+                raise ValueError(
+                    f"Failed to retrieve input for year {year}, day {day} (status code: {res.status_code})"
+                )
+
+        time.sleep(backoff * 2**attempt)
+
+    raise AssertionError("unreachable")
+
+
+def write_input_atomically(input_file_path: Path, text: str) -> None:
+    temp_path = input_file_path.with_name(f"{input_file_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temp_path, input_file_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from aoc.solutions import REPO_ROOT
+
+GENERATED_INPUTS_DIR = REPO_ROOT / ".aoc_cache" / "generated"
+
+
+class GeneratedInput(NamedTuple):
+    text: str
+    # Cells or graph nodes in the input, the quantity solvers are expected to scale with
+    size: int
+
+
+class InputGenerator(NamedTuple):
+    year: int
+    day: int
+    family: str
+    generate: Callable[[float, random.Random], GeneratedInput]
+
+
+def scale_side(side: int, scale: float, minimum: int) -> int:
+    """
+    Scales one side of a square-ish input so that its area is multiplied by `scale`.
+    """
+
+    return max(minimum, round(side * math.sqrt(scale)))
+
+
+def generate_digit_grid(side: int, scale: float, rng: random.Random) -> GeneratedInput:
+    """
+    Grid of digits 1-9, like cave risk levels (2021 day 15) or city block heat loss (2023
+    day 17). Any such grid is a valid input, since every cell can be entered.
+    """
+
+    scaled_side = scale_side(side, scale, 2)
+    lines = [
+        "".join(rng.choice("123456789") for _ in range(scaled_side))
+        for _ in range(scaled_side)
+    ]
+    return GeneratedInput("\n".join(lines) + "\n", scaled_side * scaled_side)
+
+
+def generate_blizzard_valley(scale: float, rng: random.Random) -> GeneratedInput:
+    """
+    Valley of blizzards (2022 day 24), walled in except for the entrance in the top-left
+    corner and the exit in the bottom-right one. Like real inputs, no blizzards move
+    vertically in the entrance and exit columns, so none can leave the valley.
+    """
+
+    width = scale_side(120, scale, 2)
+    height = scale_side(25, scale, 2)
+    density = 0.4
+
+    lines = ["#." + "#" * width]
+    for _ in range(height):
+        row = ""
+        for col in range(1, width + 1):
+            if rng.random() >= density:
+                row += "."
+            elif col == 1 or col == width:
+                row += rng.choice("<>")
+            else:
+                row += rng.choice("<>^v")
+        lines.append("#" + row + "#")
+    lines.append("#" * width + ".#")
+
+    return GeneratedInput("\n".join(lines) + "\n", width * height)
+
+
+def generate_hiking_trails(scale: float, rng: random.Random) -> GeneratedInput:
+    """
+    Hiking trails (2023 day 23) laid out as a lattice of junctions joined by corridors of
+    random lengths. Slopes around each junction point right or down, away from the start,
+    as they do in real inputs. Real inputs have a 6x6 lattice, and the node count is what
+    gets scaled.
+    """
+
+    junctions_per_side = max(2, round(6 * math.sqrt(scale)))
+    row_gaps = [rng.randint(3, 40) for _ in range(junctions_per_side - 1)]
+    col_gaps = [rng.randint(3, 40) for _ in range(junctions_per_side - 1)]
+    junction_rows = [1 + sum(row_gaps[:i]) for i in range(junctions_per_side)]
+    junction_cols = [1 + sum(col_gaps[:i]) for i in range(junctions_per_side)]
+
+    height = junction_rows[-1] + 2
+    width = junction_cols[-1] + 2
+    grid = [["#"] * width for _ in range(height)]
+    grid[0][1] = "."
+    grid[height - 1][width - 2] = "."
+
+    for row in junction_rows:
+        for left, right in zip(junction_cols, junction_cols[1:]):
+            for col in range(left, right + 1):
+                grid[row][col] = "."
+            grid[row][left + 1] = ">"
+            grid[row][right - 1] = ">"
+    for col in junction_cols:
+        for top, bottom in zip(junction_rows, junction_rows[1:]):
+            for row in range(top, bottom + 1):
+                grid[row][col] = "."
+            grid[top + 1][col] = "v"
+            grid[bottom - 1][col] = "v"
+
+    lines = ["".join(row) for row in grid]
+    return GeneratedInput("\n".join(lines) + "\n", junctions_per_side**2)
+
+
+GENERATORS: dict[tuple[int, int], InputGenerator] = {
+    (2021, 15): InputGenerator(
+        2021,
+        15,
+        "digit grid",
+        lambda scale, rng: generate_digit_grid(100, scale, rng),
+    ),
+    (2022, 24): InputGenerator(2022, 24, "blizzard valley", generate_blizzard_valley),
+    (2023, 17): InputGenerator(
+        2023,
+        17,
+        "digit grid",
+        lambda scale, rng: generate_digit_grid(141, scale, rng),
+    ),
+    (2023, 23): InputGenerator(2023, 23, "hiking trails", generate_hiking_trails),
+}
+
+
+def format_scale(scale: float) -> str:
+    return f"{scale:g}x"
+
+
+def write_generated_input(
+    generator: InputGenerator, scale: float, seed: int
+) -> tuple[Path, int]:
+    """
+    Writes a generated input under .aoc_cache/generated, returning its path and size.
+    Inputs only depend on the generator, scale and seed.
+    """
+
+    rng = random.Random(f"{generator.year}/{generator.day}/{scale}/{seed}")
+    generated = generator.generate(scale, rng)
+
+    input_path = (
+        GENERATED_INPUTS_DIR
+        / str(generator.year)
+        / f"day{generator.day}.{format_scale(scale)}.seed{seed}.txt"
+    )
+    input_path.parent.mkdir(parents=True, exist_ok=True)
+    input_path.write_text(generated.text, encoding="utf-8")
+
+    return (input_path, generated.size)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate seeded synthetic inputs for grid and graph puzzles"
+    )
+    parser.add_argument("-y", "--year", type=int, nargs="+", help="years to generate")
+    parser.add_argument("-d", "--day", type=int, nargs="+", help="days to generate")
+    parser.add_argument(
+        "-s",
+        "--scale",
+        type=float,
+        nargs="+",
+        default=[1, 10, 100],
+        help="input sizes relative to a real input (default: 1 10 100)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default: 0)")
+    args = parser.parse_args(argv)
+
+    generators = [
+        generator
+        for generator in GENERATORS.values()
+        if (not args.year or generator.year in args.year)
+        and (not args.day or generator.day in args.day)
+    ]
+    if len(generators) == 0:
+        print("No input generators found", file=sys.stderr)
+        return 1
+
+    for generator in generators:
+        for scale in args.scale:
+            input_path, size = write_generated_input(generator, scale, args.seed)
+            print(
+                f"{generator.year} day {generator.day} ({generator.family},"
+                f" {format_scale(scale)}, size {size:,}): {input_path}"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
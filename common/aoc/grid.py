@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable, Sequence, Union
+
+import numpy as np
+
+from aoc.inputs import ByteGrid
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+Direction = tuple[int, int]
+
+ORTHOGONAL_DIRECTIONS: tuple[Direction, ...] = ((-1, 0), (0, 1), (1, 0), (0, -1))
+DIAGONAL_DIRECTIONS: tuple[Direction, ...] = ((-1, 1), (1, 1), (1, -1), (-1, -1))
+ALL_DIRECTIONS: tuple[Direction, ...] = (
+    (-1, 0),
+    (-1, 1),
+    (0, 1),
+    (1, 1),
+    (1, 0),
+    (1, -1),
+    (0, -1),
+    (-1, -1),
+)
+
+
+def shift(
+    cells: npt.NDArray[Any], d_row: int, d_col: int, fill: Any = 0, wrap: bool = False
+) -> npt.NDArray[Any]:
+    """
+    Returns an array holding, for each cell, the value of the cell `d_row` rows and
+    `d_col` columns away from it. Cells whose neighbor falls outside the array get `fill`,
+    or the value from the opposite edge when `wrap` is set.
+    """
+
+    if wrap:
+        return np.roll(cells, (-d_row, -d_col), axis=(0, 1))
+
+    height, width = cells.shape
+    shifted = np.full_like(cells, fill)
+    if abs(d_row) >= height or abs(d_col) >= width:
+        return shifted
+
+    shifted[
+        max(0, -d_row) : height - max(0, d_row), max(0, -d_col) : width - max(0, d_col)
+    ] = cells[
+        max(0, d_row) : height - max(0, -d_row), max(0, d_col) : width - max(0, -d_col)
+    ]
+    return shifted
+
+
+def count_neighbors(
+    mask: npt.NDArray[np.bool_],
+    directions: Iterable[Direction] = ALL_DIRECTIONS,
+    wrap: bool = False,
+) -> npt.NDArray[np.int8]:
+    """
+    Counts, for each cell, how many of its neighbors in `directions` are set in `mask`.
+    """
+
+    counts = np.zeros(mask.shape, dtype=np.int8)
+    for d_row, d_col in directions:
+        counts += shift(mask, d_row, d_col, False, wrap)
+
+    return counts
+
+
+class Grid2D:
+    """
+    Rectangular grid backed by a two-dimensional NumPy array, so whole-grid operations
+    (comparing every cell to its neighbors, counting neighbors...) run as a handful of
+    vectorized operations instead of a Python loop over cells.
+    """
+
+    cells: npt.NDArray[Any]
+
+    def __init__(self, cells: npt.NDArray[Any]) -> None:
+        if cells.ndim != 2:
+            raise ValueError(f"Expected a two-dimensional array, got {cells.ndim}")
+
+        self.cells = cells
+
+    @staticmethod
+    def from_lines(lines: Sequence[str]) -> Grid2D:
+        """
+        Builds a grid of byte values, so cells compare against ord("#") or b"#"[0].
+        """
+
+        width = len(lines[0]) if len(lines) > 0 else 0
+        if any(len(line) != width for line in lines):
+            raise ValueError(f"Grid rows are not all {width} cells wide")
+
+        data = "".join(lines).encode("ascii")
+        return Grid2D(
+            np.frombuffer(data, dtype=np.uint8).reshape(len(lines), width).copy()
+        )
+
+    @staticmethod
+    def from_digits(lines: Sequence[str]) -> Grid2D:
+        return Grid2D((Grid2D.from_lines(lines).cells - ord("0")).astype(np.int8))
+
+    @staticmethod
+    def from_byte_grid(grid: ByteGrid) -> Grid2D:
+        """
+        Wraps a byte grid without copying it. The array is read-only, like the grid.
+        """
+
+        if grid.height == 0:
+            return Grid2D(np.zeros((0, 0), dtype=np.uint8))
+
+        buffer = np.frombuffer(grid.data, dtype=np.uint8)
+        cells = np.lib.stride_tricks.as_strided(
+            buffer,
+            shape=(grid.height, grid.width),
+            strides=(grid.stride, 1),
+            writeable=False,
+        )
+        return Grid2D(cells)
+
+    @property
+    def height(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.cells.shape[1]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.height, self.width)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.cells[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.cells[key] = value
+
+    def copy(self) -> Grid2D:
+        return Grid2D(self.cells.copy())
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def shifted(
+        self, d_row: int, d_col: int, fill: Any = 0, wrap: bool = False
+    ) -> npt.NDArray[Any]:
+        return shift(self.cells, d_row, d_col, fill, wrap)
+
+    def window(self, row: int, col: int, radius: int = 1) -> npt.NDArray[Any]:
+        """
+        View of the cells within `radius` rows and columns of a cell, clipped to the grid.
+        """
+
+        return self.cells[
+            max(0, row - radius) : row + radius + 1,
+            max(0, col - radius) : col + radius + 1,
+        ]
+
+    def padded(self, width: int, fill: Any = 0) -> Grid2D:
+        return Grid2D(np.pad(self.cells, width, constant_values=fill))
+
+    def positions_of(self, value: Union[int, np.integer[Any]]) -> list[tuple[int, int]]:
+        return [(int(row), int(col)) for row, col in np.argwhere(self.cells == value)]
+
+    def __str__(self) -> str:
+        if self.cells.dtype == np.uint8:
+            return "\n".join(row.tobytes().decode("ascii") for row in self.cells)
+
+        return "\n".join("".join(str(cell) for cell in row) for row in self.cells)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from aoc.benchmark import (
+    DEFAULT_HISTORY_PATH,
+    get_git_commit,
+    load_history,
+    save_history,
+)
+from aoc.runner import SHARED_MODULES, format_duration
+from aoc.solutions import Solution, find_solutions
+
+START_MARKER = "aoc.importtime: loading solution"
+COMMON_DIR = Path(__file__).resolve().parents[1]
+
+# Runs in a fresh interpreter, so that only the imports made by the solution itself are
+# reported after the marker. The runner's workers inherit the shared modules already
+# imported, so they're imported before it
+LOAD_SOLUTION_SCRIPT = f"""
+import importlib
+import sys
+from pathlib import Path
+
+from aoc.solutions import Solution, load_solution_module
+
+for module_name in {SHARED_MODULES!r}:
+    try:
+        importlib.import_module(module_name)
+    except ImportError:
+        pass
+
+solution = Solution(int(sys.argv[1]), int(sys.argv[2]), Path(sys.argv[3]))
+print({START_MARKER!r}, file=sys.stderr, flush=True)
+load_solution_module(solution)
+"""
+
+
+@dataclass
+class ImportTimes:
+    total: float
+    packages: dict[str, float] = field(default_factory=dict)
+
+    def heaviest(self, count: int) -> list[tuple[str, float]]:
+        return sorted(self.packages.items(), key=lambda item: -item[1])[:count]
+
+
+def parse_import_times(stderr: str) -> ImportTimes:
+    """
+    Parses `-X importtime` output following the start marker. The total is the
+    cumulative time of top-level imports, and each package is credited with the time
+    spent in its own modules (excluding what they import from other packages).
+    """
+
+    lines = stderr.splitlines()
+    if START_MARKER in lines:
+        lines = lines[lines.index(START_MARKER) + 1 :]
+
+    total = 0.0
+    packages: dict[str, float] = {}
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+
+        self_field, cumulative_field, name_field = line[len("import time:") :].split("|")
+        if not self_field.strip().isdigit():
+            continue
+
+        name = name_field.strip()
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_field) / 1e6
+        if len(name_field) - len(name_field.lstrip()) == 1:
+            total += int(cumulative_field) / 1e6
+
+    return ImportTimes(total, packages)
+
+
+def measure_import_times(solution: Solution) -> ImportTimes:
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            LOAD_SOLUTION_SCRIPT,
+            str(solution.year),
+            str(solution.day),
+            str(solution.path),
+        ],
+        cwd=COMMON_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip().splitlines()[-1])
+
+    return parse_import_times(process.stderr)
+
+
+def best_import_times(solution: Solution, runs: int) -> ImportTimes:
+    best: Optional[ImportTimes] = None
+    for _ in range(runs):
+        times = measure_import_times(solution)
+        if best is None or times.total < best.total:
+            best = times
+
+    assert best is not None
+    return best
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure how long each solution takes to import in a fresh interpreter"
+    )
+    parser.add_argument("-y", "--year", type=int, nargs="+", help="years to measure")
+    parser.add_argument("-d", "--day", type=int, nargs="+", help="days to measure")
+    parser.add_argument(
+        "-n", "--runs", type=int, default=3, help="imports per solution (default: 3)"
+    )
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=0.05,
+        help="import time in seconds a solution may take (default: 0.05)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=3, help="heaviest packages to list (default: 3)"
+    )
+    parser.add_argument(
+        "--history",
+        type=Path,
+        default=DEFAULT_HISTORY_PATH,
+        help=f"benchmark history file (default: {DEFAULT_HISTORY_PATH.name})",
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="don't record results in the history file"
+    )
+    args = parser.parse_args(argv)
+
+    solutions = find_solutions(args.year, args.day)
+    if len(solutions) == 0:
+        print("No solutions found", file=sys.stderr)
+        return 1
+
+    import_times: dict[str, ImportTimes] = {}
+    over_budget: list[Solution] = []
+    for solution in solutions:
+        key = f"{solution.year}/day{solution.day}"
+        try:
+            times = best_import_times(solution, max(1, args.runs))
+        except RuntimeError as error:
+            print(f"{key:<12}  failed: {error}")
+            over_budget.append(solution)
+            continue
+
+        import_times[key] = times
+        heaviest = ", ".join(
+            f"{package} {format_duration(package_time)}"
+            for package, package_time in times.heaviest(args.top)
+        )
+        flag = "  over budget" if times.total > args.budget else ""
+        print(f"{key:<12}  {format_duration(times.total):>9}  ({heaviest}){flag}")
+        if times.total > args.budget:
+            over_budget.append(solution)
+
+    print(
+        f"\n{len(over_budget)} of {len(solutions)} solutions over the import budget"
+        f" of {format_duration(args.budget)}"
+    )
+
+    if not args.no_save:
+        commit, dirty = get_git_commit()
+        history = load_history(args.history)
+        entry = history.pop(commit, {"commit": commit, "results": {}})
+        entry["timestamp"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        entry["dirty"] = dirty
+        entry.setdefault("imports", {}).update(
+            {key: asdict(times) for key, times in import_times.items()}
+        )
+        history[commit] = entry
+        save_history(args.history, history)
+
+    return 1 if len(over_budget) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import functools
+import mmap
+import os
+import pickle
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar, Union
+
+from aoc.fetch import fetch_input, get_session_token, write_input_atomically
+
+T = TypeVar("T")
+
+PARSE_CACHE_DIR_NAME = ".aoc_cache"
+
+
+def cache_input(file_path_str: str) -> Path:
+    file_path = Path(file_path_str)
+    if file_path.suffix != ".py":
+        return file_path
+
+    input_file_path = file_path.with_suffix(".input.txt")
+    if input_file_path.exists() and input_file_path.stat().st_size > 0:
+        return input_file_path
+
+    year = file_path.parent.stem
+    day = file_path.stem.removeprefix("day")
+    assert (
+        year.isnumeric() and day.isnumeric()
+    ), f'Failed to parse year "{year}" and day "{day}"'
+
+    session_token = get_session_token(file_path.parent.with_name(".env"))
+    write_input_atomically(
+        input_file_path, fetch_input(int(year), int(day), session_token)
+    )
+
+    return input_file_path
+
+
+def get_and_cache_input(file_path_str: str) -> list[str]:
+    with open(cache_input(file_path_str), "r", encoding="utf-8") as file:
+        return [line.rstrip() for line in file]
+
+
+def stream_input_lines(file_path_str: str) -> Iterator[str]:
+    with open(cache_input(file_path_str), "r", encoding="utf-8") as file:
+        for line in file:
+            yield line.rstrip()
+
+
+def map_input_bytes(file_path_str: str) -> memoryview:
+    with open(cache_input(file_path_str), "rb") as file:
+        return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def map_input_grid(file_path_str: str) -> ByteGrid:
+    return ByteGrid(map_input_bytes(file_path_str))
+
+
+class ByteGrid:
+    """
+    Read-only view of a rectangular grid input, indexed by (row, col) without building
+    strings for each row. Cells are byte values, so compare against ord("#") or b"#"[0].
+    """
+
+    data: memoryview
+    width: int
+    height: int
+    stride: int
+
+    def __init__(self, data: Union[bytes, memoryview]) -> None:
+        self.data = memoryview(data)
+
+        size = len(self.data)
+        while size > 0 and self.data[size - 1] in b"\r\n":
+            size -= 1
+
+        newline_index = 0
+        while newline_index < size and self.data[newline_index] != 10:
+            newline_index += 1
+
+        if newline_index == size:
+            self.width = size
+            self.stride = size + 1
+        else:
+            has_carriage_return = newline_index > 0 and self.data[newline_index - 1] == 13
+            self.width = newline_index - 1 if has_carriage_return else newline_index
+            self.stride = newline_index + 1
+        self.height = (size + self.stride - self.width) // self.stride if size > 0 else 0
+
+        for row in range(self.height - 1):
+            if self.data[row * self.stride + self.stride - 1] != 10:
+                raise ValueError(f"Row {row} of grid is not {self.width} cells wide")
+        if self.height > 0 and (self.height - 1) * self.stride + self.width != size:
+            raise ValueError(f"Last row of grid is not {self.width} cells wide")
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, position: tuple[int, int]) -> int:
+        row, col = position
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise IndexError(f"Position {position} is out of bounds")
+
+        return self.data[row * self.stride + col]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for row in range(self.height):
+            yield self.row(row)
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def get(self, row: int, col: int, default: int = -1) -> int:
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return default
+
+        return self.data[row * self.stride + col]
+
+    def row(self, row: int) -> memoryview:
+        start = row * self.stride
+        return self.data[start : start + self.width]
+
+    def positions_of(self, cell: int) -> Iterator[tuple[int, int]]:
+        for row in range(self.height):
+            start = row * self.stride
+            row_bytes = self.data[start : start + self.width].tobytes()
+            col = row_bytes.find(cell)
+            while col >= 0:
+                yield (row, col)
+                col = row_bytes.find(cell, col + 1)
+
+
+def hash_problem_input(problem_input: list[str]) -> str:
+    import hashlib
+
+    digest = hashlib.sha256()
+    for line in problem_input:
+        digest.update(line.encode("utf-8"))
+        digest.update(b"\n")
+
+    return digest.hexdigest()
+
+
+def is_parse_cache_enabled() -> bool:
+    return os.environ.get("AOC_PARSE_CACHE", "1") != "0"
+
+
+def cache_parsed_input(parse_input: Callable[[list[str]], T]) -> Callable[[list[str]], T]:
+    """
+    Caches the result of a parse function on disk, next to the solution defining it.
+
+    Entries are keyed by the input's hash and the hash of the whole source file of the
+    parser along with the `utils` and `aoc` modules it imports, since the parsed
+    structure usually depends on classes and helpers defined in them. Set
+    AOC_PARSE_CACHE=0 to bypass the cache.
+    """
+    # Read off the code object rather than through inspect, which is slow to import and
+    # this runs when solutions are imported
+    source_path = Path(parse_input.__code__.co_filename)
+    # Pickles reference classes by module name, which differs between running a day as a
+    # script (__main__) and loading it through the runner, so they're cached separately
+    cache_prefix = f"{source_path.stem}.{parse_input.__name__}.{parse_input.__module__}."
+
+    source_hash: Optional[str] = None
+
+    @functools.wraps(parse_input)
+    def cached_parse_input(problem_input: list[str]) -> T:
+        nonlocal source_hash
+        if not is_parse_cache_enabled():
+            return parse_input(problem_input)
+
+        import hashlib
+
+        if source_hash is None:
+            from aoc.answers import hash_local_sources
+
+            source_hash = hash_local_sources(source_path)
+
+        cache_key = hashlib.sha256(
+            f"{source_hash}:{hash_problem_input(problem_input)}".encode("utf-8")
+        ).hexdigest()[:32]
+        cache_dir = source_path.parent / PARSE_CACHE_DIR_NAME
+        cache_path = cache_dir / f"{cache_prefix}{cache_key}.pickle"
+
+        if cache_path.exists():
+            try:
+                with open(cache_path, "rb") as file:
+                    return pickle.load(file)
+            except Exception:
+                cache_path.unlink(missing_ok=True)
+
+        parsed = parse_input(problem_input)
+
+        temp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_dir.mkdir(exist_ok=True)
+            with open(temp_path, "wb") as file:
+                pickle.dump(parsed, file, protocol=pickle.HIGHEST_PROTOCOL)
+            temp_path.replace(cache_path)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            temp_path.unlink(missing_ok=True)
+            return parsed
+
+        for stale_path in cache_dir.glob(f"{cache_prefix}*.pickle"):
+            if stale_path != cache_path:
+                stale_path.unlink(missing_ok=True)
+
+        return parsed
+
+    return cached_parse_input
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import cProfile
+import pstats
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+FunctionKey = tuple[str, int, str]
+
+# Solutions can call count() and record_max() anywhere: both return immediately unless
+# counters were enabled by the runner, so uninstrumented runs only pay for the call
+_counters: Optional[Counter[str]] = None
+
+
+def enable_counters() -> None:
+    global _counters
+    _counters = Counter()
+
+
+def disable_counters() -> dict[str, int]:
+    global _counters
+    counters = dict(_counters) if _counters is not None else {}
+    _counters = None
+    return counters
+
+
+def counters_enabled() -> bool:
+    return _counters is not None
+
+
+def get_counters() -> dict[str, int]:
+    return dict(_counters) if _counters is not None else {}
+
+
+def count(name: str, amount: int = 1) -> None:
+    if _counters is not None:
+        _counters[name] += amount
+
+
+def record_max(name: str, value: int) -> None:
+    if _counters is not None and value > _counters[name]:
+        _counters[name] = value
+
+
+def measure_peak_memory(fn: Callable[..., T], *args: Any) -> tuple[T, int]:
+    tracemalloc.start()
+    try:
+        result = fn(*args)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return (result, peak_memory)
+
+
+def profile(fn: Callable[..., T], *args: Any) -> tuple[T, pstats.Stats]:
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args)
+    return (result, pstats.Stats(profiler))
+
+
+def format_function(function: FunctionKey) -> str:
+    filename, line, name = function
+    if filename == "~":
+        return name.replace(";", ",")
+
+    return f"{name} ({Path(filename).name}:{line})".replace(";", ",")
+
+
+def collapse_stacks(stats: pstats.Stats, min_fraction: float = 1e-4) -> list[str]:
+    """
+    Converts profiler stats to the collapsed-stack format read by flamegraph.pl and
+    speedscope. cProfile only records caller/callee pairs, so time spent in a function
+    is split between the stacks leading to it in proportion to the time each caller
+    spent calling it.
+    """
+
+    raw_stats: dict[FunctionKey, Any] = stats.stats  # type: ignore[attr-defined]
+
+    callees: dict[FunctionKey, dict[FunctionKey, float]] = {}
+    for function, (_, _, _, _, callers) in raw_stats.items():
+        for caller, (_, _, _, caller_cumulative_time) in callers.items():
+            callees.setdefault(caller, {})[function] = caller_cumulative_time
+
+    roots = [function for function, entry in raw_stats.items() if len(entry[4]) == 0]
+    total_time = sum(raw_stats[root][3] for root in roots)
+    min_time = total_time * min_fraction
+
+    samples: Counter[str] = Counter()
+
+    def visit(function: FunctionKey, time_in_stack: float, stack: list[str]) -> None:
+        _, _, total, cumulative, _ = raw_stats[function]
+        if cumulative <= 0 or time_in_stack < min_time:
+            return
+
+        stack.append(format_function(function))
+        share = min(1.0, time_in_stack / cumulative)
+        self_time = total * share
+        if self_time > 0:
+            samples[";".join(stack)] += round(self_time * 1e6)
+
+        for callee, edge_time in callees.get(function, {}).items():
+            if callee == function or format_function(callee) in stack:
+                continue
+            visit(callee, edge_time * share, stack)
+        stack.pop()
+
+    for root in roots:
+        visit(root, raw_stats[root][3], [])
+
+    return [f"{stack} {micros}" for stack, micros in samples.items() if micros > 0]
+
+
+def write_profile(stats: pstats.Stats, output_path: Path) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    stats.dump_stats(output_path.with_suffix(".pstats"))
+    with open(output_path.with_suffix(".collapsed"), "w", encoding="utf-8") as file:
+        for line in collapse_stacks(stats):
+            file.write(line + "\n")
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Sequence
+
+# A half-open range of ints, [start, stop), like `range`
+Interval = tuple[int, int]
+
+
+class IntervalSet:
+    """
+    A set of ints stored as sorted, disjoint and non-adjacent intervals, so lookups are a
+    bisection and set operations are a single pass over both sets.
+    """
+
+    starts: list[int]
+    stops: list[int]
+
+    def __init__(self, intervals: Iterable[Interval] = ()) -> None:
+        self.starts = []
+        self.stops = []
+        self._extend_sorted(sorted(intervals))
+
+    @classmethod
+    def _from_sorted(cls, intervals: Iterable[Interval]) -> IntervalSet:
+        interval_set = cls()
+        interval_set._extend_sorted(intervals)
+        return interval_set
+
+    def _extend_sorted(self, intervals: Iterable[Interval]) -> None:
+        starts, stops = self.starts, self.stops
+        for start, stop in intervals:
+            if start >= stop:
+                continue
+            if len(stops) > 0 and start <= stops[-1]:
+                if stop > stops[-1]:
+                    stops[-1] = stop
+            else:
+                starts.append(start)
+                stops.append(stop)
+
+    def __iter__(self) -> Iterator[Interval]:
+        return zip(self.starts, self.stops)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __bool__(self) -> bool:
+        return len(self.starts) > 0
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self.starts == other.starts and self.stops == other.stops
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+    def __contains__(self, value: int) -> bool:
+        return self.find(value) is not None
+
+    def find(self, value: int) -> Optional[Interval]:
+        """
+        The interval containing `value`, if any.
+        """
+
+        index = bisect_right(self.starts, value) - 1
+        if index >= 0 and value < self.stops[index]:
+            return (self.starts[index], self.stops[index])
+
+        return None
+
+    def size(self) -> int:
+        return sum(self.stops) - sum(self.starts)
+
+    def add(self, interval: Interval) -> None:
+        """
+        Adds an interval in place, merging it with the intervals it overlaps or touches.
+        """
+
+        start, stop = interval
+        if start >= stop:
+            return
+
+        # Intervals from `first` to `last` (exclusive) overlap or touch the new one
+        first = bisect_left(self.stops, start)
+        last = bisect_right(self.starts, stop)
+        if first < last:
+            start = min(start, self.starts[first])
+            stop = max(stop, self.stops[last - 1])
+
+        self.starts[first:last] = [start]
+        self.stops[first:last] = [stop]
+
+    def union(self, other: IntervalSet) -> IntervalSet:
+        return IntervalSet._from_sorted(heapq.merge(self, other))
+
+    def intersection(self, other: IntervalSet) -> IntervalSet:
+        intervals: list[Interval] = []
+        index, other_index = 0, 0
+        while index < len(self) and other_index < len(other):
+            start = max(self.starts[index], other.starts[other_index])
+            stop = min(self.stops[index], other.stops[other_index])
+            if start < stop:
+                intervals.append((start, stop))
+
+            if self.stops[index] < other.stops[other_index]:
+                index += 1
+            else:
+                other_index += 1
+
+        return IntervalSet._from_sorted(intervals)
+
+    def difference(self, other: IntervalSet) -> IntervalSet:
+        intervals: list[Interval] = []
+        other_index = 0
+        for start, stop in self:
+            while other_index < len(other) and other.stops[other_index] <= start:
+                other_index += 1
+
+            # Cut every interval of `other` overlapping this one out of it
+            index = other_index
+            while index < len(other) and other.starts[index] < stop:
+                if start < other.starts[index]:
+                    intervals.append((start, other.starts[index]))
+                start = max(start, other.stops[index])
+                index += 1
+            if start < stop:
+                intervals.append((start, stop))
+
+        return IntervalSet._from_sorted(intervals)
+
+    def complement(self, bounds: Interval) -> IntervalSet:
+        return IntervalSet([bounds]).difference(self)
+
+    def shift(self, offset: int) -> IntervalSet:
+        return IntervalSet._from_sorted(
+            (start + offset, stop + offset) for start, stop in self
+        )
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+
+
+class IntervalMap:
+    """
+    Remaps ints by shifting those in each of a set of disjoint source intervals by that
+    interval's offset, leaving every other int as it is.
+    """
+
+    starts: list[int]
+    stops: list[int]
+    offsets: list[int]
+
+    def __init__(self, pieces: Iterable[tuple[Interval, int]]) -> None:
+        self.starts, self.stops, self.offsets = [], [], []
+        for (start, stop), offset in sorted(pieces):
+            if len(self.stops) > 0 and start < self.stops[-1]:
+                raise ValueError(f"Overlapping source interval {(start, stop)}")
+            self.starts.append(start)
+            self.stops.append(stop)
+            self.offsets.append(offset)
+
+    def __call__(self, value: int) -> int:
+        index = bisect_right(self.starts, value) - 1
+        if index >= 0 and value < self.stops[index]:
+            return value + self.offsets[index]
+
+        return value
+
+    def map_intervals(self, intervals: IntervalSet) -> IntervalSet:
+        """
+        The image of every int in `intervals`, splitting them wherever they cross the edge
+        of a source interval.
+        """
+
+        mapped: list[Interval] = []
+        for start, stop in intervals:
+            index = max(0, bisect_right(self.starts, start) - 1)
+            while start < stop:
+                if index == len(self.starts) or start < self.starts[index]:
+                    # Unmapped up to the next source interval
+                    end = (
+                        stop
+                        if index == len(self.starts)
+                        else min(stop, self.starts[index])
+                    )
+                    mapped.append((start, end))
+                elif start < self.stops[index]:
+                    end = min(stop, self.stops[index])
+                    offset = self.offsets[index]
+                    mapped.append((start + offset, end + offset))
+                    index += 1
+                else:
+                    index += 1
+                    continue
+                start = end
+
+        return IntervalSet(mapped)
+
+
+@dataclass(frozen=True)
+class Box:
+    """
+    An axis-aligned box of int points, with a half-open interval along each axis.
+    """
+
+    bounds: tuple[Interval, ...]
+
+    @classmethod
+    def from_inclusive(cls, *bounds: tuple[int, int]) -> Box:
+        return cls(tuple((low, high + 1) for low, high in bounds))
+
+    def is_empty(self) -> bool:
+        return any(start >= stop for start, stop in self.bounds)
+
+    def volume(self) -> int:
+        volume = 1
+        for start, stop in self.bounds:
+            volume *= max(0, stop - start)
+
+        return volume
+
+    def __contains__(self, point: Sequence[int]) -> bool:
+        return all(
+            start <= value < stop for value, (start, stop) in zip(point, self.bounds)
+        )
+
+    def intersection(self, other: Box) -> Optional[Box]:
+        bounds = tuple(
+            (max(start, other_start), min(stop, other_stop))
+            for (start, stop), (other_start, other_stop) in zip(self.bounds, other.bounds)
+        )
+        if any(start >= stop for start, stop in bounds):
+            return None
+
+        return Box(bounds)
+
+    def split(self, axis: int, value: int) -> tuple[Optional[Box], Optional[Box]]:
+        """
+        The parts of the box below `value` and at or above it along `axis`.
+        """
+
+        start, stop = self.bounds[axis]
+        low, high = None, None
+        if start < value:
+            low = self._with_bounds(axis, (start, min(stop, value)))
+        if value < stop:
+            high = self._with_bounds(axis, (max(start, value), stop))
+
+        return (low, high)
+
+    def subtract(self, other: Box) -> list[Box]:
+        """
+        Disjoint boxes covering what's left of this box without `other`: at most two per
+        axis, peeled off one axis at a time.
+        """
+
+        if self.intersection(other) is None:
+            return [self]
+
+        pieces: list[Box] = []
+        remainder: Optional[Box] = self
+        for axis, (other_start, other_stop) in enumerate(other.bounds):
+            assert remainder is not None
+            below, remainder = remainder.split(axis, other_start)
+            if below is not None:
+                pieces.append(below)
+            assert remainder is not None
+            remainder, above = remainder.split(axis, other_stop)
+            if above is not None:
+                pieces.append(above)
+
+        return pieces
+
+    def _with_bounds(self, axis: int, interval: Interval) -> Box:
+        return Box(self.bounds[:axis] + (interval,) + self.bounds[axis + 1 :])
+
+    __and__ = intersection
+    __sub__ = subtract
+
+
+class BoxSet:
+    """
+    A union of boxes, stored as disjoint boxes so its volume is their total volume.
+    """
+
+    boxes: list[Box]
+
+    def __init__(self, boxes: Iterable[Box] = ()) -> None:
+        self.boxes = []
+        for box in boxes:
+            self.add(box)
+
+    def __iter__(self) -> Iterator[Box]:
+        return iter(self.boxes)
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def add(self, box: Box) -> None:
+        self.remove(box)
+        if not box.is_empty():
+            self.boxes.append(box)
+
+    def remove(self, box: Box) -> None:
+        self.boxes = [
+            piece for existing in self.boxes for piece in existing.subtract(box)
+        ]
+
+    def intersection(self, box: Box) -> BoxSet:
+        intersected = BoxSet()
+        for existing in self.boxes:
+            piece = existing.intersection(box)
+            if piece is not None:
+                intersected.boxes.append(piece)
+
+        return intersected
+
+    def volume(self) -> int:
+        return sum(box.volume() for box in self.boxes)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import functools
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Callable, Generic, Hashable, Iterator, Optional, TypeVar
+
+from aoc import instrument
+
+R = TypeVar("R")
+
+# Every memoized function still alive, so a solve can clear them all when it's done
+_memoized: weakref.WeakSet[MemoizedFunction[Any]] = weakref.WeakSet()
+
+
+class MemoizedFunction(Generic[R]):
+    """
+    A function whose results are cached by a key built from its arguments. With a
+    `maxsize`, the least recently used result is evicted once the cache is full.
+    """
+
+    name: str
+    maxsize: Optional[int]
+    hits: int
+    misses: int
+    evictions: int
+
+    _fn: Callable[..., R]
+    _key: Optional[Callable[..., Hashable]]
+    _cache: OrderedDict[Hashable, R]
+
+    def __init__(
+        self,
+        fn: Callable[..., R],
+        maxsize: Optional[int] = None,
+        key: Optional[Callable[..., Hashable]] = None,
+        name: Optional[str] = None,
+    ) -> None:
+        functools.update_wrapper(self, fn)
+        self.name = name or fn.__qualname__
+        self.maxsize = maxsize
+        self._fn = fn
+        self._key = key
+        self._cache = OrderedDict()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        _memoized.add(self)
+
+    def __call__(self, *args: Any) -> R:
+        key = args if self._key is None else self._key(*args)
+        cache = self._cache
+        if key in cache:
+            self.hits += 1
+            if self.maxsize is not None:
+                cache.move_to_end(key)
+            return cache[key]
+
+        self.misses += 1
+        value = self._fn(*args)
+        cache[key] = value
+        if self.maxsize is not None and len(cache) > self.maxsize:
+            cache.popitem(last=False)
+            self.evictions += 1
+
+        return value
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def cache_clear(self) -> None:
+        """
+        Empties the cache, reporting what it did since it was last cleared to the
+        instrument counters.
+        """
+
+        if self.hits + self.misses > 0:
+            instrument.count(f"{self.name} cache hits", self.hits)
+            instrument.count(f"{self.name} cache misses", self.misses)
+            instrument.count(f"{self.name} cache evictions", self.evictions)
+            instrument.record_max(f"{self.name} cache size", len(self._cache))
+
+        self._cache.clear()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+
+def memoize(
+    maxsize: Optional[int] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+    name: Optional[str] = None,
+) -> Callable[[Callable[..., R]], MemoizedFunction[R]]:
+    """
+    Caches a function's results for the rest of the current solve. `key` turns the
+    arguments into the cache key (the argument tuple by default), e.g. to pack them into
+    an int or to leave out arguments that don't change during a solve.
+    """
+
+    def decorator(fn: Callable[..., R]) -> MemoizedFunction[R]:
+        return MemoizedFunction(fn, maxsize, key, name)
+
+    return decorator
+
+
+def clear_caches() -> None:
+    for memoized in list(_memoized):
+        memoized.cache_clear()
+
+
+def clear_module_caches(module: ModuleType) -> None:
+    """
+    Empties the caches of a module's `functools` and memoized functions, for reusing an
+    imported solution on another input.
+    """
+
+    for value in list(vars(module).values()):
+        cache_clear = getattr(value, "cache_clear", None)
+        if callable(cache_clear):
+            cache_clear()
+
+
+@contextmanager
+def scope() -> Iterator[None]:
+    """
+    Runs a solve with every memoized function's cache empty, and empties them again
+    afterwards so nothing is kept alive (or reused for a different input) between solves.
+    """
+
+    clear_caches()
+    try:
+        yield
+    finally:
+        clear_caches()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+from array import array
+from typing import TYPE_CHECKING, Iterable, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SIGNED_INT_PATTERN = re.compile(rb"-?[0-9]+")
+
+# Byte tables blanking out everything but digits (and minus signs), so that an input's
+# ints are the words left over
+_KEEP_SIGNED_INTS = bytes(c if chr(c) in "-0123456789" else 32 for c in range(256))
+_KEEP_UNSIGNED_INTS = bytes(c if chr(c) in "0123456789" else 32 for c in range(256))
+
+Text = Union[str, Iterable[str]]
+
+
+def _parse_ints(text: Text, signed: bool) -> list[int]:
+    data = (text if isinstance(text, str) else "\n".join(text)).encode()
+    if not signed:
+        return list(map(int, data.translate(_KEEP_UNSIGNED_INTS).split()))
+
+    try:
+        return list(map(int, data.translate(_KEEP_SIGNED_INTS).split()))
+    except ValueError:
+        # Some `-` isn't a sign (as in `2-4` or `a - b`), so leave it to a regex
+        return list(map(int, SIGNED_INT_PATTERN.findall(data)))
+
+
+def extract_ints(text: Text, signed: bool = True) -> array[int]:
+    """
+    Every int in a whole input, found in a single pass over its bytes. With `signed`, a
+    `-` right before a number is its sign; without it, it's just a separator.
+    """
+
+    return array("q", _parse_ints(text, signed))
+
+
+def extract_int_records(
+    text: Text, record_size: int, signed: bool = True
+) -> list[tuple[int, ...]]:
+    """
+    Every int in a whole input, grouped into records of `record_size` ints in order, for
+    inputs with the same number of ints on every line (or in every section).
+    """
+
+    values = _parse_ints(text, signed)
+    if len(values) % record_size != 0:
+        raise ValueError(
+            f"Found {len(values)} ints, which don't split into records of {record_size}"
+        )
+
+    return list(zip(*[iter(values)] * record_size))
+
+
+def extract_int_array(
+    text: Text, record_size: int | None = None, signed: bool = True
+) -> np.ndarray:
+    """
+    Every int in a whole input as a NumPy array, with a row per record of `record_size`
+    ints if given.
+    """
+
+    import numpy as np
+
+    values = np.array(_parse_ints(text, signed), dtype=np.int64)
+    if record_size is None:
+        return values
+    if len(values) % record_size != 0:
+        raise ValueError(
+            f"Found {len(values)} ints, which don't split into records of {record_size}"
+        )
+
+    return values.reshape(-1, record_size)
+
+
+def parse_digit_grid(lines: Iterable[str]) -> np.ndarray:
+    """
+    A grid of single digits as a 2D array of their values.
+    """
+
+    import numpy as np
+
+    rows = [line for line in lines if line]
+    if len(rows) == 0:
+        return np.zeros((0, 0), dtype=np.uint8)
+
+    digits = np.frombuffer("".join(rows).encode("ascii"), dtype=np.uint8) - ord("0")
+    if len(digits) % len(rows) != 0:
+        raise ValueError("Rows of the digit grid aren't all the same length")
+
+    return digits.reshape(len(rows), -1)
+
+
+def split_sections(lines: Iterable[str]) -> list[list[str]]:
+    """
+    Splits an input into its sections of lines, separated by blank lines.
+    """
+
+    sections: list[list[str]] = [[]]
+    for line in lines:
+        if line:
+            sections[-1].append(line)
+        elif len(sections[-1]) > 0:
+            sections.append([])
+
+    if len(sections[-1]) == 0:
+        sections.pop()
+
+    return sections
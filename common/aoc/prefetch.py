@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional
+
+from aoc.fetch import (
+    fetch_input,
+    get_base_url,
+    get_http_session,
+    get_session_token,
+    write_input_atomically,
+)
+from aoc.solutions import REPO_ROOT, Solution, find_solutions
+
+
+def prefetch_input(
+    solution: Solution,
+    session_token: str,
+    base_url: str,
+    retries: int,
+    backoff: float,
+) -> None:
+    problem_input = fetch_input(
+        solution.year,
+        solution.day,
+        session_token,
+        base_url=base_url,
+        retries=retries,
+        backoff=backoff,
+    )
+    write_input_atomically(solution.input_path, problem_input)
+
+
+def prefetch_inputs(
+    solutions: list[Solution],
+    session_token: str,
+    base_url: Optional[str] = None,
+    concurrency: int = 4,
+    retries: int = 3,
+    backoff: float = 0.5,
+) -> dict[Solution, Optional[BaseException]]:
+    missing = [
+        solution
+        for solution in solutions
+        if not solution.input_path.exists() or solution.input_path.stat().st_size == 0
+    ]
+
+    # Every request goes through one pooled session, so connections (and TLS handshakes)
+    # are reused across days
+    get_http_session(pool_size=concurrency)
+    errors: dict[Solution, Optional[BaseException]] = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(
+                prefetch_input,
+                solution,
+                session_token,
+                base_url or get_base_url(),
+                retries,
+                backoff,
+            ): solution
+            for solution in missing
+        }
+        for future in as_completed(futures):
+            errors[futures[future]] = future.exception()
+
+    return errors
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Fetch and cache every missing puzzle input concurrently"
+    )
+    parser.add_argument("-y", "--year", type=int, nargs="+", help="years to fetch")
+    parser.add_argument("-d", "--day", type=int, nargs="+", help="days to fetch")
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        default=4,
+        help="maximum number of concurrent requests (default: 4)",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="retries for failed requests, with exponential backoff (default: 3)",
+    )
+    parser.add_argument(
+        "--backoff",
+        type=float,
+        default=0.5,
+        help="seconds to wait before the first retry (default: 0.5)",
+    )
+    parser.add_argument(
+        "--base-url", help="server to fetch inputs from (default: $AOC_BASE_URL or AoC)"
+    )
+    args = parser.parse_args(argv)
+
+    solutions = find_solutions(args.year, args.day)
+    session_token = get_session_token(REPO_ROOT / ".env")
+
+    start = time.perf_counter()
+    errors = prefetch_inputs(
+        solutions,
+        session_token,
+        args.base_url,
+        max(1, args.concurrency),
+        args.retries,
+        args.backoff,
+    )
+    for solution in sorted(errors):
+        error = errors[solution]
+        print(f"{solution}: {'fetched' if error is None else f'failed ({error})'}")
+    print(
+        f"Fetched {sum(1 for error in errors.values() if error is None)}"
+        f" of {len(errors)} missing inputs in {time.perf_counter() - start:.2f} s"
+    )
+
+    return 0 if all(error is None for error in errors.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,603 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import io
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from aoc import instrument, memo, telemetry
+from aoc.answers import AnswerStore
+from aoc.solutions import (
+    PARTS,
+    Solution,
+    find_solutions,
+    get_part,
+    load_solution_module,
+    parse_problem_input,
+    read_problem_input,
+)
+
+# Heavy dependencies shared by many solutions. Forked workers inherit them from the
+# runner instead of each importing them again
+SHARED_MODULES = ("numpy",)
+
+# Statuses of parts stopped for running longer or using more memory than allowed
+OVER_BUDGET_STATUSES = ("timeout", "out of memory")
+
+
+@dataclass
+class PartResult:
+    year: int
+    day: int
+    part: str
+    status: str
+    answer: Optional[str] = None
+    parse_time: float = 0
+    solve_times: list[float] = field(default_factory=list)
+    peak_memory: Optional[int] = None
+    counters: dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+    cached: bool = False
+    # What the part was doing when it failed, if it was sending telemetry
+    last_snapshot: Optional[dict[str, Any]] = None
+    # Every run's parse time, of which `parse_time` is the fastest
+    parse_times: list[float] = field(default_factory=list)
+
+    @property
+    def solve_time(self) -> float:
+        return min(self.solve_times) if len(self.solve_times) > 0 else 0
+
+    @property
+    def over_budget(self) -> bool:
+        return self.status in OVER_BUDGET_STATUSES
+
+
+@dataclass
+class RunOptions:
+    timeout: Optional[float] = None
+    show_output: bool = False
+    repeat: int = 1
+    trace_memory: bool = False
+    counters: bool = False
+    profile_dir: Optional[Path] = None
+    input_path: Optional[Path] = None
+    telemetry: bool = False
+    # Whether telemetry snapshots include the instrument counters, which slow solves down
+    telemetry_counters: bool = False
+    memory_limit: Optional[int] = None
+
+
+@dataclass
+class RunningTask:
+    solution: Solution
+    part: str
+    process: BaseProcess
+    connection: Connection
+    deadline: Optional[float]
+    last_snapshot: Optional[telemetry.Event] = None
+
+
+def solve_part(solution: Solution, part: str, options: RunOptions) -> PartResult:
+    module = load_solution_module(solution)
+    part_fn = get_part(module, part)
+    if part_fn is None:
+        return PartResult(solution.year, solution.day, part, "missing")
+
+    problem_input = read_problem_input(module, solution, options.input_path)
+
+    # Parts are free to mutate their arguments, so every iteration parses the input again
+    parse_times: list[float] = []
+    solve_times: list[float] = []
+    answer = None
+    counters: dict[str, int] = {}
+    for _ in range(options.repeat):
+        parse_start = time.perf_counter()
+        part_args = parse_problem_input(module, problem_input)
+        parse_times.append(time.perf_counter() - parse_start)
+
+        if options.counters or options.telemetry_counters:
+            instrument.enable_counters()
+        with memo.scope():
+            solve_start = time.perf_counter()
+            answer = part_fn(*part_args)
+            solve_times.append(time.perf_counter() - solve_start)
+        telemetry.flush()
+        counters = instrument.disable_counters()
+
+    # Memory tracing and profiling slow solutions down, so they get runs of their own
+    peak_memory = None
+    if options.trace_memory:
+        part_args = parse_problem_input(module, problem_input)
+        with memo.scope():
+            _, peak_memory = instrument.measure_peak_memory(part_fn, *part_args)
+
+    if options.profile_dir is not None:
+        part_args = parse_problem_input(module, problem_input)
+        with memo.scope():
+            _, stats = instrument.profile(part_fn, *part_args)
+        instrument.write_profile(
+            stats, options.profile_dir / f"{solution.year}-day{solution.day}-part_{part}"
+        )
+
+    return PartResult(
+        solution.year,
+        solution.day,
+        part,
+        "ok",
+        str(answer),
+        min(parse_times),
+        solve_times,
+        peak_memory,
+        counters if options.counters else {},
+        parse_times=parse_times,
+    )
+
+
+def get_address_space_size() -> int:
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as file:
+            num_pages = int(file.read().split()[0])
+    except OSError:
+        return 0
+
+    return num_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def limit_memory(budget: int) -> None:
+    """
+    Caps the worker's address space at its current size plus `budget` bytes, so a part
+    allocating more than its budget gets a MemoryError. (Linux doesn't enforce limits on
+    resident memory itself.)
+    """
+
+    import resource
+
+    limit = get_address_space_size() + budget
+    _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+    if hard_limit != resource.RLIM_INFINITY:
+        limit = min(limit, hard_limit)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard_limit))
+
+
+def run_part_in_worker(
+    solution: Solution, part: str, connection: Connection, options: RunOptions
+) -> None:
+    # Telemetry events go to the runner over the same pipe as the result, ahead of it
+    if options.telemetry:
+        telemetry.start(telemetry.CallbackSink(connection.send))
+    try:
+        if options.memory_limit is not None:
+            limit_memory(options.memory_limit)
+        if options.show_output:
+            result = solve_part(solution, part, options)
+        else:
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = solve_part(solution, part, options)
+    except MemoryError:
+        result = PartResult(
+            solution.year,
+            solution.day,
+            part,
+            "out of memory",
+            error=traceback.format_exc(limit=-3),
+        )
+    except BaseException:
+        result = PartResult(
+            solution.year,
+            solution.day,
+            part,
+            "error",
+            error=traceback.format_exc(limit=-3),
+        )
+    telemetry.stop()
+
+    connection.send(result)
+    connection.close()
+
+
+def start_task(solution: Solution, part: str, options: RunOptions) -> RunningTask:
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=run_part_in_worker,
+        args=(solution, part, sender, options),
+        daemon=True,
+    )
+    process.start()
+    sender.close()
+
+    deadline = None
+    if options.timeout is not None:
+        deadline = time.monotonic() + options.timeout
+    return RunningTask(solution, part, process, receiver, deadline)
+
+
+def receive_from_task(
+    task: RunningTask, telemetry_sink: Optional[telemetry.Sink] = None
+) -> Optional[PartResult]:
+    """
+    The task's result once it's done. Until then, workers send telemetry events, which
+    are passed on to `telemetry_sink` labelled with the part they're about.
+    """
+
+    try:
+        message = task.connection.recv()
+    except EOFError:
+        message = PartResult(
+            task.solution.year,
+            task.solution.day,
+            task.part,
+            "error",
+            error=f"Worker exited with code {task.process.exitcode}",
+        )
+
+    if not isinstance(message, PartResult):
+        if message["type"] == "snapshot":
+            task.last_snapshot = message
+        if telemetry_sink is not None:
+            telemetry_sink.emit(
+                {**message, "source": f"{task.solution} part {task.part}"}
+            )
+        return None
+
+    task.connection.close()
+    task.process.join()
+    # Only parts stopped for their budget are reported with where they were
+    if message.over_budget:
+        message.last_snapshot = task.last_snapshot
+    return message
+
+
+def cancel_task(task: RunningTask) -> PartResult:
+    task.process.kill()
+    task.process.join()
+    task.connection.close()
+    return PartResult(
+        task.solution.year,
+        task.solution.day,
+        task.part,
+        "timeout",
+        last_snapshot=task.last_snapshot,
+    )
+
+
+def run_solutions(
+    solutions: Iterable[Solution], workers: int, options: RunOptions
+) -> list[PartResult]:
+    return run_parts(
+        [(solution, part) for solution in solutions for part in PARTS], workers, options
+    )
+
+
+def preload_shared_modules() -> None:
+    if multiprocessing.get_start_method() != "fork":
+        return
+
+    for module_name in SHARED_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+
+
+def run_parts(
+    parts: Iterable[tuple[Solution, str]],
+    workers: int,
+    options: RunOptions,
+    telemetry_sink: Optional[telemetry.Sink] = None,
+) -> list[PartResult]:
+    preload_shared_modules()
+
+    pending = list(parts)
+    pending.reverse()
+
+    running: list[RunningTask] = []
+    results: list[PartResult] = []
+    while len(pending) > 0 or len(running) > 0:
+        while len(pending) > 0 and len(running) < workers:
+            solution, part = pending.pop()
+            running.append(start_task(solution, part, options))
+
+        now = time.monotonic()
+        deadlines = [task.deadline for task in running if task.deadline is not None]
+        wait_time = max(0, min(deadlines) - now) if len(deadlines) > 0 else None
+        ready = wait([task.connection for task in running], wait_time)
+
+        still_running: list[RunningTask] = []
+        for task in running:
+            result = None
+            if task.connection in ready:
+                result = receive_from_task(task, telemetry_sink)
+
+            if result is not None:
+                results.append(result)
+            elif task.deadline is not None and time.monotonic() >= task.deadline:
+                results.append(cancel_task(task))
+            else:
+                still_running.append(task)
+        running = still_running
+
+    return sorted(
+        (result for result in results if result.status != "missing"),
+        key=lambda result: (result.year, result.day, PARTS.index(result.part)),
+    )
+
+
+def format_duration(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.0f} µs"
+
+
+def format_memory(num_bytes: Optional[int]) -> str:
+    if num_bytes is None:
+        return "-"
+    if num_bytes >= 1 << 20:
+        return f"{num_bytes / (1 << 20):.1f} MiB"
+    return f"{num_bytes / (1 << 10):.1f} KiB"
+
+
+def format_results_table(results: list[PartResult]) -> str:
+    show_memory = any(result.peak_memory is not None for result in results)
+    header: tuple[str, ...] = ("Year", "Day", "Part", "Answer", "Parse", "Solve")
+    if show_memory:
+        header += ("Memory",)
+    header += ("Status",)
+
+    rows: list[tuple[str, ...]] = []
+    for result in results:
+        answer = result.answer or ""
+        if "\n" in answer:
+            answer = "(multi-line)"
+        row: tuple[str, ...] = (
+            str(result.year),
+            str(result.day),
+            result.part,
+            answer,
+            format_duration(result.parse_time) if result.status == "ok" else "-",
+            format_duration(result.solve_time) if result.status == "ok" else "-",
+        )
+        if show_memory:
+            row += (format_memory(result.peak_memory),)
+        rows.append(row + ("cached" if result.cached else result.status,))
+
+    widths = [max(len(row[i]) for row in [header, *rows]) for i in range(len(header))]
+    right_aligned = {1, 4, 5, 6} if show_memory else {1, 4, 5}
+
+    lines = []
+    for row in [header, *rows]:
+        lines.append(
+            "  ".join(
+                cell.rjust(widths[i]) if i in right_aligned else cell.ljust(widths[i])
+                for i, cell in enumerate(row)
+            ).rstrip()
+        )
+    lines.insert(1, "  ".join("-" * width for width in widths))
+
+    return "\n".join(lines)
+
+
+def print_results(results: list[PartResult], wall_time: float) -> None:
+    print(format_results_table(results))
+
+    for result in results:
+        if result.answer is not None and "\n" in result.answer:
+            print(f"\n{result.year} day {result.day} part {result.part}:")
+            print(result.answer)
+        if result.error is not None:
+            print(f"\n{result.year} day {result.day} part {result.part} failed:")
+            print(result.error.rstrip())
+        if len(result.counters) > 0:
+            print(f"\n{result.year} day {result.day} part {result.part} counters:")
+            for name, value in sorted(result.counters.items()):
+                print(f"  {name}: {value:,}")
+        if result.last_snapshot is not None:
+            print(
+                f"\n{result.year} day {result.day} part {result.part} ({result.status}),"
+                f" last seen after {format_duration(result.last_snapshot['time'])}:"
+            )
+            print(
+                f"  {telemetry.format_snapshot(result.last_snapshot) or '(no telemetry)'}"
+            )
+
+    solved = [result for result in results if not result.cached]
+    total_solve_time = sum(result.parse_time + result.solve_time for result in solved)
+    cached_count = len(results) - len(solved)
+    print(
+        f"\n{len(results)} parts in {format_duration(wall_time)}"
+        f" (total solve time {format_duration(total_solve_time)}"
+        + (f", {cached_count} cached" if cached_count > 0 else "")
+        + ")"
+    )
+
+
+def get_stored_result(
+    store: AnswerStore, solution: Solution, part: str
+) -> Optional[PartResult]:
+    stored = store.get(solution, part)
+    if stored is None:
+        return None
+
+    return PartResult(
+        solution.year,
+        solution.day,
+        part,
+        "ok",
+        stored.answer,
+        stored.parse_time,
+        [stored.solve_time],
+        cached=True,
+    )
+
+
+def run_with_answer_store(
+    solutions: list[Solution],
+    workers: int,
+    options: RunOptions,
+    store: AnswerStore,
+    use_stored: bool = True,
+    telemetry_sink: Optional[telemetry.Sink] = None,
+) -> list[PartResult]:
+    results: list[PartResult] = []
+    to_run: list[tuple[Solution, str]] = []
+    for solution in solutions:
+        for part in PARTS:
+            stored_result = None
+            if use_stored:
+                stored_result = get_stored_result(store, solution, part)
+            if stored_result is None:
+                to_run.append((solution, part))
+            else:
+                results.append(stored_result)
+
+    solutions_by_day = {(solution.year, solution.day): solution for solution in solutions}
+    for result in run_parts(to_run, workers, options, telemetry_sink):
+        if result.status == "ok" and result.answer is not None:
+            store.record(
+                solutions_by_day[(result.year, result.day)],
+                result.part,
+                result.answer,
+                result.parse_time,
+                result.solve_time,
+            )
+        results.append(result)
+    store.save()
+
+    return sorted(
+        results, key=lambda result: (result.year, result.day, PARTS.index(result.part))
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Run Advent of Code solutions across years in a pool of processes"
+    )
+    parser.add_argument("-y", "--year", type=int, nargs="+", help="years to run")
+    parser.add_argument("-d", "--day", type=int, nargs="+", help="days to run")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "-t", "--timeout", type=float, help="per-part timeout in seconds (default: none)"
+    )
+    parser.add_argument(
+        "-m",
+        "--memory-limit",
+        type=float,
+        metavar="MIB",
+        help="per-part memory budget in MiB, on top of what a worker starts with",
+    )
+    parser.add_argument(
+        "--show-output",
+        action="store_true",
+        help="let solutions print to stdout instead of discarding their output",
+    )
+    parser.add_argument(
+        "--counters",
+        action="store_true",
+        help="collect the counters solutions report through aoc.instrument",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="measure peak traced memory of each part in an extra run",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="DIR",
+        help="profile each part in an extra run, writing .pstats and collapsed stacks",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="show the progress and counter rates of running parts on stderr",
+    )
+    parser.add_argument(
+        "--telemetry",
+        type=Path,
+        metavar="FILE",
+        help="write the telemetry events of every part to FILE as JSON lines",
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="solve every part, even those with a stored answer for the same input and code",
+    )
+    args = parser.parse_args(argv)
+
+    solutions = find_solutions(args.year, args.day)
+    if len(solutions) == 0:
+        print("No solutions found", file=sys.stderr)
+        return 1
+
+    sinks: list[telemetry.Sink] = []
+    if args.progress:
+        sinks.append(telemetry.ProgressBarSink())
+    if args.telemetry is not None:
+        sinks.append(telemetry.JsonLinesSink(open(args.telemetry, "w", encoding="utf-8")))
+    telemetry_sink = telemetry.MultiSink(sinks) if len(sinks) > 0 else None
+
+    start = time.perf_counter()
+    options = RunOptions(
+        timeout=args.timeout,
+        show_output=args.show_output,
+        trace_memory=args.trace_memory,
+        counters=args.counters,
+        profile_dir=args.profile,
+        # Parts that blow their budget are reported with their last telemetry snapshot,
+        # but counters are only collected for it when the snapshots are watched
+        telemetry=(
+            telemetry_sink is not None
+            or args.timeout is not None
+            or args.memory_limit is not None
+        ),
+        telemetry_counters=telemetry_sink is not None,
+        memory_limit=(
+            int(args.memory_limit * (1 << 20)) if args.memory_limit is not None else None
+        ),
+    )
+    # Stored answers are only reused for plain runs, since the other options are there to
+    # look at a fresh solve. Fresh answers are always stored
+    use_stored = not (
+        args.force
+        or args.show_output
+        or args.trace_memory
+        or args.counters
+        or args.profile
+    )
+    try:
+        results = run_with_answer_store(
+            solutions,
+            max(1, args.workers),
+            options,
+            AnswerStore(),
+            use_stored,
+            telemetry_sink,
+        )
+    finally:
+        if telemetry_sink is not None:
+            telemetry_sink.close()
+    print_results(results, time.perf_counter() - start)
+
+    return 0 if all(result.status == "ok" for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
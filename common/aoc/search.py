@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Literal, Optional
+
+from aoc import instrument
+
+Neighbors = Callable[[int], Iterable[tuple[int, int]]]
+
+
+@dataclass
+class SearchResult:
+    goal: Optional[int]
+    distances: dict[int, int]
+    previous: dict[int, int] = field(default_factory=dict)
+    expanded: int = 0
+
+    @property
+    def cost(self) -> Optional[int]:
+        return self.distances[self.goal] if self.goal is not None else None
+
+    def path(self, state: Optional[int] = None) -> list[int]:
+        """
+        States from a start to `state` (the goal by default). Requires the search to have
+        tracked paths.
+        """
+
+        if state is None:
+            state = self.goal
+        if state is None or state not in self.distances:
+            raise ValueError("No path to reconstruct")
+
+        path = [state]
+        while state in self.previous:
+            state = self.previous[state]
+            path.append(state)
+        path.reverse()
+
+        return path
+
+
+def find_shortest_path(
+    starts: Iterable[int],
+    neighbors: Neighbors,
+    is_goal: Optional[Callable[[int], bool]] = None,
+    heuristic: Optional[Callable[[int], int]] = None,
+    queue: Literal["heap", "buckets"] = "heap",
+    track_paths: bool = False,
+) -> SearchResult:
+    """
+    Dijkstra's algorithm over states encoded as ints, or A* given a consistent heuristic
+    (one that never decreases by more than the weight of an edge, like Manhattan distance
+    on a grid of positive weights).
+
+    `neighbors(state)` yields `(next_state, weight)` pairs with non-negative integer
+    weights. The search stops at the first goal state reached, or explores every
+    reachable state when `is_goal` isn't given. The "buckets" queue (Dial's algorithm)
+    keeps a list of states per priority, which beats a heap when weights are small ints.
+    """
+
+    distances: dict[int, int] = {}
+    previous: dict[int, int] = {}
+    closed: set[int] = set()
+
+    heap: list[tuple[int, int]] = []
+    buckets: list[list[int]] = []
+
+    def push(priority: int, state: int) -> None:
+        if queue == "heap":
+            heapq.heappush(heap, (priority, state))
+        else:
+            while len(buckets) <= priority:
+                buckets.append([])
+            buckets[priority].append(state)
+
+    for start in starts:
+        distances[start] = 0
+        push(heuristic(start) if heuristic is not None else 0, start)
+
+    goal: Optional[int] = None
+    priority = 0
+    # Expanded states are counted in batches as the search goes, for live progress
+    # without a call per state
+    batch_size = 1 << 12
+    while True:
+        if queue == "heap":
+            if len(heap) == 0:
+                break
+            _, state = heapq.heappop(heap)
+        else:
+            while priority < len(buckets) and len(buckets[priority]) == 0:
+                priority += 1
+            if priority == len(buckets):
+                break
+            state = buckets[priority].pop()
+
+        if state in closed:
+            continue
+        closed.add(state)
+        if len(closed) % batch_size == 0:
+            instrument.count("states expanded", batch_size)
+
+        if is_goal is not None and is_goal(state):
+            goal = state
+            break
+
+        cost = distances[state]
+        for next_state, weight in neighbors(state):
+            next_cost = cost + weight
+            if next_state in closed or next_cost >= distances.get(
+                next_state, next_cost + 1
+            ):
+                continue
+
+            distances[next_state] = next_cost
+            if track_paths:
+                previous[next_state] = state
+            push(
+                next_cost + heuristic(next_state) if heuristic is not None else next_cost,
+                next_state,
+            )
+
+    instrument.count("states expanded", len(closed) % batch_size)
+    instrument.count("states reached", len(distances))
+
+    return SearchResult(goal, distances, previous, len(closed))
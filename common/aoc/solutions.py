@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import importlib.util
+import inspect
+import re
+import sys
+import typing
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+YEAR_DIR_PATTERN = re.compile(r"\d{4}")
+DAY_FILE_PATTERN = re.compile(r"day(\d+)\.py")
+PARTS = ("one", "two")
+
+
+class Solution(NamedTuple):
+    year: int
+    day: int
+    path: Path
+
+    @property
+    def input_path(self) -> Path:
+        return self.path.with_suffix(".input.txt")
+
+    @property
+    def module_name(self) -> str:
+        return f"aoc_{self.year}_day{self.day}"
+
+    def __str__(self) -> str:
+        return f"{self.year} day {self.day}"
+
+
+def find_solutions(
+    years: Optional[Iterable[int]] = None, days: Optional[Iterable[int]] = None
+) -> list[Solution]:
+    year_filter = set(years) if years else None
+    day_filter = set(days) if days else None
+
+    solutions: list[Solution] = []
+    for year_dir in REPO_ROOT.iterdir():
+        if not year_dir.is_dir() or not YEAR_DIR_PATTERN.fullmatch(year_dir.name):
+            continue
+
+        year = int(year_dir.name)
+        if year_filter is not None and year not in year_filter:
+            continue
+
+        for day_path in year_dir.glob("day*.py"):
+            match = DAY_FILE_PATTERN.fullmatch(day_path.name)
+            if match is None:
+                continue
+
+            day = int(match.group(1))
+            if day_filter is not None and day not in day_filter:
+                continue
+
+            solutions.append(Solution(year, day, day_path))
+
+    return sorted(solutions)
+
+
+def load_solution_module(solution: Solution) -> ModuleType:
+    year_dir = solution.path.parent
+
+    # Every year ships its own top-level `utils` module, so make sure the one imported by
+    # the solution comes from the solution's own directory.
+    if str(year_dir) in sys.path:
+        sys.path.remove(str(year_dir))
+    sys.path.insert(0, str(year_dir))
+    utils = sys.modules.get("utils")
+    if utils is not None and Path(str(utils.__file__)).parent != year_dir:
+        del sys.modules["utils"]
+
+    module_name = solution.module_name
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(module_name, solution.path)
+    assert spec is not None and spec.loader is not None, f"Failed to load {solution}"
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+        check_part_signatures(module, solution)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+
+    return module
+
+
+def count_parsed_values(parse_input: Callable[..., Any]) -> Optional[int]:
+    """
+    How many values `parse_input` returns according to its return annotation, if it's
+    annotated with a fixed-length tuple.
+    """
+
+    try:
+        return_type = typing.get_type_hints(parse_input).get("return")
+    except Exception:
+        return None
+    if typing.get_origin(return_type) is not tuple:
+        return None
+
+    args = typing.get_args(return_type)
+    if len(args) == 0 or Ellipsis in args:
+        return None
+
+    return len(args)
+
+
+def check_part_signatures(module: ModuleType, solution: Solution) -> None:
+    """
+    Makes sure both parts take the values `parse_input` returns, since a module-level
+    `parse_input` is always used to build the parts' arguments.
+    """
+
+    parse_input = getattr(module, "parse_input", None)
+    num_values = count_parsed_values(parse_input) if parse_input is not None else 1
+    if num_values is None:
+        return
+
+    for part in PARTS:
+        part_fn = get_part(module, part)
+        if part_fn is None:
+            continue
+        try:
+            inspect.signature(part_fn).bind(*[None] * num_values)
+        except TypeError:
+            raise TypeError(
+                f"{solution} part {part} doesn't take the {num_values} value(s)"
+                + (" parse_input returns" if parse_input is not None else " of its input")
+            ) from None
+
+
+def read_problem_input(
+    module: ModuleType, solution: Solution, input_path: Optional[Path] = None
+) -> Any:
+    # Input readers take the solution's path and read the input next to it, or take the
+    # path of any other input file to read instead
+    file_path_str = str(input_path or solution.path)
+    read_input = getattr(module, "read_input", None)
+    if read_input is None:
+        return module.get_and_cache_input(file_path_str)
+
+    return read_input(file_path_str)
+
+
+def parse_problem_input(module: ModuleType, problem_input: Any) -> tuple[Any, ...]:
+    # Parts are free to mutate a list input, so give every parse a fresh copy. Other input
+    # modes (memory-mapped bytes and grids) are read-only
+    if isinstance(problem_input, list):
+        problem_input = problem_input.copy()
+
+    parse_input = getattr(module, "parse_input", None)
+    if parse_input is None:
+        return (problem_input,)
+
+    part_args = parse_input(problem_input)
+    if not isinstance(part_args, tuple):
+        raise TypeError(
+            f"parse_input has to return a tuple of the parts' arguments, not a"
+            f" {type(part_args).__name__}"
+        )
+
+    return part_args
+
+
+def get_part(module: ModuleType, part: str) -> Optional[Callable[..., Any]]:
+    return getattr(module, f"part_{part}", None)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import re
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, Optional
+
+INPUT_PATH_PATTERN = re.compile(r"/(\d+)/day/(\d+)/input")
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Local stand-in for adventofcode.com's input endpoint, for exercising input fetching
+    offline. Inputs are read from `inputs_dir/<year>/day<day>.input.txt` when given, and
+    otherwise generated. The first `failures_per_input` requests for each input fail with
+    a 503 to exercise retries.
+    """
+
+    daemon_threads = True
+
+    session_token: str
+    inputs_dir: Optional[Path]
+    failures_per_input: int
+    request_counts: defaultdict[str, int]
+    request_counts_lock: threading.Lock
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        session_token: str,
+        inputs_dir: Optional[Path] = None,
+        failures_per_input: int = 0,
+    ) -> None:
+        super().__init__(address, StandInRequestHandler)
+        self.session_token = session_token
+        self.inputs_dir = inputs_dir
+        self.failures_per_input = failures_per_input
+        self.request_counts = defaultdict(int)
+        self.request_counts_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}"
+
+    def count_request(self, path: str) -> int:
+        with self.request_counts_lock:
+            self.request_counts[path] += 1
+            return self.request_counts[path]
+
+    def get_input(self, year: int, day: int) -> Optional[str]:
+        if self.inputs_dir is None:
+            return "\n".join(f"{year} {day} {line}" for line in range(day)) + "\n"
+
+        input_path = self.inputs_dir / str(year) / f"day{day}.input.txt"
+        if not input_path.exists():
+            return None
+
+        return input_path.read_text(encoding="utf-8")
+
+
+class StandInRequestHandler(BaseHTTPRequestHandler):
+    server: StandInServer
+
+    def do_GET(self) -> None:
+        match = INPUT_PATH_PATTERN.fullmatch(self.path)
+        if match is None:
+            self.send_text(404, "404 Not Found\n")
+            return
+
+        if f"session={self.server.session_token}" not in self.headers.get("Cookie", ""):
+            self.send_text(
+                400,
+                "Puzzle inputs differ by user.  Please log in to get your puzzle input.\n",
+            )
+            return
+
+        if self.server.count_request(self.path) <= self.server.failures_per_input:
+            self.send_text(503, "503 Service Unavailable\n")
+            return
+
+        problem_input = self.server.get_input(int(match.group(1)), int(match.group(2)))
+        if problem_input is None:
+            self.send_text(404, "404 Not Found\n")
+            return
+
+        self.send_text(200, problem_input)
+
+    def send_text(self, status_code: int, text: str) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@contextlib.contextmanager
+def run_stand_in_server(
+    session_token: str,
+    inputs_dir: Optional[Path] = None,
+    failures_per_input: int = 0,
+    port: int = 0,
+) -> Iterator[StandInServer]:
+    server = StandInServer(
+        ("127.0.0.1", port), session_token, inputs_dir, failures_per_input
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve puzzle inputs locally in place of adventofcode.com"
+    )
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--session-token", default="stand-in")
+    parser.add_argument(
+        "--inputs",
+        type=Path,
+        help="directory of <year>/day<day>.input.txt files (default: generate inputs)",
+    )
+    parser.add_argument(
+        "--failures",
+        type=int,
+        default=0,
+        help="number of 503 responses to send for each input before succeeding",
+    )
+    args = parser.parse_args(argv)
+
+    with run_stand_in_server(
+        args.session_token, args.inputs, args.failures, args.port
+    ) as server:
+        print(f"Serving inputs at {server.base_url} (AOC_BASE_URL={server.base_url})")
+        threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import json
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Any, Callable, Iterator, Optional, Protocol
+
+from aoc import instrument
+
+# Events are plain dicts so they can be pickled to the runner and written as JSON
+Event = dict[str, Any]
+
+
+class Sink(Protocol):
+    def emit(self, event: Event) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class CallbackSink:
+    def __init__(self, callback: Callable[[Event], None]) -> None:
+        self.callback = callback
+
+    def emit(self, event: Event) -> None:
+        self.callback(event)
+
+    def close(self) -> None:
+        pass
+
+
+class MultiSink:
+    def __init__(self, sinks: list[Sink]) -> None:
+        self.sinks = sinks
+
+    def emit(self, event: Event) -> None:
+        for sink in self.sinks:
+            sink.emit(event)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+class JsonLinesSink:
+    def __init__(self, file: IO[str]) -> None:
+        self.file = file
+
+    def emit(self, event: Event) -> None:
+        self.file.write(json.dumps(event) + "\n")
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+BAR_WIDTH = 20
+
+
+def format_count(value: float) -> str:
+    for threshold, suffix in ((1e9, "G"), (1e6, "M"), (1e3, "k")):
+        if abs(value) >= threshold:
+            return f"{value / threshold:.1f}{suffix}"
+    return f"{value:.0f}"
+
+
+def format_snapshot(snapshot: Event, rates: Optional[dict[str, float]] = None) -> str:
+    """
+    A snapshot's phase, progress bars, gauges and counters (with their rates, if known)
+    on one line.
+    """
+
+    parts = []
+    if snapshot["phase"] is not None:
+        parts.append(snapshot["phase"])
+    for name, (done, total) in snapshot["progress"].items():
+        filled = BAR_WIDTH * done // total if total > 0 else 0
+        bar = "#" * filled + "-" * (BAR_WIDTH - filled)
+        parts.append(f"{name} [{bar}] {done}/{total}")
+    for name, value in snapshot["gauges"].items():
+        parts.append(f"{name} {format_count(value)}")
+    for name, value in snapshot["counters"].items():
+        rate = f" ({format_count(rates[name])}/s)" if rates and name in rates else ""
+        parts.append(f"{name} {format_count(value)}{rate}")
+
+    return " ".join(parts)
+
+
+class ProgressBarSink:
+    """
+    A single, constantly redrawn terminal line with the phase, progress and counter
+    rates of every running source (every part being solved). Draws nothing when the
+    stream isn't a terminal.
+    """
+
+    def __init__(self, stream: IO[str] = sys.stderr) -> None:
+        self.stream = stream
+        self.enabled = stream.isatty()
+        self.snapshots: dict[str, Event] = {}
+        self.rates: dict[str, dict[str, float]] = {}
+
+    def emit(self, event: Event) -> None:
+        source = event.get("source", "")
+        if event["type"] == "snapshot":
+            previous = self.snapshots.get(source)
+            if previous is not None and event["time"] > previous["time"]:
+                elapsed = event["time"] - previous["time"]
+                self.rates[source] = {
+                    name: (value - previous["counters"].get(name, 0)) / elapsed
+                    for name, value in event["counters"].items()
+                }
+            self.snapshots[source] = event
+        elif event["type"] == "stop":
+            self.snapshots.pop(source, None)
+            self.rates.pop(source, None)
+        else:
+            return
+
+        self.draw()
+
+    def draw(self) -> None:
+        if not self.enabled:
+            return
+
+        line = " | ".join(
+            " ".join(
+                filter(None, [source, format_snapshot(snapshot, self.rates.get(source))])
+            )
+            for source, snapshot in self.snapshots.items()
+        )
+        self.stream.write("\r\x1b[K" + line[: self.get_width() - 1])
+        self.stream.flush()
+
+    def get_width(self) -> int:
+        return shutil.get_terminal_size().columns
+
+    def close(self) -> None:
+        if self.enabled:
+            self.stream.write("\r\x1b[K")
+            self.stream.flush()
+
+
+class Session:
+    """
+    The telemetry of one solve. Gauges and progress are only stored when they're set,
+    and a background thread sends a snapshot of them (and of the instrument counters)
+    to the sink every `interval` seconds, so solvers can update them in hot loops.
+    """
+
+    sink: Sink
+    interval: float
+    start_time: float
+    gauges: dict[str, float]
+    progress: dict[str, tuple[int, int]]
+    phases: list[tuple[str, float]]
+    last_snapshot: Optional[Event]
+
+    _lock: threading.Lock
+    _stopped: threading.Event
+    _thread: threading.Thread
+
+    def __init__(self, sink: Sink, interval: float) -> None:
+        self.sink = sink
+        self.interval = interval
+        self.start_time = time.perf_counter()
+        self.gauges = {}
+        self.progress = {}
+        self.phases = []
+        self.last_snapshot = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._send_snapshots, daemon=True)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    def emit(self, event_type: str, **fields: Any) -> None:
+        with self._lock:
+            self.sink.emit({"type": event_type, "time": self.elapsed(), **fields})
+
+    def snapshot(self) -> Event:
+        # Runs on the background thread while the solve goes on, so only takes copies
+        current_phases = self.phases[-1:]
+        event = {
+            "type": "snapshot",
+            "time": self.elapsed(),
+            "phase": current_phases[0][0] if len(current_phases) > 0 else None,
+            "counters": self._get_counters(),
+            "gauges": dict(self.gauges),
+            "progress": {name: list(value) for name, value in self.progress.items()},
+        }
+        with self._lock:
+            self.sink.emit(event)
+        self.last_snapshot = event
+
+        return event
+
+    def _get_counters(self) -> dict[str, int]:
+        # Once the solve's counters are collected, keep reporting their final values
+        if not instrument.counters_enabled() and self.last_snapshot is not None:
+            return self.last_snapshot["counters"]
+
+        return instrument.get_counters()
+
+    def _send_snapshots(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.snapshot()
+
+    def start(self) -> None:
+        self.emit("start")
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+        self.snapshot()
+        self.emit("stop")
+
+
+_session: Optional[Session] = None
+
+
+def start(sink: Sink, interval: float = 0.5) -> Session:
+    global _session
+    if _session is not None:
+        stop()
+
+    _session = Session(sink, interval)
+    _session.start()
+    return _session
+
+
+def stop() -> Optional[Session]:
+    global _session
+    session, _session = _session, None
+    if session is not None:
+        session.stop()
+
+    return session
+
+
+def is_enabled() -> bool:
+    return _session is not None
+
+
+def gauge(name: str, value: float) -> None:
+    if _session is not None:
+        _session.gauges[name] = value
+
+
+def progress(name: str, done: int, total: int) -> None:
+    if _session is not None:
+        _session.progress[name] = (done, total)
+
+
+def flush() -> None:
+    """
+    Sends a snapshot right away, e.g. before the counters are collected.
+    """
+
+    if _session is not None:
+        _session.snapshot()
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Marks a span of a solve, e.g. `with telemetry.phase("building graph"):`.
+    """
+
+    session = _session
+    if session is None:
+        yield
+        return
+
+    start_time = session.elapsed()
+    session.phases.append((name, start_time))
+    session.emit("phase_start", name=name)
+    try:
+        yield
+    finally:
+        session.phases.pop()
+        session.emit("phase_stop", name=name, duration=session.elapsed() - start_time)